@@ -3,18 +3,26 @@
 import os
 import sys
 
-from PySide6.QtCore import Qt
-from PySide6.QtWidgets import QApplication
-
 # 项目内模块导入
-from src.core.config import cfg
-from src.ui.main_window import MainWindow
-from src.core.utils.mutex import SingleInstanceApplication
+from src.core.utils.startup import startupProfiler
+
+# 分阶段启动: 单实例检查只需要 QtCore, 其余模块在通过检查后再导入
+with startupProfiler.phase("import mutex"):
+    # 项目内模块导入
+    from src.core.utils.mutex import SingleInstanceApplication
 
 if __name__ == "__main__":
     # 实现单实例应用程序检查
-    if SingleInstanceApplication().is_running():
-        sys.exit()
+    with startupProfiler.phase("single instance check"):
+        if SingleInstanceApplication().is_running():
+            sys.exit()
+
+    with startupProfiler.phase("import config"):
+        from PySide6.QtCore import Qt, QEvent, QTimer, QObject
+        from PySide6.QtWidgets import QApplication
+
+        # 项目内模块导入
+        from src.core.config import cfg
 
     # 设置DPI缩放
     if cfg.get(cfg.dpiScale) == "Auto":
@@ -25,10 +33,38 @@ if __name__ == "__main__":
         os.environ["QT_SCALE_FACTOR"] = str(cfg.get(cfg.dpiScale))
 
     # 创建应用程序
-    app = QApplication(sys.argv)
+    with startupProfiler.phase("create application"):
+        app = QApplication(sys.argv)
+
+    if startupProfiler.enabled:
+        # Splash Screen 在主窗体的构造过程中就会绘制, 因此在创建主窗体前监听第一个顶层窗体的绘制事件
+        class FirstPaintFilter(QObject):
+            def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+                if event.type() == QEvent.Type.Paint and watched.isWidgetType() and watched.isWindow():
+                    startupProfiler.mark("first paint")
+                    app.removeEventFilter(self)
+                return False
+
+        firstPaintFilter = FirstPaintFilter()
+        app.installEventFilter(firstPaintFilter)
+
+    # 初始化主窗口, 页面模块在 Splash Screen 显示后才会导入
+    with startupProfiler.phase("import main window"):
+        # 项目内模块导入
+        from src.ui.main_window import MainWindow
+    with startupProfiler.phase("create main window"):
+        MainWindow()
+
+    if startupProfiler.enabled:
+        # 事件循环开始后的第一个空闲时刻输出报告, 此时各启动阶段均已结束
+        def dumpStartupProfile() -> None:
+            # 项目内模块导入
+            from src.core.utils.path import PathFunc
+
+            startupProfiler.mark("event loop started")
+            startupProfiler.dump(PathFunc().tmp_path / "startup_profile.json")
 
-    # 初始化主窗口
-    MainWindow()
+        QTimer.singleShot(0, dumpStartupProfile)
 
     # 进入循环
     sys.exit(app.exec())
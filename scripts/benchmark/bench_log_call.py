@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+## 日志调用位置捕获的微基准测试
+    对比旧实现 (inspect.stack + 每次解析签名) 与当前实现 (sys._getframe + 位置缓存)
+    每次日志调用所需的纳秒数
+
+    运行: python scripts/benchmark/bench_log_call.py
+"""
+
+# 标准库导入
+import sys
+import timeit
+import inspect
+from typing import Any, Callable
+from pathlib import Path
+from functools import wraps
+
+sys.path.insert(0, str(Path(__file__).absolute().parents[2]))
+
+# 项目内模块导入
+from src.core.utils.logger.log_data import LogPosition
+from src.core.utils.logger.log_utils import capture_call_location
+
+
+def legacy_capture_call_location(func: Callable[..., Any]) -> Callable[..., Any]:
+    """旧实现, 保留于此作为对照"""
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> None:
+        pos = inspect.stack()[1]
+        position = LogPosition(
+            module=pos.frame.f_globals.get("__name__"),
+            file=Path(pos.filename).name,
+            line=pos.lineno,
+        )
+        if "log_position" in inspect.signature(func).parameters:
+            kwargs["log_position"] = position
+            return func(*args, **kwargs)
+        else:
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def sink(message: str, log_position: LogPosition = None) -> LogPosition:
+    """不做任何事的日志函数, 只测量位置捕获本身"""
+    return log_position
+
+
+def measure(name: str, func: Callable[..., Any], number: int) -> float:
+    """测量并打印每次调用的纳秒数"""
+    best = min(timeit.repeat(lambda: func("message"), number=number, repeat=5))
+    ns = best / number * 1e9
+    print(f"{name:<10} {ns:>12.0f} ns/call")
+    return ns
+
+
+def main() -> None:
+    before = measure("before", legacy_capture_call_location(sink), 2_000)
+    after = measure("after", capture_call_location(sink), 200_000)
+    print(f"{'speedup':<10} {before / after:>12.1f} x")
+
+
+if __name__ == "__main__":
+    main()
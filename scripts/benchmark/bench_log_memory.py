@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+## 日志记录内存占用基准测试
+    分别统计旧的 dataclass 实现、当前 __slots__ 实现以及 LogColumnStore 列式存储
+    每条日志的平均字节数 (不含消息字符串本身)
+    调用位置由 get_call_position 缓存, 各实现都共享同一个位置对象, 只比较记录本身的开销
+
+    运行: python scripts/benchmark/bench_log_memory.py
+"""
+
+# 标准库导入
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+from pathlib import Path
+from dataclasses import dataclass
+
+sys.path.insert(0, str(Path(__file__).absolute().parents[2]))
+
+# 项目内模块导入
+from src.core.utils.logger.log_data import Log, LogPosition
+from src.core.utils.logger.log_enum import LogType, LogLevel, LogSource
+from src.core.utils.logger.log_column import LogColumnStore
+
+RECORDS = 50_000
+
+
+@dataclass(frozen=True)
+class LegacyLogPosition:
+    """旧实现, 保留于此作为对照"""
+
+    module: str
+    file: str
+    line: int
+
+
+@dataclass(frozen=True)
+class LegacyLog:
+    """旧实现, 保留于此作为对照"""
+
+    level: LogLevel
+    message: str
+    time: int | float
+    log_type: LogType
+    source: LogSource
+    position: LegacyLogPosition
+
+
+def measure(name: str, build: Callable[[list[str]], Any]) -> None:
+    """测量并打印每条日志的字节数"""
+    # 预先创建消息, 使各实现共享同样的字符串
+    messages = [f"bot {index % 64} status ok" for index in range(RECORDS)]
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    store = build(messages)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"{name:<10} {(after - before) / RECORDS:>8.1f} bytes/record")
+    del store
+
+
+def build_legacy(messages: list[str]) -> list[LegacyLog]:
+    now, position = time.time(), LegacyLogPosition("bot", "bot.py", 1)
+    return [LegacyLog(LogLevel.INFO, message, now, LogType.NONE_TYPE, LogSource.CORE, position) for message in messages]
+
+
+def build_slots(messages: list[str]) -> list[Log]:
+    now, position = time.time(), LogPosition("bot", "bot.py", 1)
+    return [Log(LogLevel.INFO, message, now, LogType.NONE_TYPE, LogSource.CORE, position) for message in messages]
+
+
+def build_column(messages: list[str]) -> LogColumnStore:
+    now, position = time.time(), LogPosition("bot", "bot.py", 1)
+    store = LogColumnStore(RECORDS)
+    for message in messages:
+        store.append(Log(LogLevel.INFO, message, now, LogType.NONE_TYPE, LogSource.CORE, position))
+    return store
+
+
+def main() -> None:
+    measure("dataclass", build_legacy)
+    measure("slots", build_slots)
+    measure("column", build_column)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+"""
+## 启动基准测试
+    在 `QT_QPA_PLATFORM=offscreen` 下无界面运行程序, 统计:
+    - 每个模块的导入耗时 (解析 `-X importtime` 输出)
+    - MainWindow、SettingsPage、标题栏与 SplashScreen 的构造耗时
+    - 空闲一段时间后的常驻内存 (RSS)
+
+    每轮测试在独立的子进程与空白工作目录中进行, 多轮结果取中位数后写入 json, 便于在不同提交之间对比
+
+    运行: python scripts/benchmark/bench_startup.py [--runs 5] [--output startup.json] [--compare baseline.json]
+
+    前置条件: 已用 pyside6-rcc 生成资源文件 src/Ui/resource/resource.py, 缺少时脚本在开始测试前退出
+
+    程序以 `src.core` / `src.ui` 导入 `src/Core` / `src/Ui`, 子进程在导入前安装按大小写不敏感方式查找模块的 finder,
+    因此在大小写敏感的文件系统 (如 Linux) 上同样可以运行
+"""
+
+# 标准库导入
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+import importlib.util
+from pathlib import Path
+from importlib.abc import MetaPathFinder
+from importlib.machinery import ModuleSpec
+
+ROOT = Path(__file__).absolute().parents[2]
+
+# 子进程通过带此前缀的行回传测量结果, 以便与程序自身的控制台日志区分
+RESULT_PREFIX = "NCD-BENCH:"
+
+# `-X importtime` 的输出格式: import time: self [us] | cumulative | imported package
+_IMPORT_TIME_PATTERN = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S.*)$")
+
+
+def find_entry(directory: Path, name: str) -> Path | None:
+    """
+    ## 在目录中按大小写不敏感的方式查找文件或子目录
+
+    ## 返回
+        - Path | None: 找到的路径, 优先返回大小写完全一致的条目
+    """
+    if (path := directory / name).exists():
+        return path
+    try:
+        return next((entry for entry in directory.iterdir() if entry.name.lower() == name.lower()), None)
+    except OSError:
+        return None
+
+
+class CaseInsensitiveFinder(MetaPathFinder):
+    """
+    ## 在默认的查找方式失败后, 按大小写不敏感的方式查找 src 下的模块
+        如 `src.core` -> `src/Core`, `src.ui.icon` -> `src/Ui/Icon.py`
+    """
+
+    def find_spec(self, fullname: str, path=None, target=None) -> ModuleSpec | None:
+        if not fullname.startswith("src.") or path is None:
+            return None
+        name = fullname.rpartition(".")[2]
+        for directory in map(Path, path):
+            if (package := find_entry(directory, name)) is not None and package.is_dir():
+                if (init := find_entry(package, "__init__.py")) is not None:
+                    return importlib.util.spec_from_file_location(
+                        fullname, init, submodule_search_locations=[str(package)]
+                    )
+                # 没有 __init__.py 的目录作为命名空间包
+                spec = ModuleSpec(fullname, None, is_package=True)
+                spec.submodule_search_locations = [str(package)]
+                return spec
+            if (module := find_entry(directory, f"{name}.py")) is not None:
+                return importlib.util.spec_from_file_location(fullname, module)
+        return None
+
+
+def check_prerequisites() -> str | None:
+    """
+    ## 检查运行程序的前置条件
+
+    ## 返回
+        - str | None: 不满足时返回原因, 满足时返回 None
+    """
+    resource_dir = ROOT / "src"
+    for part in ("ui", "resource"):
+        resource_dir = find_entry(resource_dir, part) or resource_dir / part
+    if find_entry(resource_dir, "resource.py") is None:
+        relative = resource_dir.relative_to(ROOT).as_posix()
+        return (
+            f"缺少资源文件 {relative}/resource.py, 请先运行:\n"
+            f"    pyside6-rcc {relative}/resource.qrc -o {relative}/resource.py"
+        )
+    return None
+
+
+def run_child(idle: float) -> None:
+    """
+    ## 子进程: 依次构造各组件并计时, 空闲后测量内存
+    """
+    sys.path.insert(0, str(ROOT))
+    sys.meta_path.append(CaseInsensitiveFinder())
+
+    # 第三方库导入
+    import psutil
+    from PySide6.QtCore import QTimer
+    from PySide6.QtWidgets import QWidget, QApplication
+
+    results: dict[str, float] = {}
+
+    def timed(name: str, func):
+        start = time.perf_counter()
+        value = func()
+        results[name] = (time.perf_counter() - start) * 1000
+        return value
+
+    app = timed("create_application_ms", lambda: QApplication([sys.argv[0]]))
+
+    # 导入页面模块, 使下面的构造耗时不包含导入耗时
+    def import_modules():
+        # 项目内模块导入
+        import src.ui.home_page
+        import src.ui.main_window
+        import src.ui.settings_page
+
+    timed("import_ui_ms", import_modules)
+
+    # 第三方库导入
+    from qfluentwidgets import SplashScreen
+
+    # 项目内模块导入
+    from src.ui.icon import NCDIcon
+    from src.ui.main_window import MainWindow
+    from src.ui.settings_page import SettingsPage
+    from src.ui.common.lazy_interface import LazyInterface
+    from src.ui.main_window.title_bar import NCDTitleBar
+
+    host = QWidget()
+    timed("construct_title_bar_ms", lambda: NCDTitleBar(host))
+    timed("construct_splash_screen_ms", lambda: SplashScreen(NCDIcon.LOGO.value, host, True))
+
+    def construct_settings_page():
+        page = SettingsPage()
+        # 设置页面的子页面为延迟创建, 这里一并创建以得到完整的构造耗时
+        for lazy in page.findChildren(LazyInterface):
+            lazy.ensureInterface()
+        return page
+
+    settings_page = timed("construct_settings_page_ms", construct_settings_page)
+    window = timed("construct_main_window_ms", MainWindow)
+
+    # 进入事件循环并空闲一段时间, 让延迟创建的页面与后台任务完成
+    QTimer.singleShot(int(idle * 1000), app.quit)
+    app.exec()
+    results["rss_idle_bytes"] = psutil.Process().memory_info().rss
+
+    print(RESULT_PREFIX + json.dumps(results), flush=True)
+    del window, settings_page, host
+
+
+def parse_import_time(stderr: str) -> dict[str, dict[str, int]]:
+    """
+    ## 解析 `-X importtime` 的输出
+
+    ## 返回
+        - dict[str, dict[str, int]]: 模块名 -> {self_us, cumulative_us, depth}
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if (match := _IMPORT_TIME_PATTERN.match(line)) is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules.setdefault(
+            name.strip(),
+            {"self_us": int(self_us), "cumulative_us": int(cumulative_us), "depth": len(indent) // 2},
+        )
+    return modules
+
+
+def run_once(idle: float) -> tuple[dict[str, float], dict[str, dict[str, int]]]:
+    """
+    ## 在子进程中运行一轮测试
+
+    ## 返回
+        - tuple: (构造耗时与内存, 模块导入耗时)
+    """
+    python_path = os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")]))
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", PYTHONPATH=python_path)
+    # 在空白工作目录中运行, 使用默认配置且不污染仓库
+    with tempfile.TemporaryDirectory(prefix="ncd-bench-") as cwd:
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", str(Path(__file__).absolute()), "--child", "--idle", str(idle)],
+            cwd=cwd,
+            env=env,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+        )
+
+    for line in process.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX) :]), parse_import_time(process.stderr)
+
+    tail = "\n".join(line for line in process.stderr.splitlines() if not line.startswith("import time:"))[-2000:]
+    raise RuntimeError(f"子进程未返回结果 (退出码 {process.returncode}):\n{tail}")
+
+
+def git_revision() -> str | None:
+    """
+    ## 获取当前提交, 用于标记结果
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark(runs: int, idle: float, top: int) -> dict:
+    """
+    ## 运行多轮测试并汇总, 各指标取中位数
+    """
+    samples: list[dict[str, float]] = []
+    imports: list[dict[str, dict[str, int]]] = []
+    for index in range(runs):
+        metrics, modules = run_once(idle)
+        samples.append(metrics)
+        imports.append(modules)
+        print(f"run {index + 1}/{runs}: main window {metrics['construct_main_window_ms']:.1f} ms", file=sys.stderr)
+
+    metrics = {name: statistics.median(sample[name] for sample in samples) for name in samples[0]}
+
+    # 每个模块的导入耗时同样取中位数, 只在某一轮出现的模块按出现的轮次计算
+    names = {name for modules in imports for name in modules}
+    modules = {}
+    for name in names:
+        entries = [run[name] for run in imports if name in run]
+        modules[name] = {
+            "self_us": int(statistics.median(entry["self_us"] for entry in entries)),
+            "cumulative_us": int(statistics.median(entry["cumulative_us"] for entry in entries)),
+            "depth": entries[0]["depth"],
+        }
+    metrics["import_total_ms"] = sum(module["self_us"] for module in modules.values()) / 1000
+    metrics["import_project_ms"] = (
+        sum(module["self_us"] for name, module in modules.items() if name == "src" or name.startswith("src.")) / 1000
+    )
+
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": runs,
+            "idle_seconds": idle,
+        },
+        "metrics": metrics,
+        "slowest_imports": sorted(modules, key=lambda name: modules[name]["self_us"], reverse=True)[:top],
+        "imports": dict(sorted(modules.items())),
+    }
+
+
+def print_report(result: dict, baseline: dict | None) -> None:
+    """
+    ## 打印结果, 提供基准结果时同时打印差异
+    """
+    header = f"{'metric':<30} {'value':>14}"
+    print(header + (f" {'baseline':>14} {'delta':>9}" if baseline else ""))
+    for name, value in result["metrics"].items():
+        line = f"{name:<30} {value:>14.1f}"
+        if baseline and (base := baseline["metrics"].get(name)):
+            line += f" {base:>14.1f} {(value - base) / base:>+9.1%}"
+        print(line)
+
+    print(f"\n{'slowest imports':<60} {'self(ms)':>9} {'cumulative(ms)':>15}")
+    for name in result["slowest_imports"]:
+        module = result["imports"][name]
+        print(f"{name:<60} {module['self_us'] / 1000:>9.1f} {module['cumulative_us'] / 1000:>15.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="NapCat Desktop 启动基准测试")
+    parser.add_argument("--runs", type=int, default=5, help="测试轮数, 结果取中位数")
+    parser.add_argument("--idle", type=float, default=3.0, help="测量内存前空闲的秒数")
+    parser.add_argument("--top", type=int, default=20, help="报告中列出的最慢导入模块数")
+    parser.add_argument("--output", type=Path, help="结果 json 路径, 默认为 startup-<revision>.json")
+    parser.add_argument("--compare", type=Path, help="用于对比的基准结果 json")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.idle)
+        return
+
+    if (problem := check_prerequisites()) is not None:
+        sys.exit(problem)
+
+    result = benchmark(args.runs, args.idle, args.top)
+    baseline = json.loads(args.compare.read_text(encoding="utf-8")) if args.compare else None
+    print_report(result, baseline)
+
+    output = args.output or Path(f"startup-{result['meta']['revision'] or 'unknown'}.json")
+    output.write_text(json.dumps(result, indent=4, ensure_ascii=False), encoding="utf-8")
+    print(f"\nresults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,12 @@ from PySide6.QtCore import Signal
 
 # 项目内模块导入
 from src.core.utils.path import PathFunc
+from src.core.utils.logger import LogLevel, logger
+from src.core.utils.file_writer import DebouncedFileWriter
+from src.core.config.config_schema import ConfigSchema
+
+# 可选的日志等级
+LOG_LEVEL_OPTIONS = [LogLevel.DBUG, LogLevel.INFO, LogLevel.WARN, LogLevel.EROR, LogLevel.CRIT]
 
 
 class Config(QConfig):
@@ -27,6 +33,7 @@ class Config(QConfig):
 
     # 信号
     appRestartSig = Signal()
+    configReloaded = Signal(list)  # 从文件重新加载后发射, 参数为值发生变化的配置键
 
     # 信息项
     NCDVersion = ConfigItem(group="Info", name="NCDVersion", default="")
@@ -64,9 +71,107 @@ class Config(QConfig):
         validator=BoolValidator(),
     )
 
+    # 日志项目, 低于对应等级的日志不会写入该输出
+    fileLogLevel = OptionsConfigItem(
+        group="Log",
+        name="FileLogLevel",
+        default=LogLevel.INFO,
+        validator=OptionsValidator(LOG_LEVEL_OPTIONS),
+        serializer=EnumSerializer(LogLevel),
+    )
+    consoleLogLevel = OptionsConfigItem(
+        group="Log",
+        name="ConsoleLogLevel",
+        default=LogLevel.INFO,
+        validator=OptionsValidator(LOG_LEVEL_OPTIONS),
+        serializer=EnumSerializer(LogLevel),
+    )
+    bufferLogLevel = OptionsConfigItem(
+        group="Log",
+        name="BufferLogLevel",
+        default=LogLevel.INFO,
+        validator=OptionsValidator(LOG_LEVEL_OPTIONS),
+        serializer=EnumSerializer(LogLevel),
+    )
+
     def __init__(self):
         super().__init__()
         self.file = PathFunc().config_path
+        self.writer = DebouncedFileWriter(delay=0.5, name="NCD-ConfigWriter")
+        self._save_on_change = True  # 为 False 时配置项的值变化不触发保存
+        self._watching = False  # 是否已监听配置项的变化
+
+    def set(self, item: ConfigItem, value, save: bool = True, copy: bool = True) -> None:
+        """
+        ## 设置配置项的值
+            调用 saveOnChange 后由配置项的 valueChanged 统一触发保存, save 为 False 时不保存
+
+        ## 参数
+            - item: ConfigItem - 配置项
+            - value: Any - 新值
+            - save: bool - 是否保存到配置文件
+            - copy: bool - 是否深度复制新值
+        """
+        self._save_on_change = save
+        try:
+            super().set(item, value, save=False, copy=copy)
+        finally:
+            self._save_on_change = True
+        if save and not self._watching:
+            self.save()
+
+    def saveOnChange(self) -> None:
+        """
+        ## 配置项的值变化时自动保存
+            设置卡片通过全局 qconfig.set 修改配置, qconfig 自身的保存是同步写入;
+            在此监听配置项的变化, 使这些修改同样经过防抖与原子写入, 并保证最后写入的是最新的配置
+        """
+        if self._watching:
+            return
+        self._watching = True
+        for item in self.schema.items.values():
+            item.valueChanged.connect(self._onValueChanged)
+
+    def _onValueChanged(self, value) -> None:
+        if self._save_on_change:
+            self.save()
+
+    def save(self) -> None:
+        """
+        ## 保存配置
+            - 短时间内的多次保存 (如拖动颜色选择器) 会合并为一次写入
+            - 在调用线程中生成快照, 后台线程只通过临时文件原子替换写入, 内容未变化时不写入
+        """
+        self.writer.schedule(self._cfg.file, self._dumps())
+
+    def _dumps(self) -> str:
+        """
+        ## 将配置序列化为 json 文本
+        """
+        return json.dumps(self._cfg.toDict(), ensure_ascii=False, indent=4)
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """
+        ## 立即写入尚未保存的配置并等待完成
+
+        ## 参数
+            - timeout: float | None - 最长等待时间, None 为一直等待
+
+        ## 返回
+            - bool: 是否在超时前完成
+        """
+        return self.writer.flush(timeout)
+
+    def discardPendingSave(self) -> None:
+        """
+        ## 放弃尚未写入的保存请求, 在配置文件被直接替换或删除前调用
+        """
+        self.writer.cancel()
+
+    @property
+    def schema(self) -> ConfigSchema:
+        """配置类的键索引, 每个配置类只构建一次"""
+        return ConfigSchema.of(self._cfg.__class__)
 
     @exceptionHandler()
     def load(self, file: str | Path | None = None, config: QConfig = None) -> None:
@@ -80,7 +185,7 @@ class Config(QConfig):
             config: Config
                 被初始化的配置对象
         """
-        if isinstance(config, QConfig):
+        if isinstance(config, QConfig) and config is not self:
             self._cfg = config
             self._cfg.themeChanged.connect(self.themeChanged)
 
@@ -94,29 +199,52 @@ class Config(QConfig):
         except FileNotFoundError:
             cfg = {}
 
-        # 将配置项的键映射到配置项
-        items = {item.key: item for name, item in self._cfg.__class__.__dict__.items() if isinstance(item, ConfigItem)}
+        # 更新配置项的值, 文件中没有的配置项保持默认值
+        self.schema.apply(cfg)
+
+        self.theme = self.get(self._cfg.themeMode)
+
+    def toDict(self, serialize: bool = True) -> dict:
+        """
+        ## 将配置项转换为字典形式
 
-        # 更新配置项的值
-        for k, v in cfg.items():
-            if not isinstance(v, dict) and k in items:
-                items[k].deserializeFrom(v)
-            elif isinstance(v, dict):
-                for key, value in v.items():
-                    compound_key = f"{k}.{key}"
-                    if compound_key in items:
-                        items[compound_key].deserializeFrom(value)
+        ## 参数
+            - serialize: bool - 是否序列化配置项的值
+        """
+        return self.schema.encode(serialize=serialize)
 
-        # 确保所有配置项都有一个值，为新添加的配置项填充默认值
-        for key, item in items.items():
-            if not hasattr(item, "value"):
-                item.value = item.default
+    def reload(self) -> list[str]:
+        """
+        ## 从配置文件增量重新加载
+            只有值发生变化的配置项才会被更新并发射 valueChanged 等信号, 不会写回配置文件
 
-        self.theme = self.get(self._cfg.themeMode)
+        ## 返回
+            - list[str]: 值发生变化的配置键
+        """
+        try:
+            with open(self._cfg.file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # 文件不存在或正在被写入, 等待下一次变化
+            return []
+        if not isinstance(data, dict):
+            return []
+
+        changed = []
+        for item, value in self.schema.diff(data):
+            self.set(item, value, save=False)
+            changed.append(item.key)
+
+        if changed:
+            self.configReloaded.emit(changed)
+        return changed
 
 
 cfg = Config()
+# 由全局 qconfig 托管 cfg, 设置卡片等 qfluentwidgets 组件通过 qconfig 读写配置
 qconfig.load(PathFunc().config_path, cfg)
+cfg.saveOnChange()
 cfg.set(cfg.NCDVersion, "v2.0.0", True)
+logger.applyConfig(cfg)
 
 __all__ = ["cfg"]
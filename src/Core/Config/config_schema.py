@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+## 配置结构
+    每个配置类只扫描一次类属性, 建立 `键 -> ConfigItem` 以及 `分组 -> 名称 -> ConfigItem` 的索引,
+    加载与导出配置时直接查表, 不再每次遍历 `dir(类)`
+
+    同一个配置类的结构可以被多份配置文件共享 (如每个 Bot 实例一份配置),
+    `loadFiles` / `dumpFiles` 以纯字典的形式批量读写这些配置, 不会修改类上的 ConfigItem
+"""
+
+# 标准库导入
+import json
+import threading
+from typing import Any, Iterable, Iterator
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# 第三方库导入
+from qfluentwidgets.common import ConfigItem
+
+# 项目内模块导入
+from src.core.utils.logger import LogType, LogSource, logger
+from src.core.utils.file_writer import atomic_write
+
+
+class ConfigSchema:
+    """配置类的键索引, 通过 `ConfigSchema.of` 获取"""
+
+    # 配置类 -> 配置结构 的缓存
+    _cache: dict[type, "ConfigSchema"] = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(self, config_class: type) -> None:
+        """
+        ## 扫描配置类及其父类上的 ConfigItem, 子类中的同名属性覆盖父类
+
+        ## 参数
+            - config_class: type - 配置类
+        """
+        attributes: dict[str, ConfigItem] = {}
+        for klass in reversed(config_class.__mro__):
+            attributes.update({name: item for name, item in vars(klass).items() if isinstance(item, ConfigItem)})
+
+        # 键 -> 配置项
+        self.items: dict[str, ConfigItem] = {item.key: item for item in attributes.values()}
+        # 分组 -> 名称 -> 配置项
+        self.grouped_items: dict[str, dict[str, ConfigItem]] = {}
+        # 无名称的配置项, 分组 -> 配置项
+        self.group_items: dict[str, ConfigItem] = {}
+        for item in self.items.values():
+            if item.name:
+                self.grouped_items.setdefault(item.group, {})[item.name] = item
+            else:
+                self.group_items[item.group] = item
+
+    @classmethod
+    def of(cls, config_class: type) -> "ConfigSchema":
+        """
+        ## 获取配置类的结构, 每个类只构建一次
+
+        ## 参数
+            - config_class: type - 配置类
+        """
+        if (schema := cls._cache.get(config_class)) is None:
+            with cls._cache_lock:
+                if (schema := cls._cache.get(config_class)) is None:
+                    schema = cls._cache[config_class] = cls(config_class)
+        return schema
+
+    def match(self, data: dict) -> Iterator[tuple[ConfigItem, Any]]:
+        """
+        ## 遍历配置字典中能对应到配置项的值
+
+        ## 参数
+            - data: dict - 配置文件的字典形式
+
+        ## 返回
+            - Iterator[tuple[ConfigItem, Any]]: (配置项, 未反序列化的值)
+        """
+        for group, value in data.items():
+            if isinstance(value, dict):
+                if (names := self.grouped_items.get(group)) is None:
+                    continue
+                for name, item_value in value.items():
+                    if (item := names.get(name)) is not None:
+                        yield item, item_value
+            elif (item := self.group_items.get(group)) is not None:
+                yield item, value
+
+    def apply(self, data: dict) -> list[ConfigItem]:
+        """
+        ## 将配置字典应用到配置项上
+
+        ## 参数
+            - data: dict - 配置文件的字典形式
+
+        ## 返回
+            - list[ConfigItem]: 值发生变化的配置项
+        """
+        changed = []
+        for item, value in self.match(data):
+            old_value = item.value
+            item.deserializeFrom(value)
+            if item.value != old_value:
+                changed.append(item)
+        return changed
+
+    def diff(self, data: dict) -> list[tuple[ConfigItem, Any]]:
+        """
+        ## 找出配置字典中与配置项当前值不同的项, 只对这些项反序列化
+
+        ## 参数
+            - data: dict - 配置文件的字典形式
+
+        ## 返回
+            - list[tuple[ConfigItem, Any]]: (配置项, 反序列化后的新值)
+        """
+        changed = []
+        for item, value in self.match(data):
+            if item.serialize() == value:
+                continue
+            if (new_value := item.validator.correct(item.serializer.deserialize(value))) != item.value:
+                changed.append((item, new_value))
+        return changed
+
+    def decode(self, data: dict) -> dict[str, Any]:
+        """
+        ## 将配置字典解析为 `键 -> 值`, 不修改配置项, 缺少的键使用默认值
+
+        ## 参数
+            - data: dict - 配置文件的字典形式
+        """
+        values = {key: item.defaultValue for key, item in self.items.items()}
+        for item, value in self.match(data):
+            values[item.key] = item.validator.correct(item.serializer.deserialize(value))
+        return values
+
+    def encode(self, values: dict[str, Any] | None = None, serialize: bool = True) -> dict:
+        """
+        ## 生成配置字典
+
+        ## 参数
+            - values: dict[str, Any] | None - `键 -> 值`, 为 None 时使用配置项当前的值
+            - serialize: bool - 是否序列化值
+
+        ## 返回
+            - dict: 配置文件的字典形式
+        """
+        result = {}
+        for key, item in self.items.items():
+            value = item.value if values is None else values.get(key, item.defaultValue)
+            if serialize:
+                value = item.serializer.serialize(value)
+            if item.name:
+                result.setdefault(item.group, {})[item.name] = value
+            else:
+                result[item.group] = value
+        return result
+
+    def loadFiles(self, paths: Iterable[Path], workers: int = 8) -> dict[Path, dict[str, Any]]:
+        """
+        ## 批量读取使用同一结构的配置文件
+
+        ## 参数
+            - paths: Iterable[Path] - 配置文件路径
+            - workers: int - 并行读取的线程数
+
+        ## 返回
+            - dict[Path, dict[str, Any]]: 配置文件 -> `键 -> 值`, 不存在的文件使用默认值, 无法解析的文件会被忽略
+        """
+
+        def read(path: Path) -> dict | None:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                return {}
+            except (OSError, ValueError) as e:
+                logger.warning(f"读取配置文件 {path} 失败: {e}", LogType.FILE_FUNC, LogSource.CORE)
+                return None
+
+        paths = [Path(path) for path in paths]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="NCD-ConfigLoader") as executor:
+            contents = list(executor.map(read, paths))
+        return {path: self.decode(data) for path, data in zip(paths, contents) if data is not None}
+
+    def dumpFiles(self, configs: dict[Path, dict[str, Any]], workers: int = 8) -> int:
+        """
+        ## 批量写入使用同一结构的配置文件, 内容未变化的文件不会写入
+
+        ## 参数
+            - configs: dict[Path, dict[str, Any]] - 配置文件 -> `键 -> 值`
+            - workers: int - 并行写入的线程数
+
+        ## 返回
+            - int: 实际写入的文件数
+        """
+        contents = {
+            Path(path): json.dumps(self.encode(values), ensure_ascii=False, indent=4)
+            for path, values in configs.items()
+        }
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="NCD-ConfigWriter") as executor:
+            return sum(executor.map(lambda item: atomic_write(*item), contents.items()))
+
+
+__all__ = ["ConfigSchema"]
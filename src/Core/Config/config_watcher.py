@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+## 配置文件监视器
+    监视配置文件在程序外部的修改 (手动编辑或 NapCat 写入), 变化后增量重新加载配置
+"""
+
+# 标准库导入
+from pathlib import Path
+
+from PySide6.QtCore import QTimer, QObject, QFileSystemWatcher
+
+# 项目内模块导入
+from src.core.config import Config
+from src.core.utils.logger import LogType, LogSource, logger
+
+
+class ConfigFileWatcher(QObject):
+    """配置文件监视器"""
+
+    def __init__(self, config: Config, parent: QObject | None = None, delay: int = 200) -> None:
+        """
+        ## 初始化监视器
+
+        ## 参数
+            - config: Config - 被监视的配置
+            - parent: QObject | None - 父对象
+            - delay: int - 文件变化后等待多少毫秒再重新加载, 合并编辑器的多次写入
+        """
+        super().__init__(parent)
+        self.config = config
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self._onPathChanged)
+        # 原子替换 (写入临时文件后重命名) 会使文件监视失效, 同时监视所在目录以便重新添加
+        self.watcher.directoryChanged.connect(self._onPathChanged)
+
+        self.reloadTimer = QTimer(self)
+        self.reloadTimer.setSingleShot(True)
+        self.reloadTimer.setInterval(delay)
+        self.reloadTimer.timeout.connect(self._reload)
+
+    @property
+    def path(self) -> Path:
+        """被监视的配置文件路径"""
+        return Path(self.config.file)
+
+    def start(self) -> None:
+        """
+        ## 开始监视
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.watcher.addPath(str(self.path.parent))
+        self._watchFile()
+
+    def stop(self) -> None:
+        """
+        ## 停止监视
+        """
+        self.reloadTimer.stop()
+        if paths := self.watcher.files() + self.watcher.directories():
+            self.watcher.removePaths(paths)
+
+    def _watchFile(self) -> None:
+        """
+        ## 配置文件存在且尚未被监视时添加监视
+        """
+        if self.path.exists() and str(self.path) not in self.watcher.files():
+            self.watcher.addPath(str(self.path))
+
+    def _onPathChanged(self, path: str) -> None:
+        """
+        ## 文件或目录发生变化
+        """
+        self._watchFile()
+        self.reloadTimer.start()
+
+    def _reload(self) -> None:
+        """
+        ## 增量重新加载配置
+        """
+        if self.config.writer.hasPending():
+            # 程序自身尚有未写入的修改, 以内存中的值为准, 等待写入完成后再比较
+            self.reloadTimer.start()
+            return
+
+        if changed := self.config.reload():
+            logger.info(f"配置文件已在外部修改, 重新加载: {', '.join(changed)}", LogType.FILE_FUNC, LogSource.CORE)
+
+
+__all__ = ["ConfigFileWatcher"]
@@ -13,6 +13,7 @@ from PySide6.QtCore import QObject
 # 项目内模块导入
 from src.ui.common.info_bar import error_bar
 from src.core.utils.singleton import singleton
+from src.core.utils.file_writer import atomic_write
 
 
 @singleton
@@ -27,9 +28,8 @@ class JsonFunc(QObject):
             if isinstance(path, str):
                 path = Path(path)
 
-            path.parent.mkdir(parents=True, exist_ok=True)
-            with open(str(path), "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
+            # 先写入临时文件再原子替换, 写入失败时不会破坏原文件
+            atomic_write(path, json.dumps(data, ensure_ascii=False, indent=4))
 
             return True
 
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+## 文件写入工具
+    - atomic_write: 先写入同目录下的临时文件再原子替换, 写入中途崩溃也不会留下半个文件
+    - DebouncedFileWriter: 合并短时间内的多次保存请求, 在后台线程中只写入最后一次的内容
+"""
+
+# 标准库导入
+import os
+import stat
+import time
+import atexit
+import tempfile
+import threading
+from pathlib import Path
+
+# 项目内模块导入
+from src.core.utils.logger import LogType, LogSource, logger
+
+
+def _read_umask() -> int:
+    """
+    ## 读取进程的 umask
+        umask 只能通过设置来读取, 在导入时读取一次, 避免写入线程临时修改进程范围的 umask
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+_UMASK = _read_umask()
+
+
+def _file_mode(path: Path) -> int:
+    """
+    ## 文件被替换后应有的权限: 沿用现有文件的权限, 新文件为 0666 去掉 umask
+    """
+    try:
+        return stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def atomic_write(path: Path | str, data: str | bytes, encoding: str = "utf-8", skip_unchanged: bool = True) -> bool:
+    """
+    ## 原子地写入文件
+
+    ## 参数
+        - path: Path | str - 目标文件路径
+        - data: str | bytes - 文件内容
+        - encoding: str - data 为 str 时使用的编码
+        - skip_unchanged: bool - 内容与现有文件一致时跳过写入
+
+    ## 返回
+        - bool: 是否实际写入了文件
+    """
+    path = Path(path)
+    content = data.encode(encoding) if isinstance(data, str) else data
+
+    if skip_unchanged:
+        try:
+            if path.stat().st_size == len(content) and path.read_bytes() == content:
+                return False
+        except FileNotFoundError:
+            pass
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp 创建的文件权限为 0600, 替换后会保留下来, 这里改为与普通方式创建的文件一致
+        os.chmod(temp, _file_mode(path))
+        os.replace(temp, path)
+    except BaseException:
+        Path(temp).unlink(missing_ok=True)
+        raise
+    return True
+
+
+class DebouncedFileWriter:
+    """防抖的后台文件写入器"""
+
+    def __init__(self, delay: float = 0.5, name: str = "NCD-FileWriter") -> None:
+        """
+        ## 初始化写入器
+
+        ## 参数
+            - delay: float - 防抖窗口 (秒), 窗口内的多次请求只写入一次
+            - name: str - 后台线程名称
+        """
+        self.delay = delay
+        self.name = name
+
+        self._condition = threading.Condition()
+        self._pending: tuple[Path, str | bytes] | None = None
+        self._due = 0.0
+        self._writing = False
+        self._thread: threading.Thread | None = None
+
+        # 程序退出时写入尚未落盘的内容
+        atexit.register(self.flush)
+
+    def schedule(self, path: Path, data: str | bytes) -> None:
+        """
+        ## 请求写入文件, 防抖窗口从最后一次请求开始计算
+
+        ## 参数
+            - path: Path - 目标文件路径
+            - data: str | bytes - 文件内容, 由调用方在自己的线程中生成, 后台线程只负责写入
+        """
+        with self._condition:
+            self._pending = (path, data)
+            self._due = time.monotonic() + self.delay
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def cancel(self) -> None:
+        """
+        ## 放弃尚未写入的请求, 用于文件被直接替换或删除的场景
+        """
+        with self._condition:
+            self._pending = None
+            self._condition.notify_all()
+
+    def hasPending(self) -> bool:
+        """
+        ## 是否有尚未写入的请求
+        """
+        with self._condition:
+            return self._pending is not None or self._writing
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """
+        ## 立即写入尚未写入的请求并等待完成
+
+        ## 参数
+            - timeout: float | None - 最长等待时间, None 为一直等待
+
+        ## 返回
+            - bool: 是否在超时前完成
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._due = time.monotonic()
+            self._condition.notify_all()
+            while self._pending is not None or self._writing:
+                if self._thread is None or not self._thread.is_alive():
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def _run(self) -> None:
+        """
+        ## 后台线程主循环
+        """
+        while True:
+            with self._condition:
+                while self._pending is None or (wait := self._due - time.monotonic()) > 0:
+                    self._condition.wait(None if self._pending is None else wait)
+                (path, data), self._pending = self._pending, None
+                self._writing = True
+
+            try:
+                atomic_write(path, data)
+            except Exception as e:
+                # 写入失败不影响后续请求, 错误记录到日志中
+                logger.error(f"写入文件 {path} 失败: {type(e).__name__}: {e}", LogType.FILE_FUNC, LogSource.CORE)
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+
+__all__ = ["atomic_write", "DebouncedFileWriter"]
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+## 日志环形缓冲区
+    固定容量, 追加与淘汰均为 O(1), 支持按下标访问以供日志查看器使用
+    容量按日志条数计算, LogGroup 按其内部日志条数计入容量
+"""
+
+# 标准库导入
+import threading
+from typing import Iterator
+
+# 项目内模块导入
+from src.core.utils.logger.log_data import Log, LogGroup
+
+
+class LogRingBuffer:
+    """Log / LogGroup 的固定容量环形缓冲区"""
+
+    def __init__(self, capacity: int = 5000) -> None:
+        """
+        ## 初始化缓冲区
+
+        ## 参数
+            - capacity: int - 最多保存的日志条数 (LogGroup 内的日志也计入)
+        """
+        self._lock = threading.RLock()
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        ## 分配存储空间并清空缓冲区
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self._capacity = capacity
+        # 每个条目至少包含一条日志, 因此槽位数不会超过容量
+        self._slots: list[Log | LogGroup | None] = [None] * capacity
+        self._weights = [0] * capacity
+        self._head = 0  # 最旧条目所在的槽位
+        self._size = 0  # 条目数量
+        self._records = 0  # 日志条数
+
+    @property
+    def capacity(self) -> int:
+        """最多保存的日志条数"""
+        return self._capacity
+
+    @property
+    def record_count(self) -> int:
+        """当前保存的日志条数 (展开 LogGroup 后)"""
+        return self._records
+
+    def setCapacity(self, capacity: int) -> None:
+        """
+        ## 调整容量, 保留最新的日志
+        """
+        with self._lock:
+            entries = list(self)
+            self._allocate(capacity)
+            for entry in entries:
+                self.append(entry)
+
+    def append(self, entry: Log | LogGroup) -> None:
+        """
+        ## 追加日志或日志组, 超出容量时淘汰最旧的条目
+
+        ## 参数
+            - entry: Log | LogGroup - 日志或日志组
+        """
+        with self._lock:
+            if isinstance(entry, LogGroup):
+                # 单个日志组超过整个容量时只保留其最新的日志
+                if len(entry.logs) > self._capacity:
+                    del entry.logs[: len(entry.logs) - self._capacity]
+                weight = max(len(entry.logs), 1)
+            else:
+                weight = 1
+
+            # 淘汰最旧的条目直到能放下新条目
+            while self._size and (self._records + weight > self._capacity or self._size == self._capacity):
+                self._popleft()
+
+            index = (self._head + self._size) % self._capacity
+            self._slots[index] = entry
+            self._weights[index] = weight
+            self._size += 1
+            self._records += weight
+
+    def _popleft(self) -> None:
+        """
+        ## 淘汰最旧的条目
+        """
+        self._slots[self._head] = None
+        self._records -= self._weights[self._head]
+        self._head = (self._head + 1) % self._capacity
+        self._size -= 1
+
+    def clear(self) -> None:
+        """
+        ## 清空缓冲区
+        """
+        with self._lock:
+            self._allocate(self._capacity)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> Log | LogGroup:
+        """
+        ## 按下标访问条目, 0 为最旧的条目, 支持负数下标
+        """
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("log buffer index out of range")
+        return self._slots[(self._head + index) % self._capacity]
+
+    def __iter__(self) -> Iterator[Log | LogGroup]:
+        """
+        ## 从旧到新遍历条目快照
+        """
+        return iter(self.snapshot())
+
+    def snapshot(self, start: int = 0, stop: int | None = None) -> list[Log | LogGroup]:
+        """
+        ## 获取 [start, stop) 范围内条目的副本, 供 UI 在其他线程继续写入时安全遍历
+
+        ## 参数
+            - start: int - 起始下标
+            - stop: int | None - 结束下标, None 表示到最新条目
+
+        ## 返回
+            - list[Log | LogGroup]: 从旧到新的条目列表
+        """
+        with self._lock:
+            start, stop, _ = slice(start, stop).indices(self._size)
+            if start >= stop:
+                return []
+            begin, end = (self._head + start) % self._capacity, (self._head + stop) % self._capacity
+            if begin < end:
+                return self._slots[begin:end]
+            return self._slots[begin:] + self._slots[:end]
+
+    def iterRecords(self) -> Iterator[Log]:
+        """
+        ## 从旧到新遍历所有日志, LogGroup 会被展开
+        """
+        for entry in self:
+            if isinstance(entry, LogGroup):
+                yield from entry.logs
+            else:
+                yield entry
+
+
+__all__ = ["LogRingBuffer"]
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+## 日志列式存储
+    将日志的等级、类型、来源、时间分别存入 `array` 列, 消息存入带引用计数的字符串表,
+    位置存入位置表, 每条日志只占用若干个机器字, 适合长时间保存大量日志
+    读取时按需还原为 `Log` 对象, 格式化结果与 `Log` 完全一致
+"""
+
+# 标准库导入
+import threading
+from array import array
+from typing import Iterator
+
+# 项目内模块导入
+from src.core.utils.logger.log_data import Log, LogPosition
+from src.core.utils.logger.log_enum import LogType, LogLevel, LogSource
+
+# 枚举值到成员的映射, 下标即枚举值
+_LEVELS = tuple(sorted(LogLevel, key=lambda item: item.value))
+_TYPES = tuple(sorted(LogType, key=lambda item: item.value))
+_SOURCES = tuple(sorted(LogSource, key=lambda item: item.value))
+
+
+class LogColumnStore:
+    """固定容量的列式日志环形存储"""
+
+    def __init__(self, capacity: int = 5000) -> None:
+        """
+        ## 初始化存储
+
+        ## 参数
+            - capacity: int - 最多保存的日志条数
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self._lock = threading.Lock()
+        self._capacity = capacity
+        self._head = 0
+        self._size = 0
+
+        # 定长列
+        self._levels = array("B", bytes(capacity))
+        self._types = array("B", bytes(capacity))
+        self._sources = array("B", bytes(capacity))
+        self._times = array("d", bytes(8 * capacity))
+        self._messages = array("I", bytes(4 * capacity))
+        self._positions = array("I", bytes(4 * capacity))
+
+        # 消息字符串表, 相同消息只保存一份
+        self._strings: list[str | None] = []
+        self._string_ids: dict[str, int] = {}
+        self._string_refs = array("I")
+        self._free_ids: list[int] = []
+
+        # 位置表, 调用位置数量有限, 不做淘汰
+        self._position_table: list[LogPosition | None] = []
+        self._position_ids: dict[LogPosition | None, int] = {}
+
+    @property
+    def capacity(self) -> int:
+        """最多保存的日志条数"""
+        return self._capacity
+
+    def append(self, log: Log) -> None:
+        """
+        ## 追加一条日志, 超出容量时淘汰最旧的日志
+        """
+        with self._lock:
+            if self._size == self._capacity:
+                self._releaseString(self._messages[self._head])
+                self._head = (self._head + 1) % self._capacity
+                self._size -= 1
+
+            index = (self._head + self._size) % self._capacity
+            self._levels[index] = log.level.value
+            self._types[index] = log.log_type.value
+            self._sources[index] = log.source.value
+            self._times[index] = log.time
+            self._messages[index] = self._acquireString(log.message)
+            self._positions[index] = self._positionId(log.position)
+            self._size += 1
+
+    def _acquireString(self, text: str) -> int:
+        """
+        ## 获取消息在字符串表中的下标, 并增加引用计数
+        """
+        if (string_id := self._string_ids.get(text)) is None:
+            if self._free_ids:
+                string_id = self._free_ids.pop()
+                self._strings[string_id] = text
+                self._string_refs[string_id] = 0
+            else:
+                string_id = len(self._strings)
+                self._strings.append(text)
+                self._string_refs.append(0)
+            self._string_ids[text] = string_id
+        self._string_refs[string_id] += 1
+        return string_id
+
+    def _releaseString(self, string_id: int) -> None:
+        """
+        ## 减少消息引用计数, 无引用时回收
+        """
+        self._string_refs[string_id] -= 1
+        if not self._string_refs[string_id]:
+            del self._string_ids[self._strings[string_id]]
+            self._strings[string_id] = None
+            self._free_ids.append(string_id)
+
+    def _positionId(self, position: LogPosition | None) -> int:
+        """
+        ## 获取位置在位置表中的下标
+        """
+        if (position_id := self._position_ids.get(position)) is None:
+            position_id = self._position_ids[position] = len(self._position_table)
+            self._position_table.append(position)
+        return position_id
+
+    def clear(self) -> None:
+        """
+        ## 清空存储
+        """
+        with self._lock:
+            self._head = self._size = 0
+            self._strings.clear()
+            self._string_ids.clear()
+            self._string_refs = array("I")
+            self._free_ids.clear()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> Log:
+        """
+        ## 按下标还原日志, 0 为最旧的日志, 支持负数下标
+        """
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("log store index out of range")
+        index = (self._head + index) % self._capacity
+        return Log(
+            level=_LEVELS[self._levels[index]],
+            message=self._strings[self._messages[index]],
+            time=self._times[index],
+            log_type=_TYPES[self._types[index]],
+            source=_SOURCES[self._sources[index]],
+            position=self._position_table[self._positions[index]],
+        )
+
+    def __iter__(self) -> Iterator[Log]:
+        """
+        ## 从旧到新遍历日志
+        """
+        for index in range(self._size):
+            yield self[index]
+
+
+__all__ = ["LogColumnStore"]
@@ -6,8 +6,29 @@ from dataclasses import dataclass
 # 项目内模块导入
 from src.core.utils.logger.log_enum import LogType, LogLevel, LogSource
 
+# 最近一次格式化的 (秒, 日期前缀), 同一秒内的日志直接复用
+_time_cache: tuple[int, str] = (-1, "")
 
-@dataclass(frozen=True)
+
+def format_log_time(timestamp: int | float) -> str:
+    """
+    ## 格式化日志时间, 精确到秒
+        - 同一秒内的连续日志跳过 strftime, 直接复用上次的结果
+
+    ## 参数
+        - timestamp: int | float - 时间戳
+
+    ## 返回
+        - str: 形如 `24-01-01 12:00:00` 的时间字符串
+    """
+    global _time_cache
+    second = int(timestamp)
+    if (cache := _time_cache)[0] != second:
+        cache = _time_cache = (second, datetime.fromtimestamp(second).strftime("%y-%m-%d %H:%M:%S"))
+    return cache[1]
+
+
+@dataclass(frozen=True, slots=True)
 class LogPosition:
     """日志模块位置, 用于定位日志来源"""
 
@@ -19,7 +40,7 @@ class LogPosition:
         return f"[{self.module} > {self.file}:{self.line}]"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Log:
     """基本日志内容"""
 
@@ -33,16 +54,19 @@ class Log:
     source: LogSource  # 日志来源
     position: LogPosition  # 日志位置
 
+    # 不缓存格式化结果: 每个输出只渲染一次, 缓存会让缓冲区中每条日志的内存占用翻倍
+
     def __str__(self):
-        time = datetime.fromtimestamp(self.time).strftime("%y-%m-%d %H:%M:%S")
-        return f"{time} | {self.level} | {self.message}"
+        return f"{format_log_time(self.time)} | {self.level} | {self.message}"
 
     def toString(self):
         """
         ## 转为字符串
         """
-        time = datetime.fromtimestamp(self.time).strftime("%y-%m-%d %H:%M:%S")
-        return f"{time} | {self.level} | {self.log_type} | {self.source} | {self.position} | {self.message}"
+        return (
+            f"{format_log_time(self.time)} | {self.level} | {self.log_type} | {self.source} | {self.position} | "
+            f"{self.message}"
+        )
 
 
 @dataclass()
@@ -66,4 +90,4 @@ class LogGroup:
         return "\n".join([log.toString() for log in self.logs])
 
 
-__all__ = ["LogPosition", "Log", "LogGroup"]
+__all__ = ["LogPosition", "Log", "LogGroup", "format_log_time"]
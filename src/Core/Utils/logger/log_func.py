@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 # 标准库导入
+import threading
 from pathlib import Path
 from datetime import datetime
 from contextlib import contextmanager
@@ -8,28 +9,79 @@ from contextlib import contextmanager
 from src.core.utils.logger.log_data import Log, LogGroup, LogPosition
 from src.core.utils.logger.log_enum import LogType, LogLevel, LogSource
 from src.core.utils.logger.log_utils import capture_call_location
+from src.core.utils.logger.log_buffer import LogRingBuffer
+from src.core.utils.logger.log_writer import LogWriter
+from src.core.utils.logger.log_retention import sweepLogFiles
 
 
 class Logger:
     """NCD 内部日志记录器"""
 
-    log_buffer: list[Log]
+    log_buffer: LogRingBuffer
 
     log_buffer_size: int
-    log_buffer_delete_size: int
+
+    log_writer: LogWriter | None
+
+    # 各输出的最低日志等级
+    file_level: LogLevel
+    console_level: LogLevel
+    buffer_level: LogLevel
 
     def __init__(self):
         """初始化日志记录器"""
         # Log 缓冲区
-        self.log_buffer = []
+        self.log_buffer = LogRingBuffer()
+        # 日志文件写入器
+        self.log_writer = None
+        # 默认记录所有等级, 加载配置后再调整
+        self.setLevels(LogLevel.DBUG, LogLevel.DBUG, LogLevel.DBUG)
 
     def load_config(self):
         """
         ## 加载配置项
         """
-        self.log_buffer_size = 5000  # 日志缓冲区大小
-        self.log_buffer_delete_size = 1000  # 删除缓冲区日志数量
+        self.log_buffer_size = 5000  # 日志缓冲区大小 (日志组内的日志也计入)
         self.log_save_day = 7  # 日志保存天数
+        self.log_save_size = 512 * 1024 * 1024  # 日志目录总大小上限 (字节)
+        self.log_flush_size = 200  # 累计多少行日志后写入文件
+        self.log_flush_interval = 1.0  # 最长多少秒写入一次文件
+
+        self.log_buffer.setCapacity(self.log_buffer_size)
+
+    def applyConfig(self, config) -> None:
+        """
+        ## 从程序配置读取各输出的最低日志等级, 并在配置改变时同步
+
+        ## 参数
+            - config: Config - 程序配置
+        """
+        self.setLevels(
+            config.get(config.fileLogLevel), config.get(config.consoleLogLevel), config.get(config.bufferLogLevel)
+        )
+        config.fileLogLevel.valueChanged.connect(lambda level: self.setLevels(file=level))
+        config.consoleLogLevel.valueChanged.connect(lambda level: self.setLevels(console=level))
+        config.bufferLogLevel.valueChanged.connect(lambda level: self.setLevels(buffer=level))
+
+    def setLevels(self, file: LogLevel = None, console: LogLevel = None, buffer: LogLevel = None) -> None:
+        """
+        ## 设置各输出的最低日志等级, 未指定的输出保持不变
+
+        ## 参数
+            - file: LogLevel - 日志文件
+            - console: LogLevel - 控制台
+            - buffer: LogLevel - 内存缓冲区
+        """
+        self.file_level = file or self.file_level
+        self.console_level = console or self.console_level
+        self.buffer_level = buffer or self.buffer_level
+        self._min_level = min(self.file_level.value, self.console_level.value, self.buffer_level.value)
+
+    def isEnabledFor(self, level: LogLevel) -> bool:
+        """
+        ## 判断该等级的日志是否会被任一输出记录
+        """
+        return level.value >= self._min_level
 
     def createLogFile(self):
         """
@@ -41,19 +93,49 @@ class Logger:
         if not (log_dir := Path.cwd() / ".NapCat Desktop" / "log").exists():
             log_dir.mkdir(parents=True, exist_ok=True)
         self.log_path = log_dir / f"{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.log"
+        self.log_writer = LogWriter(self.log_path, self.log_flush_size, self.log_flush_interval)
 
-        # 遍历日志文件夹, 删除过期日志文件(超过 7 天)
-        for log_file in log_dir.iterdir():
-            if (datetime.now() - datetime.fromtimestamp(log_file.stat().st_mtime)).days > self.log_save_day:
-                log_file.unlink()
+    def sweepLogFiles(self) -> None:
+        """
+        ## 在后台线程中清理日志目录
+            - 删除超过 日志保存天数 的日志, 压缩已轮转的日志, 并将目录总大小控制在 日志目录总大小上限 内
+            - 启动时会扫描整个目录, 应在主窗体显示之后调用
+        """
+
+        def run() -> None:
+            report = sweepLogFiles(self.log_path.parent, self.log_save_day, self.log_save_size, {self.log_path})
+            self.info(
+                f"日志清理完成: 删除 {report.deleted} 个, 压缩 {report.compressed} 个, "
+                f"释放 {report.reclaimed_bytes / 1024 / 1024:.2f} MB",
+                LogType.FILE_FUNC,
+                LogSource.CORE,
+            )
+            for error in report.errors:
+                self.warning(f"日志清理失败: {error}", LogType.FILE_FUNC, LogSource.CORE)
+
+        threading.Thread(target=run, name="NCD-LogRetention", daemon=True).start()
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """
+        ## 将已记录的日志立即写入文件
+            - 用于测试或崩溃处理等需要确保日志落盘的场景
+
+        ## 参数
+            - timeout: float | None - 最长等待时间, None 为一直等待
+
+        ## 返回
+            - bool: 是否在超时前写入完成
+        """
+        if self.log_writer is None:
+            return False
+        return self.log_writer.flush(timeout)
 
     def clearBuffer(self):
         """
-        ## 清理日志缓冲区
-            - 当日志列表长度超过 日志缓冲区大小 时, 并根据 删除缓冲区日志数量 清理缓冲区
+        ## 清空日志缓冲区
+            - 缓冲区满时会自动淘汰最旧的日志, 无需手动调用
         """
-        if len(self.log_buffer) >= self.log_buffer_size:
-            self.log_buffer = self.log_buffer[self.log_buffer_delete_size :]
+        self.log_buffer.clear()
 
     def _log(
         self,
@@ -80,22 +162,23 @@ class Logger:
         # 构造 Log
         log = Log(level, message, time, log_type, log_source, log_position)
 
-        if log_group:
-            # 如果提供了 log_group，将日志添加到它的内部
-            log_group.add(log)
-        else:
-            # 否则直接添加到 log_buffer
-            self.log_buffer.append(log)
-
-        # 遍历日志列表, 追加到日志文件中
-        with open(self.log_path, "a", encoding="utf-8") as f:
-            f.write(log.toString() + "\n")
-        # 判断是否需要清理缓冲区
-        self.clearBuffer()
-        # 打印 log
-        print(log)
-
-    @capture_call_location
+        if level.value >= self.buffer_level.value:
+            if log_group:
+                # 如果提供了 log_group，将日志添加到它的内部
+                log_group.add(log)
+            else:
+                # 否则直接添加到 log_buffer, 缓冲区满时自动淘汰最旧的日志
+                self.log_buffer.append(log)
+
+        if level.value >= self.file_level.value:
+            # 交由后台线程追加到日志文件中
+            self.log_writer.write(log.toString())
+
+        if level.value >= self.console_level.value:
+            # 打印 log
+            print(log)
+
+    @capture_call_location(level=LogLevel.DBUG)
     def debug(
         self,
         message: str,
@@ -106,7 +189,7 @@ class Logger:
     ):
         self._log(LogLevel.DBUG, message, datetime.now().timestamp(), log_type, log_source, log_position, log_group)
 
-    @capture_call_location
+    @capture_call_location(level=LogLevel.INFO)
     def info(
         self,
         message: str,
@@ -117,7 +200,7 @@ class Logger:
     ):
         self._log(LogLevel.INFO, message, datetime.now().timestamp(), log_type, log_source, log_position, log_group)
 
-    @capture_call_location
+    @capture_call_location(level=LogLevel.WARN)
     def warning(
         self,
         message: str,
@@ -128,7 +211,7 @@ class Logger:
     ):
         self._log(LogLevel.WARN, message, datetime.now().timestamp(), log_type, log_source, log_position, log_group)
 
-    @capture_call_location
+    @capture_call_location(level=LogLevel.EROR)
     def error(
         self,
         message: str,
@@ -152,7 +235,8 @@ class Logger:
             self.info(
                 f"{'-' * 20} > {name} 结束 < {'-' * 20}", log_type=log_type, log_source=log_source, log_group=log_group
             )
-            self.log_buffer.append(log_group)
+            if log_group.logs:
+                self.log_buffer.append(log_group)
 
 
 # 实例化日志记录器
@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+"""
+## 日志检索索引
+    对日志缓冲区中的 Log 以及历史 `.log` / `.log.gz` 文件建立内存索引:
+    - 倒排词索引: 词 -> 条目编号
+    - 等级、类型、来源索引: 日志等级 / 类型 / 来源 -> 条目编号
+    - 时间桶索引: 时间桶 -> 条目编号
+    - 定长列: 等级、类型、来源、时间、所在文档与偏移
+
+    查询时从最小的候选列表出发, 其余条件通过二分查找或列比较过滤, 百万行级别的日志也能在毫秒级返回
+"""
+
+# 标准库导入
+import io
+import re
+import gzip
+import heapq
+import threading
+from array import array
+from bisect import bisect_left
+from typing import BinaryIO, Iterable, Iterator
+from pathlib import Path
+from datetime import datetime
+from dataclasses import dataclass
+
+# 项目内模块导入
+from src.core.utils.logger.log_data import Log, LogGroup
+from src.core.utils.logger.log_enum import LogType, LogLevel, LogSource
+from src.core.utils.logger.log_retention import COMPRESSED_SUFFIX
+
+# 时间桶大小 (秒)
+BUCKET_SECONDS = 60
+
+# 英文与数字按单词切分, 中日韩文字按单字切分
+_TOKEN_PATTERN = re.compile(r"[0-9a-z_]+|[぀-ヿ㐀-鿿가-힯]")
+
+# NCD 日志文件的行格式, 与 Log.toString 一致
+_LINE_PATTERN = re.compile(
+    r"^(\d{2}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) \| \[(\w{4})\] \| \[\s*(\w+)\s*\] \| \[\s*(\w+)\s*\] \| \[.*?\] \| (.*)$"
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    ## 将文本切分为索引词
+    """
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+@dataclass(frozen=True, slots=True)
+class LogQuery:
+    """日志查询条件, 未指定的条件不参与过滤"""
+
+    levels: frozenset[LogLevel] | None = None  # 日志等级
+    log_type: LogType | None = None  # 日志类型
+    source: LogSource | None = None  # 日志来源
+    since: float | None = None  # 起始时间戳 (含)
+    until: float | None = None  # 结束时间戳 (含)
+    # 需要包含的文本, 按空白切分为多个片段, 每个片段都需要出现在日志中 (不要求顺序与相邻)
+    text: str | None = None
+    limit: int = 1000  # 最多返回的条目数
+
+
+@dataclass(frozen=True, slots=True)
+class LogHit:
+    """查询结果"""
+
+    path: Path | None  # 所在日志文件, 来自缓冲区时为 None
+    level: LogLevel
+    time: float
+    text: str
+
+
+@dataclass(slots=True)
+class _Document:
+    """被索引的日志来源"""
+
+    path: Path | None  # 日志文件路径, 内存日志为 None
+    records: list[Log] | None  # 内存日志
+    indexed_end: int = 0  # 日志文件已索引到的字节位置
+
+
+class LogIndex:
+    """日志检索索引"""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        ## 清空索引
+        """
+        with self._lock:
+            self._documents: list[_Document] = []
+            self._file_documents: dict[Path, int] = {}
+
+            # 条目定长列
+            self._levels = array("B")
+            self._types = array("B")
+            self._sources = array("B")
+            self._times = array("d")
+            self._doc_ids = array("I")
+            self._offsets = array("Q")  # 文件中的字节偏移, 或内存日志的下标
+
+            # 倒排索引
+            self._postings: dict[str, array] = {}
+            self._level_postings: dict[int, array] = {}
+            self._type_postings: dict[int, array] = {}
+            self._source_postings: dict[int, array] = {}
+            self._bucket_postings: dict[int, array] = {}
+
+            # 时间字符串解析缓存, 同一秒的日志只解析一次
+            self._time_cache: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._levels)
+
+    @classmethod
+    def fromBuffer(cls, records: Iterable[Log | LogGroup]) -> "LogIndex":
+        """
+        ## 为日志缓冲区建立索引
+            - 缓冲区会淘汰旧日志, 需要时重新建立即可, 5000 条日志的索引只需数毫秒
+
+        ## 参数
+            - records: Iterable[Log | LogGroup] - 如 `logger.log_buffer`
+        """
+        index = cls()
+        index.addRecords(records)
+        return index
+
+    def addRecords(self, records: Iterable[Log | LogGroup]) -> None:
+        """
+        ## 索引内存中的日志, LogGroup 会被展开
+        """
+        with self._lock:
+            document = _Document(path=None, records=[])
+            doc_id = self._addDocument(document)
+            for record in records:
+                for log in record.logs if isinstance(record, LogGroup) else (record,):
+                    self._addEntry(
+                        doc_id,
+                        len(document.records),
+                        log.level.value,
+                        log.log_type.value,
+                        log.source.value,
+                        log.time,
+                        log.message,
+                    )
+                    document.records.append(log)
+
+    def addFile(self, path: Path | str) -> int:
+        """
+        ## 索引 NCD 日志文件, 对同一文件重复调用时只索引新增的内容
+            - 支持被日志清理压缩的 `.log.gz` 文件, 压缩后的文件不会再变化, 只索引一次
+
+        ## 参数
+            - path: Path | str - 日志文件路径
+
+        ## 返回
+            - int: 新索引的行数
+        """
+        path = Path(path)
+        with self._lock:
+            if (doc_id := self._file_documents.get(path)) is None:
+                doc_id = self._file_documents[path] = self._addDocument(_Document(path=path, records=None))
+            document = self._documents[doc_id]
+
+            compressed = path.suffix == COMPRESSED_SUFFIX
+            if compressed and document.indexed_end:
+                return 0
+
+            count = 0
+            with gzip.open(path, "rb") if compressed else open(path, "rb") as f:
+                f.seek(document.indexed_end)
+                offset = document.indexed_end
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        # 尚未写完的行留到下次索引
+                        break
+                    line_offset, offset = offset, offset + len(raw)
+                    if match := _LINE_PATTERN.match(raw.decode("utf-8", errors="replace").rstrip("\r\n")):
+                        time_text, level, log_type, source, message = match.groups()
+                        try:
+                            entry = (LogLevel[level].value, LogType[log_type].value, LogSource[source].value)
+                        except KeyError:
+                            continue
+                        self._addEntry(doc_id, line_offset, *entry, self._parseTime(time_text), message)
+                        count += 1
+                document.indexed_end = offset
+            return count
+
+    def _addDocument(self, document: _Document) -> int:
+        """
+        ## 登记日志来源并返回其编号
+        """
+        self._documents.append(document)
+        return len(self._documents) - 1
+
+    def _parseTime(self, text: str) -> float:
+        """
+        ## 解析日志中的时间字符串
+        """
+        if (timestamp := self._time_cache.get(text)) is None:
+            timestamp = self._time_cache[text] = datetime.strptime(text, "%y-%m-%d %H:%M:%S").timestamp()
+        return timestamp
+
+    def _addEntry(
+        self, doc_id: int, offset: int, level: int, log_type: int, source: int, time: float, message: str
+    ) -> None:
+        """
+        ## 添加一个条目到各个索引
+        """
+        entry_id = len(self._levels)
+        self._levels.append(level)
+        self._types.append(log_type)
+        self._sources.append(source)
+        self._times.append(time)
+        self._doc_ids.append(doc_id)
+        self._offsets.append(offset)
+
+        for token in set(tokenize(message)):
+            if (posting := self._postings.get(token)) is None:
+                posting = self._postings[token] = array("I")
+            posting.append(entry_id)
+        self._level_postings.setdefault(level, array("I")).append(entry_id)
+        self._type_postings.setdefault(log_type, array("I")).append(entry_id)
+        self._source_postings.setdefault(source, array("I")).append(entry_id)
+        self._bucket_postings.setdefault(int(time // BUCKET_SECONDS), array("I")).append(entry_id)
+
+    def search(self, query: LogQuery) -> list[LogHit]:
+        """
+        ## 按条件查询日志, 结果按索引顺序从新到旧排列
+
+        ## 参数
+            - query: LogQuery - 查询条件
+
+        ## 返回
+            - list[LogHit]: 查询结果
+        """
+        with self._lock:
+            tokens = sorted({*tokenize(query.text)} if query.text else (), key=self._postingSize)
+            if any(token not in self._postings for token in tokens):
+                return []
+            token_postings = [self._postings[token] for token in tokens]
+
+            # 选出最小的候选列表作为遍历的起点
+            candidates: list[tuple[int, Iterator[int]]] = []
+            if token_postings:
+                candidates.append((len(token_postings[0]), reversed(token_postings[0])))
+                token_postings = token_postings[1:]
+            if query.levels is not None:
+                postings = [self._level_postings.get(level.value, array("I")) for level in query.levels]
+                candidates.append((sum(map(len, postings)), self._mergeNewestFirst(postings)))
+            if query.log_type is not None:
+                posting = self._type_postings.get(query.log_type.value, array("I"))
+                candidates.append((len(posting), reversed(posting)))
+            if query.source is not None:
+                posting = self._source_postings.get(query.source.value, array("I"))
+                candidates.append((len(posting), reversed(posting)))
+            if query.since is not None or query.until is not None:
+                postings = self._bucketPostings(query.since, query.until)
+                candidates.append((sum(map(len, postings)), self._mergeNewestFirst(postings)))
+            base = min(candidates, key=lambda item: item[0])[1] if candidates else reversed(range(len(self)))
+
+            # 倒排索引只保证每个词都出现, 片段内的词是否相邻需要比较原文
+            hits, fragments = [], query.text.lower().split() if query.text else []
+            files: dict[int, object] = {}
+            try:
+                for entry_id in base:
+                    if not self._matches(entry_id, query, token_postings):
+                        continue
+                    text = self._readText(entry_id, files)
+                    if fragments:
+                        lowered = text.lower()
+                        if not all(fragment in lowered for fragment in fragments):
+                            continue
+                    hits.append(
+                        LogHit(
+                            path=self._documents[self._doc_ids[entry_id]].path,
+                            level=LogLevel(self._levels[entry_id]),
+                            time=self._times[entry_id],
+                            text=text,
+                        )
+                    )
+                    if len(hits) >= query.limit:
+                        break
+            finally:
+                for f in files.values():
+                    f.close()
+            return hits
+
+    def _postingSize(self, token: str) -> int:
+        """
+        ## 获取词的倒排列表长度, 不存在的词视为 0
+        """
+        return len(self._postings.get(token, ()))
+
+    def _bucketPostings(self, since: float | None, until: float | None) -> list[array]:
+        """
+        ## 获取时间范围覆盖的时间桶
+        """
+        first = int(since // BUCKET_SECONDS) if since is not None else None
+        last = int(until // BUCKET_SECONDS) if until is not None else None
+        return [
+            posting
+            for bucket, posting in self._bucket_postings.items()
+            if (first is None or bucket >= first) and (last is None or bucket <= last)
+        ]
+
+    @staticmethod
+    def _mergeNewestFirst(postings: list[array]) -> Iterator[int]:
+        """
+        ## 合并多个升序的倒排列表, 从大到小输出
+        """
+        if len(postings) == 1:
+            return reversed(postings[0])
+        return heapq.merge(*(reversed(posting) for posting in postings), reverse=True)
+
+    def _matches(self, entry_id: int, query: LogQuery, token_postings: list[array]) -> bool:
+        """
+        ## 判断条目是否满足查询条件
+        """
+        if query.levels is not None and LogLevel(self._levels[entry_id]) not in query.levels:
+            return False
+        if query.log_type is not None and self._types[entry_id] != query.log_type.value:
+            return False
+        if query.source is not None and self._sources[entry_id] != query.source.value:
+            return False
+        if query.since is not None and self._times[entry_id] < query.since:
+            return False
+        if query.until is not None and self._times[entry_id] > query.until:
+            return False
+        for posting in token_postings:
+            position = bisect_left(posting, entry_id)
+            if position == len(posting) or posting[position] != entry_id:
+                return False
+        return True
+
+    def _readText(self, entry_id: int, files: dict) -> str:
+        """
+        ## 读取条目对应的完整日志文本
+        """
+        doc_id = self._doc_ids[entry_id]
+        document = self._documents[doc_id]
+        if document.records is not None:
+            return document.records[self._offsets[entry_id]].toString()
+
+        if (f := files.get(doc_id)) is None:
+            f = files[doc_id] = self._openFile(document.path)
+        f.seek(self._offsets[entry_id])
+        return f.readline().decode("utf-8", errors="replace").rstrip("\r\n")
+
+    @staticmethod
+    def _openFile(path: Path) -> BinaryIO:
+        """
+        ## 打开日志文件以读取条目
+            - 索引后被日志清理压缩的文件改为读取 `.log.gz`, 条目的偏移按解压后的内容计算, 压缩前后一致
+            - 压缩文件只能顺序解压, 而检索结果从新到旧读取, 因此一次性解压到内存中
+        """
+        if path.suffix != COMPRESSED_SUFFIX and not path.exists():
+            path = path.with_name(path.name + COMPRESSED_SUFFIX)
+        if path.suffix == COMPRESSED_SUFFIX:
+            with gzip.open(path, "rb") as f:
+                return io.BytesIO(f.read())
+        return open(path, "rb")
+
+
+__all__ = ["LogIndex", "LogQuery", "LogHit", "tokenize"]
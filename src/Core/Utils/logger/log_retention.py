@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+## 日志保留策略
+    在后台清理日志目录:
+    - 删除超过保存天数的日志
+    - 将超过压缩期限的 `.log` 以流式方式压缩为 `.log.gz`, 近期的日志保持原样, 供日志跟随与检索直接读取
+    - 总大小超过预算时从最旧的日志开始删除
+"""
+
+# 标准库导入
+import os
+import gzip
+import time
+import shutil
+from pathlib import Path
+from dataclasses import field, dataclass
+from concurrent.futures import ThreadPoolExecutor
+
+# 压缩日志使用的后缀
+COMPRESSED_SUFFIX = ".gz"
+
+
+@dataclass(slots=True)
+class RetentionReport:
+    """清理结果"""
+
+    deleted: int = 0  # 删除的文件数
+    compressed: int = 0  # 压缩的文件数
+    reclaimed_bytes: int = 0  # 释放的字节数
+    errors: list[str] = field(default_factory=list)  # 处理失败的文件
+
+
+@dataclass(slots=True)
+class _LogFile:
+    """日志文件信息"""
+
+    path: Path
+    size: int
+    mtime: float
+
+
+def _scanLogFiles(log_dir: Path, executor: ThreadPoolExecutor) -> list[_LogFile]:
+    """
+    ## 并行获取日志目录中所有日志文件的信息
+    """
+
+    def stat(entry: os.DirEntry) -> _LogFile | None:
+        try:
+            result = entry.stat()
+        except FileNotFoundError:
+            return None
+        return _LogFile(Path(entry.path), result.st_size, result.st_mtime)
+
+    with os.scandir(log_dir) as entries:
+        entries = [
+            entry
+            for entry in entries
+            if entry.is_file() and (entry.name.endswith(".log") or entry.name.endswith(".log" + COMPRESSED_SUFFIX))
+        ]
+    return [log_file for log_file in executor.map(stat, entries) if log_file is not None]
+
+
+def _compress(log_file: _LogFile) -> _LogFile:
+    """
+    ## 流式压缩日志文件, 保留原修改时间, 完成后删除原文件
+    """
+    target = log_file.path.with_name(log_file.path.name + COMPRESSED_SUFFIX)
+    temp = target.with_name(target.name + ".tmp")
+    try:
+        with open(log_file.path, "rb") as src, gzip.open(temp, "wb", compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        os.utime(temp, (log_file.mtime, log_file.mtime))
+        os.replace(temp, target)
+    except BaseException:
+        # 压缩失败 (如磁盘已满、文件被占用) 时删除临时文件, 清理时不会匹配到它
+        temp.unlink(missing_ok=True)
+        raise
+    log_file.path.unlink()
+    return _LogFile(target, target.stat().st_size, log_file.mtime)
+
+
+def sweepLogFiles(
+    log_dir: Path,
+    max_days: int,
+    max_bytes: int,
+    keep: set[Path] = frozenset(),
+    workers: int = 4,
+    compress_after_days: int = 1,
+) -> RetentionReport:
+    """
+    ## 清理日志目录
+
+    ## 参数
+        - log_dir: Path - 日志目录
+        - max_days: int - 日志保存天数
+        - max_bytes: int - 日志目录总大小预算, 0 表示不限制
+        - keep: set[Path] - 不参与处理的文件 (如当前正在写入的日志)
+        - workers: int - 并行处理的线程数
+        - compress_after_days: int - 超过多少天未修改的日志才会被压缩
+
+    ## 返回
+        - RetentionReport: 清理结果
+    """
+    report = RetentionReport()
+    if not log_dir.exists():
+        return report
+
+    keep = {path.resolve() for path in keep}
+    expire_time = time.time() - max_days * 24 * 60 * 60
+    compress_time = time.time() - compress_after_days * 24 * 60 * 60
+
+    def delete(log_file: _LogFile) -> None:
+        try:
+            log_file.path.unlink()
+        except OSError as e:
+            report.errors.append(f"{log_file.path.name}: {e}")
+            return
+        report.deleted += 1
+        report.reclaimed_bytes += log_file.size
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="NCD-LogRetention") as executor:
+        files = [log_file for log_file in _scanLogFiles(log_dir, executor) if log_file.path.resolve() not in keep]
+
+        # 删除过期日志, 并挑出超过压缩期限的日志
+        alive, raw = [], []
+        for log_file in files:
+            if log_file.mtime < expire_time:
+                delete(log_file)
+            elif log_file.path.suffix == ".log" and log_file.mtime < compress_time:
+                raw.append(log_file)
+            else:
+                alive.append(log_file)
+
+        # 压缩超过压缩期限的日志
+        for log_file, future in [(log_file, executor.submit(_compress, log_file)) for log_file in raw]:
+            try:
+                compressed = future.result()
+            except OSError as e:
+                report.errors.append(f"{log_file.path.name}: {e}")
+                alive.append(log_file)
+                continue
+            report.compressed += 1
+            report.reclaimed_bytes += log_file.size - compressed.size
+            alive.append(compressed)
+
+    # 超出大小预算时从最旧的日志开始删除
+    if max_bytes > 0:
+        total = sum(log_file.size for log_file in alive)
+        for log_file in sorted(alive, key=lambda item: item.mtime):
+            if total <= max_bytes:
+                break
+            delete(log_file)
+            total -= log_file.size
+
+    return report
+
+
+__all__ = ["COMPRESSED_SUFFIX", "RetentionReport", "sweepLogFiles"]
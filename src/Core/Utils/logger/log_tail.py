@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+## 日志文件跟随读取
+    通过内存映射读取 NapCat / NCD 的日志文件, 增量建立稀疏行索引并按需返回指定行,
+    无论日志文件多大, 常驻内存都只有少量索引
+
+    - LogFileTail: 行索引与按需读取
+    - LogTailWatcher: 定时检查文件变化并发出信号, 供 LogViewer 使用
+"""
+
+# 标准库导入
+import os
+import mmap
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+
+from PySide6.QtCore import QTimer, Signal, QObject
+
+# 每个索引检查点间隔的字节数, 读取任意行时最多扫描这么多字节
+CHECKPOINT_BYTES = 256 * 1024
+# 用于检测文件是否被替换的头部字节数
+SIGNATURE_BYTES = 64
+
+
+class LogFileTail:
+    """日志文件行索引"""
+
+    def __init__(self, path: Path | str, encoding: str = "utf-8") -> None:
+        """
+        ## 初始化
+
+        ## 参数
+            - path: Path | str - 日志文件路径
+            - encoding: str - 日志文件编码
+        """
+        self.path = Path(path)
+        self.encoding = encoding
+        self._reset()
+
+    def _reset(self) -> None:
+        """
+        ## 清空索引
+        """
+        # 稀疏检查点: 第 _cp_lines[i] 行从 _cp_offsets[i] 字节处开始
+        self._cp_lines = array("Q", [0])
+        self._cp_offsets = array("Q", [0])
+        self._line_count = 0  # 已索引的完整行数
+        self._indexed_end = 0  # 已索引内容的结束位置 (最后一个换行符之后)
+        self._file_id: tuple[int, int] | None = None
+        self._signature = b""
+
+    @property
+    def line_count(self) -> int:
+        """已索引的完整行数 (不含尚未写完换行符的最后一行)"""
+        return self._line_count
+
+    def poll(self) -> tuple[bool, int]:
+        """
+        ## 检查文件变化并增量更新索引
+            - 文件被轮转 (替换) 或截断时清空索引并从头建立
+
+        ## 返回
+            - tuple[bool, int]: (索引是否被重置, 新增的行数)
+        """
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return False, 0
+
+        reset = False
+        file_id = (stat.st_dev, stat.st_ino)
+        if self._file_id is not None and (file_id != self._file_id or stat.st_size < self._indexed_end):
+            self._reset()
+            reset = True
+        self._file_id = file_id
+
+        if stat.st_size == 0:
+            return reset, 0
+
+        before = self._line_count
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # 文件被截断后又写入超过原长度时, 通过头部内容识别
+            signature = mm[:SIGNATURE_BYTES]
+            if self._signature and not signature.startswith(self._signature[: len(signature)]):
+                self._reset()
+                self._file_id = file_id
+                reset, before = True, 0
+            if len(self._signature) < SIGNATURE_BYTES:
+                self._signature = signature
+            self._index(mm)
+
+        return reset, self._line_count - before
+
+    def _index(self, mm: mmap.mmap) -> None:
+        """
+        ## 从上次索引的位置继续扫描换行符
+        """
+        size = len(mm)
+        start = self._indexed_end
+        while start < size:
+            end = min(start + CHECKPOINT_BYTES, size)
+            chunk = mm[start:end]
+            if (last := chunk.rfind(b"\n")) == -1:
+                # 单行超过检查点间隔, 直接寻找该行的结束位置
+                if (newline := mm.find(b"\n", end)) == -1:
+                    break
+                count, line_end = 1, newline + 1
+            else:
+                count, line_end = chunk.count(b"\n"), start + last + 1
+
+            self._line_count += count
+            self._indexed_end = start = line_end
+            if line_end - self._cp_offsets[-1] >= CHECKPOINT_BYTES:
+                self._cp_lines.append(self._line_count)
+                self._cp_offsets.append(line_end)
+
+    def getLines(self, start: int, stop: int | None = None) -> list[str]:
+        """
+        ## 读取 [start, stop) 范围内的行
+
+        ## 参数
+            - start: int - 起始行号 (从 0 开始), 负数表示倒数
+            - stop: int | None - 结束行号, None 表示到最后一个完整行
+
+        ## 返回
+            - list[str]: 不含换行符的行
+        """
+        start, stop, _ = slice(start, stop).indices(self._line_count)
+        if start >= stop:
+            return []
+
+        checkpoint = bisect_right(self._cp_lines, start) - 1
+        line, offset = self._cp_lines[checkpoint], self._cp_offsets[checkpoint]
+
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # 从检查点跳到起始行
+            while line < start and (newline := mm.find(b"\n", offset)) != -1:
+                offset, line = newline + 1, line + 1
+
+            # 找到结束行的位置后一次性读取并拆分
+            end = offset
+            for _ in range(stop - start):
+                if (newline := mm.find(b"\n", end)) == -1:
+                    break
+                end = newline + 1
+            data = mm[offset:end]
+
+        return [text.rstrip("\r") for text in data.decode(self.encoding, errors="replace").split("\n")[:-1]]
+
+    def getTail(self, count: int) -> list[str]:
+        """
+        ## 读取最后 count 行
+        """
+        return self.getLines(max(self._line_count - count, 0))
+
+
+class LogTailWatcher(QObject):
+    """定时检查日志文件, 有新行时发出信号"""
+
+    linesAppended = Signal(int, int)  # 起始行号, 新增行数
+    fileReset = Signal()  # 文件被轮转或截断
+
+    def __init__(self, path: Path | str, interval: int = 500, parent: QObject = None) -> None:
+        """
+        ## 初始化
+
+        ## 参数
+            - path: Path | str - 日志文件路径
+            - interval: int - 检查间隔 (毫秒)
+        """
+        super().__init__(parent)
+        self.tail = LogFileTail(path)
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.poll)
+
+    def start(self) -> None:
+        """
+        ## 立即建立索引并开始跟随
+        """
+        self.poll()
+        self.timer.start()
+
+    def stop(self) -> None:
+        """
+        ## 停止跟随
+        """
+        self.timer.stop()
+
+    def poll(self) -> None:
+        """
+        ## 检查一次文件变化
+        """
+        try:
+            reset, count = self.tail.poll()
+        except (OSError, ValueError):
+            # 文件正被占用或正在替换, 等待下次检查
+            return
+        if reset:
+            self.fileReset.emit()
+        if count:
+            self.linesAppended.emit(self.tail.line_count - count, count)
+
+
+def latestLogFile(directory: Path | str) -> Path | None:
+    """
+    ## 获取目录中最新的日志文件
+
+    ## 参数
+        - directory: Path | str - 日志目录, 如 `PathFunc().log_path`
+
+    ## 返回
+        - Path | None: 最近修改的 `.log` 文件, 不存在时返回 None
+    """
+    # 日志清理只压缩超过压缩期限未修改的日志, 最新的日志总是未压缩的 `.log`
+    try:
+        files = [entry for entry in os.scandir(directory) if entry.is_file() and entry.name.endswith(".log")]
+    except FileNotFoundError:
+        return None
+    return Path(max(files, key=lambda entry: entry.stat().st_mtime).path) if files else None
+
+
+__all__ = ["LogFileTail", "LogTailWatcher", "latestLogFile"]
@@ -1,47 +1,79 @@
 # 标准库导入
+import sys
 import inspect
+from types import CodeType
 from typing import Any, Callable
 from pathlib import Path
 from functools import wraps
 
 # 项目内模块导入
 from src.core.utils.logger.log_data import LogPosition
+from src.core.utils.logger.log_enum import LogLevel
 
+# 调用位置缓存, 同一代码对象的同一行只会构造一次 LogPosition
+_position_cache: dict[tuple[CodeType, int], LogPosition] = {}
 
-def capture_call_location(func: Callable[..., Any]) -> Callable[..., Any]:
+
+def get_call_position(depth: int = 1) -> LogPosition:
+    """
+    ## 获取调用者的位置信息
+
+    ## 参数
+        - depth: int - 相对于本函数调用者的栈深度, 1 表示调用者的调用者
+
+    ## 返回
+        - LogPosition: 调用位置
+    """
+    frame = sys._getframe(depth + 1)
+    key = (frame.f_code, frame.f_lineno)
+    if (position := _position_cache.get(key)) is None:
+        # 模块名与文件名驻留, 同一文件不同行的 LogPosition 共享字符串
+        module = frame.f_globals.get("__name__")
+        position = _position_cache[key] = LogPosition(
+            module=sys.intern(module) if module is not None else None,
+            file=sys.intern(Path(frame.f_code.co_filename).name),
+            line=frame.f_lineno,
+        )
+    return position
+
+
+def capture_call_location(func: Callable[..., Any] = None, *, level: LogLevel = None) -> Callable[..., Any]:
     """
     ## 日志位置装饰器
         - 用于捕获调用者的位置信息，并将其添加到关键字参数中
+        - 被装饰函数的签名只在装饰时解析一次
+        - 指定 level 时, 若日志记录器 (第一个参数) 的所有输出都不需要该等级, 则在捕获位置前直接返回
 
     ## 参数
         - func: Callable[..., Any] - 被装饰的函数
+        - level: LogLevel - 可选, 被装饰函数记录的日志等级
 
     ## 返回
         - Callable[..., Any] - 装饰后的函数
     """
+    if func is None:
+        # 以 @capture_call_location(level=...) 形式使用
+        return lambda func: capture_call_location(func, level=level)
+
+    # 检查被装饰函数是否存在 log_position 形参
+    capture = "log_position" in inspect.signature(func).parameters
+    if not capture and level is None:
+        return func
 
     @wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> None:
         """
         ## 装饰器函数
         """
-        # 获取调用者的位置信息
-        pos = inspect.stack()[1]
-        position = LogPosition(
-            module=pos.frame.f_globals.get("__name__"),
-            file=Path(pos.filename).name,
-            line=pos.lineno,
-        )
-        # 检查被装饰函数是否存在 log_position 形参
-        if "log_position" in inspect.signature(func).parameters:
-            # 如果存在则将 position 添加到关键字参数中
-            kwargs["log_position"] = position
-            return func(*args, **kwargs)
-        else:
-            # 否则直接调用函数
-            return func(*args, **kwargs)
+        # 日志等级低于所有输出的阈值, 直接丢弃
+        if level is not None and not args[0].isEnabledFor(level):
+            return None
+        if capture:
+            # 获取调用者的位置信息并添加到关键字参数中
+            kwargs["log_position"] = get_call_position()
+        return func(*args, **kwargs)
 
     return wrapper
 
 
-__all__ = ["capture_call_location"]
+__all__ = ["capture_call_location", "get_call_position"]
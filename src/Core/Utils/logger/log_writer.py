@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+## 日志异步写入器
+    日志记录调用只负责把文本放入队列, 由后台线程持有文件句柄并批量写入磁盘,
+    避免每条日志都在 GUI 线程上执行 open/write/close
+"""
+
+# 标准库导入
+import time
+import atexit
+import threading
+from queue import Empty, SimpleQueue
+from pathlib import Path
+
+
+class LogWriter:
+    """后台批量写入日志文件"""
+
+    def __init__(self, path: Path, flush_size: int = 200, flush_interval: float = 1.0) -> None:
+        """
+        ## 初始化写入器
+
+        ## 参数
+            - path: Path - 日志文件路径
+            - flush_size: int - 累计多少行后落盘
+            - flush_interval: float - 距离上次落盘多少秒后强制落盘
+        """
+        self.path = path
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+
+        self._queue = SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="NCD-LogWriter", daemon=True)
+        self._thread.start()
+
+        # 程序退出时确保缓冲中的日志写入文件
+        atexit.register(self.close)
+
+    def write(self, line: str) -> None:
+        """
+        ## 提交一行日志 (不含换行符)
+        """
+        if not self._closed:
+            self._queue.put(line)
+
+    def writeLines(self, lines: list[str]) -> None:
+        """
+        ## 一次提交多行日志 (不含换行符), 只占用一次队列操作
+        """
+        if lines and not self._closed:
+            self._queue.put(lines)
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """
+        ## 阻塞直到此前提交的日志全部写入磁盘
+
+        ## 参数
+            - timeout: float | None - 最长等待时间, None 为一直等待
+
+        ## 返回
+            - bool: 是否在超时前完成
+        """
+        if self._closed or not self._thread.is_alive():
+            return False
+        event = threading.Event()
+        self._queue.put(event)
+        return event.wait(timeout)
+
+    def close(self, wait: bool = True) -> None:
+        """
+        ## 写入剩余日志并停止后台线程
+
+        ## 参数
+            - wait: bool - 是否等待后台线程写完; 不等待时程序退出前仍会等待
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+        if wait:
+            self._thread.join()
+            atexit.unregister(self.close)
+
+    def _run(self) -> None:
+        """
+        ## 后台线程主循环
+        """
+        pending: list[str] = []
+        last_flush = time.monotonic()
+
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except Empty:
+                    item = ""
+
+                # 取出队列中已经积压的内容, 合并为一次写入
+                items = [item]
+                try:
+                    while len(items) < self.flush_size:
+                        items.append(self._queue.get_nowait())
+                except Empty:
+                    pass
+
+                events, stop = [], False
+                for item in items:
+                    if isinstance(item, str):
+                        if item:
+                            pending.append(item)
+                    elif isinstance(item, list):
+                        pending.extend(item)
+                    elif item is None:
+                        stop = True
+                    else:
+                        events.append(item)
+
+                now = time.monotonic()
+                if pending and (
+                    events or stop or len(pending) >= self.flush_size or now - last_flush >= self.flush_interval
+                ):
+                    f.write("\n".join(pending) + "\n")
+                    f.flush()
+                    pending.clear()
+                    last_flush = now
+                elif not pending:
+                    last_flush = now
+
+                for event in events:
+                    event.set()
+
+                if stop:
+                    return
+
+
+__all__ = ["LogWriter"]
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 # 标准库导入
-import winreg
 from pathlib import Path
 
 # 项目内模块导入
@@ -20,9 +19,11 @@ class PathFunc(metaclass=Singleton):
         self.napcat_path = self.base_path / "NapCat"
         self.config_dir_path = self.base_path / "config"
         self.tmp_path = self.base_path / "tmp"
+        self.log_path = self.base_path / "log"
 
         # 文件路径
         self.config_path = self.config_dir_path / "config.json"
+        self.mirror_score_path = self.tmp_path / "mirror_score.json"
 
     def path_validator(self) -> None:
         """验证路径是否存在"""
@@ -39,6 +40,13 @@ class PathFunc(metaclass=Singleton):
 
     def get_qq_path(self) -> Path | None:
         """读取注册表获取QQ路径"""
+        # winreg 仅在 Windows 上可用, 在此处导入以便其余功能可以在其他平台 (如无界面的基准测试) 上运行
+        try:
+            # 标准库导入
+            import winreg
+        except ImportError:
+            return None
+
         try:
             key = winreg.OpenKey(key=winreg.HKEY_LOCAL_MACHINE, sub_key=r"SOFTWARE\WOW6432Node\Tencent\QQNT")
             self.qq_path = Path(winreg.QueryValueEx(key, "InstallPath")[0])
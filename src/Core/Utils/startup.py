@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+## 启动过程分析器
+    记录程序启动各阶段的耗时, 使用 `--profile-startup` 启动时输出报告
+
+    本模块只依赖标准库, 以便在启动的最早阶段导入
+"""
+
+# 标准库导入
+import sys
+import json
+import time
+from pathlib import Path
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+
+# 启用分析报告的命令行参数
+PROFILE_FLAG = "--profile-startup"
+
+
+@dataclass(slots=True)
+class StartupPhase:
+    """启动阶段"""
+
+    name: str  # 阶段名称
+    start: float  # 相对于进程启动的开始时间 (毫秒)
+    duration: float  # 耗时 (毫秒)
+    depth: int  # 嵌套层级
+
+
+class StartupProfiler:
+    """启动过程分析器"""
+
+    def __init__(self) -> None:
+        self.origin = time.perf_counter()
+        self.enabled = PROFILE_FLAG in sys.argv
+        self.phases: list[StartupPhase] = []
+        self._depth = 0
+
+    def _elapsed(self) -> float:
+        """
+        ## 距离分析器创建的毫秒数
+        """
+        return (time.perf_counter() - self.origin) * 1000
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        ## 记录一个启动阶段的耗时, 可嵌套使用
+
+        ## 参数
+            - name: str - 阶段名称
+        """
+        start = self._elapsed()
+        phase = StartupPhase(name, start, 0.0, self._depth)
+        self.phases.append(phase)
+        self._depth += 1
+        try:
+            yield phase
+        finally:
+            self._depth -= 1
+            phase.duration = self._elapsed() - start
+
+    def mark(self, name: str) -> None:
+        """
+        ## 记录一个时间点, 如首次绘制
+        """
+        self.phases.append(StartupPhase(name, self._elapsed(), 0.0, self._depth))
+
+    def report(self) -> str:
+        """
+        ## 生成文本报告
+        """
+        lines = [f"{'start(ms)':>10} {'cost(ms)':>10}  phase"]
+        for phase in self.phases:
+            lines.append(f"{phase.start:>10.1f} {phase.duration:>10.1f}  {'  ' * phase.depth}{phase.name}")
+        return "\n".join(lines)
+
+    def dump(self, path: Path | None = None) -> None:
+        """
+        ## 输出报告到控制台, 并可选地写入 json 文件
+
+        ## 参数
+            - path: Path | None - json 报告路径
+        """
+        print(self.report())
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps([asdict(phase) for phase in self.phases], indent=4), encoding="utf-8")
+
+
+# 全局分析器, 导入本模块的时间即为计时起点
+startupProfiler = StartupProfiler()
+
+
+__all__ = ["PROFILE_FLAG", "StartupPhase", "StartupProfiler", "startupProfiler"]
@@ -0,0 +1,418 @@
+# -*- coding: utf-8 -*-
+"""
+## 分段并行下载
+    将文件按 HTTP Range 切分为若干段, 通过同一个连接池并发下载:
+    - 每段直接写入临时目录中预分配的 `.part` 文件的对应位置, 不在内存中缓存整个文件
+    - 各段的进度保存在 `.part.json` 中, 中断后从已下载的位置继续; 保存前先将数据刷新到磁盘,
+      保存的进度不会超过磁盘上的数据
+    - 任一分段失败时取消其余分段; 文件读写在线程池中进行, 不阻塞共用的事件循环
+    - 下载完成后校验大小与 sha256, 通过后才替换目标文件
+    - 下载进度通过 Qt 信号报告
+"""
+
+# 标准库导入
+import os
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from typing import BinaryIO
+from pathlib import Path
+from dataclasses import field, dataclass
+
+# 第三方库导入
+import httpx
+from PySide6.QtCore import QUrl, Signal, QObject
+
+# 项目内模块导入
+from src.core.utils.path import PathFunc
+from src.core.utils.logger import LogType, LogSource, logger
+from src.core.utils.file_writer import atomic_write
+from src.core.network.http_client import HttpClientService
+
+
+class DownloadError(Exception):
+    """下载失败"""
+
+
+@dataclass(slots=True)
+class Segment:
+    """下载分段, 范围为 [start, end]"""
+
+    start: int
+    end: int
+    done: int = 0  # 已写入的字节数
+    flushed: int = field(default=0, repr=False)  # 已刷新到磁盘的字节数, 保存的进度以此为准
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start + 1
+
+    @property
+    def finished(self) -> bool:
+        return self.done >= self.size
+
+
+@dataclass(slots=True)
+class _RemoteFile:
+    """远程文件信息"""
+
+    url: str  # 跟随重定向后的最终地址
+    size: int | None  # 文件大小, 未知时为 None
+    validator: str | None  # ETag 或 Last-Modified, 用于判断断点续传时文件是否变化
+    ranges: bool  # 是否支持 Range 请求
+
+
+class SegmentedDownloader(QObject):
+    """分段并行下载器"""
+
+    # 信号
+    progressChanged = Signal("qint64", "qint64")  # 已下载字节数, 总字节数 (未知时为 0)
+    downloadFinished = Signal(Path)  # 下载完成的文件路径
+    downloadFailed = Signal(str)  # 失败原因
+
+    def __init__(
+        self,
+        url: QUrl | str,
+        target: Path,
+        size: int | None = None,
+        sha256: str | None = None,
+        segments: int = 4,
+        client: httpx.AsyncClient | None = None,
+        parent: QObject | None = None,
+    ) -> None:
+        """
+        ## 初始化下载器
+
+        ## 参数
+            - url: QUrl | str - 下载地址
+            - target: Path - 保存路径
+            - size: int | None - 预期的文件大小, 用于校验
+            - sha256: str | None - 预期的 sha256, 用于校验
+            - segments: int - 并发下载的分段数
+            - client: httpx.AsyncClient | None - 使用的客户端, 为 None 时使用全局的 HttpClientService
+            - parent: QObject | None - 父对象
+        """
+        super().__init__(parent)
+        self.url = url.toString() if isinstance(url, QUrl) else url
+        self.target = Path(target)
+        self.size = size
+        self.sha256 = sha256.lower() if sha256 else None
+        self.segments = max(1, segments)
+        self.client = client
+
+        self.chunk_size = 256 * 1024
+        self.min_segment_size = 1024 * 1024
+        self.retries = 3
+        self.progress_interval = 0.1
+        self.state_interval = 1.0
+
+        self.part_path = PathFunc().tmp_path / f"{self.target.name}.part"
+        self.state_path = PathFunc().tmp_path / f"{self.target.name}.part.json"
+
+        self._received = 0
+        self._total = 0
+        self._last_progress = 0.0
+
+        # 保护打开的分段文件与进度文件, 刷新、关闭与保存在不同的线程中进行
+        self._lock = threading.Lock()
+        self._files: dict[int, BinaryIO] = {}  # 分段起始位置 -> 正在写入的文件
+        self._invalidated = False  # 已下载的内容是否已作废, 作废后不再保存进度
+
+    def start(self) -> None:
+        """
+        ## 在 HttpClientService 的事件循环中开始下载, 结果通过信号报告
+        """
+        HttpClientService().submit(self._run())
+
+    async def _run(self) -> None:
+        """
+        ## 下载并将结果转换为信号
+        """
+        try:
+            path = await self.download()
+        except (DownloadError, httpx.HTTPError, OSError) as e:
+            logger.error(f"下载 {self.target.name} 失败: {e}", LogType.NETWORK, LogSource.CORE)
+            self.downloadFailed.emit(str(e))
+        except Exception as e:
+            # 其他异常 (如无效的 URL、错误的 Content-Range) 同样要通知界面, 否则界面会一直等待
+            logger.error(
+                f"下载 {self.target.name} 时发生意外错误: {type(e).__name__}: {e}", LogType.NETWORK, LogSource.CORE
+            )
+            self.downloadFailed.emit(f"{type(e).__name__}: {e}")
+        else:
+            self.downloadFinished.emit(path)
+
+    @property
+    def session(self) -> httpx.AsyncClient | HttpClientService:
+        """发送请求使用的客户端, 两者提供相同的 stream 接口"""
+        return self.client or HttpClientService()
+
+    async def download(self) -> Path:
+        """
+        ## 下载文件: 获取文件信息 -> 恢复或规划分段 -> 并发下载 -> 校验 -> 替换目标文件
+            未指定 client 时需要在 HttpClientService 的事件循环中运行
+
+        ## 返回
+            - Path: 下载完成的文件路径
+        """
+        remote = await self._probe()
+        if self.size is not None and remote.size is not None and remote.size != self.size:
+            raise DownloadError(f"文件大小不符: 预期 {self.size}, 服务器返回 {remote.size}")
+
+        segments = await asyncio.to_thread(self._prepare, remote)
+        self._invalidated = False
+        self._total = remote.size or 0
+        self._received = sum(segment.done for segment in segments)
+        self.progressChanged.emit(self._received, self._total)
+
+        saver = asyncio.create_task(self._saveStatePeriodically(remote, segments))
+        try:
+            # 任一分段失败时 TaskGroup 会取消其余分段
+            async with asyncio.TaskGroup() as group:
+                for segment in segments:
+                    group.create_task(self._fetchSegment(remote, segment))
+        except BaseExceptionGroup as group:
+            # 只报告最先失败的分段, 其余分段是被取消的
+            raise group.exceptions[0] from None
+        finally:
+            saver.cancel()
+            await asyncio.to_thread(self._syncState, remote, segments)
+        self.progressChanged.emit(self._received, self._total)
+
+        await asyncio.to_thread(self._verify)
+        await asyncio.to_thread(self._finish)
+        return self.target
+
+    async def _probe(self) -> _RemoteFile:
+        """
+        ## 通过请求第一个字节获取文件大小、校验标识与 Range 支持情况
+        """
+        headers = {"Range": "bytes=0-0", "Accept-Encoding": "identity"}
+        async with self.session.stream("GET", self.url, headers=headers, follow_redirects=True) as response:
+            response.raise_for_status()
+            url = str(response.url)
+            validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+            if response.status_code == 206 and "/" in (content_range := response.headers.get("Content-Range", "")):
+                total = content_range.rsplit("/", 1)[1]
+                return _RemoteFile(url, int(total) if total.isdigit() else None, validator, total.isdigit())
+
+        # 不支持 Range, 只能整体下载
+        length = response.headers.get("Content-Length")
+        return _RemoteFile(url, int(length) if length and length.isdigit() else None, validator, False)
+
+    def _planSegments(self, remote: _RemoteFile) -> list[Segment]:
+        """
+        ## 按文件大小切分, 每段不小于 min_segment_size
+        """
+        if not remote.ranges or not remote.size:
+            return [Segment(0, (remote.size or 0) - 1)]
+        count = max(1, min(self.segments, remote.size // self.min_segment_size))
+        step = -(-remote.size // count)
+        return [Segment(start, min(start + step, remote.size) - 1) for start in range(0, remote.size, step)]
+
+    def _prepare(self, remote: _RemoteFile) -> list[Segment]:
+        """
+        ## 恢复或规划分段, 新下载时预分配 `.part` 文件 (在线程池中调用)
+        """
+        segments = self._restoreSegments(remote) if remote.ranges else None
+        if segments is None:
+            segments = self._planSegments(remote)
+            self.part_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.part_path, "wb") as f:
+                if remote.size:
+                    f.truncate(remote.size)
+        self._saveState(remote, segments)
+        return segments
+
+    def _finish(self) -> None:
+        """
+        ## 用下载完成的文件替换目标文件并删除进度文件 (在线程池中调用)
+        """
+        self.target.parent.mkdir(parents=True, exist_ok=True)
+        self.part_path.replace(self.target)
+        self.state_path.unlink(missing_ok=True)
+
+    def _restoreSegments(self, remote: _RemoteFile) -> list[Segment] | None:
+        """
+        ## 读取上次中断时保存的分段进度, 远程文件发生变化时放弃
+        """
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+            if (
+                state["url"] != self.url
+                or state["size"] != remote.size
+                or state["validator"] != remote.validator
+                or self.part_path.stat().st_size != remote.size
+            ):
+                return None
+            segments = [Segment(**segment) for segment in state["segments"]]
+            for segment in segments:
+                segment.flushed = segment.done
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        logger.info(
+            f"继续下载 {self.target.name}: 已完成 {sum(segment.done for segment in segments)} / {remote.size} 字节",
+            LogType.NETWORK,
+            LogSource.CORE,
+        )
+        return segments
+
+    def _saveState(self, remote: _RemoteFile, segments: list[Segment]) -> None:
+        """
+        ## 保存已刷新到磁盘的分段进度, 不支持 Range 的下载无法续传, 不保存
+        """
+        if remote.ranges:
+            state = {
+                "url": self.url,
+                "size": remote.size,
+                "validator": remote.validator,
+                "segments": [
+                    {"start": segment.start, "end": segment.end, "done": segment.flushed} for segment in segments
+                ],
+            }
+            atomic_write(self.state_path, json.dumps(state), skip_unchanged=False)
+
+    def _syncState(self, remote: _RemoteFile, segments: list[Segment]) -> None:
+        """
+        ## 将正在写入的分段刷新到磁盘, 然后保存进度 (在线程池中调用); 进度作废后不再保存
+        """
+        with self._lock:
+            if self._invalidated:
+                return
+            for segment in segments:
+                # 先记录再刷新, 刷新期间写入的数据留到下次保存
+                done = segment.done
+                if (f := self._files.get(segment.start)) is not None:
+                    f.flush()
+                    os.fsync(f.fileno())
+                    segment.flushed = done
+            self._saveState(remote, segments)
+
+    def _invalidateState(self) -> None:
+        """
+        ## 已下载的内容作废, 删除进度文件, 下次从头开始 (在线程池中调用)
+        """
+        with self._lock:
+            self._invalidated = True
+            self.state_path.unlink(missing_ok=True)
+
+    def _openSegment(self, segment: Segment) -> BinaryIO:
+        """
+        ## 打开 `.part` 文件并定位到分段的续传位置 (在线程池中调用)
+        """
+        f = open(self.part_path, "r+b")
+        f.seek(segment.start + segment.done)
+        with self._lock:
+            self._files[segment.start] = f
+        return f
+
+    def _closeSegment(self, segment: Segment, f: BinaryIO) -> None:
+        """
+        ## 将分段刷新到磁盘后关闭文件 (在线程池中调用)
+        """
+        with self._lock:
+            del self._files[segment.start]
+            try:
+                done = segment.done
+                f.flush()
+                os.fsync(f.fileno())
+                segment.flushed = done
+            finally:
+                f.close()
+
+    async def _saveStatePeriodically(self, remote: _RemoteFile, segments: list[Segment]) -> None:
+        """
+        ## 下载期间定期保存进度
+        """
+        while True:
+            await asyncio.sleep(self.state_interval)
+            await asyncio.to_thread(self._syncState, remote, segments)
+
+    async def _fetchSegment(self, remote: _RemoteFile, segment: Segment) -> None:
+        """
+        ## 下载一个分段, 失败时从已下载的位置重试
+        """
+        for attempt in range(self.retries + 1):
+            if segment.finished and remote.size:
+                return
+            try:
+                await self._streamSegment(remote, segment)
+                return
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                if attempt == self.retries:
+                    raise DownloadError(f"分段 {segment.start}-{segment.end} 下载失败: {e}") from e
+                await asyncio.sleep(2**attempt)
+
+    async def _streamSegment(self, remote: _RemoteFile, segment: Segment) -> None:
+        """
+        ## 流式下载分段并写入 `.part` 文件的对应位置
+        """
+        # 字节范围针对未压缩的内容, 禁止服务器压缩响应
+        headers = {"Accept-Encoding": "identity"}
+        if remote.ranges:
+            headers["Range"] = f"bytes={segment.start + segment.done}-{segment.end}"
+            if remote.validator and not remote.validator.startswith("W/"):
+                # 文件在续传期间发生变化时服务器会返回完整的新文件, 而不是错误的片段
+                headers["If-Range"] = remote.validator
+        elif segment.done:
+            # 不支持 Range 时只能从头开始
+            self._received -= segment.done
+            segment.done = segment.flushed = 0
+
+        async with self.session.stream("GET", remote.url, headers=headers) as response:
+            response.raise_for_status()
+            if remote.ranges and response.status_code != 206:
+                await asyncio.to_thread(self._invalidateState)
+                raise DownloadError("远程文件在下载期间发生了变化")
+
+            f = await asyncio.to_thread(self._openSegment, segment)
+            try:
+                async for chunk in response.aiter_bytes(self.chunk_size):
+                    if remote.size and segment.done + len(chunk) > segment.size:
+                        raise DownloadError(f"分段 {segment.start}-{segment.end} 收到了多余的数据")
+                    await asyncio.to_thread(f.write, chunk)
+                    segment.done += len(chunk)
+                    self._received += len(chunk)
+                    self._reportProgress()
+            finally:
+                # 被取消时也要关闭文件, 关闭不可被打断
+                await asyncio.shield(asyncio.to_thread(self._closeSegment, segment, f))
+
+        if not remote.size:
+            # 大小未知时以实际收到的字节数为准
+            segment.end = segment.start + segment.done - 1
+
+    def _reportProgress(self) -> None:
+        """
+        ## 限制进度信号的发射频率
+        """
+        if (now := time.monotonic()) - self._last_progress >= self.progress_interval:
+            self._last_progress = now
+            self.progressChanged.emit(self._received, self._total)
+
+    def _verify(self) -> None:
+        """
+        ## 校验文件大小与 sha256, 不通过时删除临时文件
+        """
+        size = self.part_path.stat().st_size
+        expected_size = self.size if self.size is not None else (self._total or None)
+        error = None
+        if expected_size is not None and size != expected_size:
+            error = f"文件大小不符: 预期 {expected_size}, 实际 {size}"
+        elif self.sha256 is not None:
+            digest = hashlib.sha256()
+            with open(self.part_path, "rb") as f:
+                while chunk := f.read(1024 * 1024):
+                    digest.update(chunk)
+            if digest.hexdigest() != self.sha256:
+                error = f"sha256 不符: 预期 {self.sha256}, 实际 {digest.hexdigest()}"
+
+        if error is not None:
+            self.part_path.unlink(missing_ok=True)
+            self.state_path.unlink(missing_ok=True)
+            raise DownloadError(error)
+
+
+__all__ = ["DownloadError", "Segment", "SegmentedDownloader"]
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+## HTTP 条件请求缓存
+    为版本检查等反复轮询的接口提供磁盘缓存 (位于 `.NapCat Desktop/tmp/http_cache`):
+    - 保存响应内容以及 ETag / Last-Modified, 过期后发送条件请求, 304 时直接复用缓存
+    - 每个条目为单个文件: 第一行是 JSON 元数据, 其后是响应内容, 整体原子写入, 元数据与内容不会错配
+    - 在有效期 (TTL) 内不发送请求
+    - stale-while-revalidate: 先立即返回缓存 (即使已过期), 再在后台重新验证, 内容变化时再次通知
+"""
+
+# 标准库导入
+import json
+import time
+import hashlib
+from typing import Any
+from pathlib import Path
+from dataclasses import field, dataclass
+
+# 第三方库导入
+import httpx
+from PySide6.QtCore import QUrl, QTimer, Signal, QObject
+
+# 项目内模块导入
+from src.core.utils.path import PathFunc
+from src.core.utils.logger import LogType, LogSource, logger
+from src.core.utils.file_writer import atomic_write
+from src.core.network.http_client import HttpClientService
+
+# 需要保存的响应头
+_STORED_HEADERS = ("ETag", "Last-Modified", "Content-Type")
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    """缓存的响应"""
+
+    url: str
+    status: int
+    content: bytes
+    headers: dict[str, str] = field(default_factory=dict)
+    stored_at: float = 0.0  # 最后一次从服务器确认内容的时间戳
+    from_cache: bool = False  # 是否来自缓存
+    stale: bool = False  # 是否已超过有效期
+
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class HttpCache:
+    """磁盘上的 HTTP 条件请求缓存"""
+
+    def __init__(self, directory: Path | None = None, ttl: float = 10 * 60) -> None:
+        """
+        ## 初始化缓存
+
+        ## 参数
+            - directory: Path | None - 缓存目录, 默认为 `PathFunc().tmp_path / "http_cache"`
+            - ttl: float - 默认的有效期 (秒), 有效期内直接使用缓存
+        """
+        self.directory = directory or PathFunc().tmp_path / "http_cache"
+        self.ttl = ttl
+
+    def _path(self, url: str) -> Path:
+        """
+        ## 缓存条目的文件路径
+        """
+        return self.directory / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.cache"
+
+    def peek(self, url: QUrl | str, ttl: float | None = None) -> CachedResponse | None:
+        """
+        ## 读取缓存而不发送请求, 可以在 GUI 线程中调用
+
+        ## 参数
+            - url: QUrl | str - 请求地址
+            - ttl: float | None - 有效期, 为 None 时使用默认值
+
+        ## 返回
+            - CachedResponse | None: 没有缓存时返回 None
+        """
+        url = url.toString() if isinstance(url, QUrl) else url
+        try:
+            meta, _, content = self._path(url).read_bytes().partition(b"\n")
+            meta = json.loads(meta)
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:
+            return None
+
+        stored_at = meta.get("stored_at", 0.0)
+        return CachedResponse(
+            url=url,
+            status=meta.get("status", 200),
+            content=content,
+            headers=meta.get("headers", {}),
+            stored_at=stored_at,
+            from_cache=True,
+            stale=time.time() - stored_at > (self.ttl if ttl is None else ttl),
+        )
+
+    def store(self, response: CachedResponse) -> None:
+        """
+        ## 保存响应, 元数据与内容写入同一个文件, 中途失败时保留旧的完整条目
+        """
+        meta = {
+            "url": response.url,
+            "status": response.status,
+            "headers": response.headers,
+            "stored_at": response.stored_at,
+        }
+        # json.dumps 会转义字符串中的换行符, 元数据总是单独的一行
+        data = json.dumps(meta, ensure_ascii=False).encode("utf-8") + b"\n" + response.content
+        atomic_write(self._path(response.url), data, skip_unchanged=False)
+
+    async def fetch(
+        self, url: QUrl | str, ttl: float | None = None, client: httpx.AsyncClient | None = None
+    ) -> CachedResponse:
+        """
+        ## 获取响应: 有效期内直接返回缓存, 否则发送条件请求; 网络错误时退回过期的缓存
+
+        ## 参数
+            - url: QUrl | str - 请求地址
+            - ttl: float | None - 有效期, 为 None 时使用默认值
+            - client: httpx.AsyncClient | None - 使用的客户端, 为 None 时使用全局的 HttpClientService
+
+        ## 返回
+            - CachedResponse: 响应
+        """
+        url = url.toString() if isinstance(url, QUrl) else url
+        cached = self.peek(url, ttl)
+        if cached is not None and not cached.stale:
+            return cached
+        return await self.revalidate(url, cached, client)
+
+    async def revalidate(
+        self, url: str, cached: CachedResponse | None, client: httpx.AsyncClient | None = None
+    ) -> CachedResponse:
+        """
+        ## 向服务器确认缓存是否仍然有效, 无缓存时发送普通请求
+        """
+        headers = {}
+        if cached is not None:
+            if etag := cached.headers.get("ETag"):
+                headers["If-None-Match"] = etag
+            if last_modified := cached.headers.get("Last-Modified"):
+                headers["If-Modified-Since"] = last_modified
+
+        try:
+            response = await (client or HttpClientService()).request("GET", url, headers=headers)
+            if response.status_code == 304 and cached is not None:
+                # 304 可能携带新的 ETag / Last-Modified, 合并到缓存的响应头中
+                cached.headers.update(self._storedHeaders(response))
+                cached.stored_at, cached.stale = time.time(), False
+                self.store(cached)
+                return cached
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            if cached is None:
+                raise
+            logger.warning(f"重新验证 {url} 失败, 使用过期的缓存: {e}", LogType.NETWORK, LogSource.CORE)
+            return cached
+
+        fresh = CachedResponse(
+            url=url,
+            status=response.status_code,
+            content=response.content,
+            headers=self._storedHeaders(response),
+            stored_at=time.time(),
+        )
+        self.store(fresh)
+        return fresh
+
+    @staticmethod
+    def _storedHeaders(response: httpx.Response) -> dict[str, str]:
+        """
+        ## 提取需要保存的响应头
+        """
+        return {name: response.headers[name] for name in _STORED_HEADERS if name in response.headers}
+
+
+class CachedRequest(QObject):
+    """stale-while-revalidate 请求, 由 `cachedRequest` 创建"""
+
+    # 信号
+    responseReady = Signal(object)  # CachedResponse, 先发送缓存, 内容更新后再次发送
+    requestFailed = Signal(object)  # 没有缓存且请求失败时发送异常
+
+    def __init__(self, cache: HttpCache, url: str, ttl: float | None, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self.cache = cache
+        self.url = url
+        self.ttl = ttl
+        self.cached = cache.peek(url, ttl)
+
+        # 等待调用者连接信号后再发送结果
+        QTimer.singleShot(0, self._start)
+
+    def _start(self) -> None:
+        """
+        ## 立即发送缓存, 缓存过期或不存在时在后台重新验证
+        """
+        if self.cached is not None:
+            self.responseReady.emit(self.cached)
+            if not self.cached.stale:
+                return
+
+        task = HttpClientService().run(self.cache.revalidate(self.url, self.cached), self)
+        task.succeeded.connect(self._onRevalidated)
+        task.failed.connect(self.requestFailed)
+
+    def _onRevalidated(self, response: CachedResponse) -> None:
+        """
+        ## 只有内容发生变化时才再次通知
+        """
+        if self.cached is None or response.content != self.cached.content:
+            self.responseReady.emit(response)
+
+
+def cachedRequest(url: QUrl | str, ttl: float | None = None, parent: QObject | None = None) -> CachedRequest:
+    """
+    ## 以 stale-while-revalidate 方式请求, 如 `cachedRequest(Urls.QQ_Version.value)`
+        有缓存时在下一次事件循环中立即通过 responseReady 发送, 过期后在后台重新验证
+
+    ## 参数
+        - url: QUrl | str - 请求地址
+        - ttl: float | None - 有效期, 为 None 时使用默认值
+        - parent: QObject | None - 父对象
+    """
+    url = url.toString() if isinstance(url, QUrl) else url
+    return CachedRequest(HttpCache(), url, ttl, parent)
+
+
+__all__ = ["CachedResponse", "HttpCache", "CachedRequest", "cachedRequest"]
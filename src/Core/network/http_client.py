@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+## 全局 HTTP 客户端服务
+    整个程序共享一个 httpx.AsyncClient, 运行在独立线程的事件循环中:
+    - 连接池与 keep-alive 复用连接, 安装了 h2 时启用 HTTP/2
+    - 按主机限制并发请求数, 统一的超时设置
+    - 网络请求不会阻塞 GUI 线程, 结果通过 Qt 信号回到 GUI 线程
+"""
+
+# 标准库导入
+import atexit
+import asyncio
+import threading
+import importlib.util
+from typing import Any, Coroutine, AsyncIterator
+from contextlib import asynccontextmanager
+from concurrent.futures import Future
+
+# 第三方库导入
+import httpx
+from PySide6.QtCore import Qt, QUrl, Signal, QObject
+
+# 项目内模块导入
+from src.core.utils.logger import LogType, LogSource, logger
+from src.core.utils.singleton import Singleton
+
+
+class NetworkTask(QObject):
+    """在 HttpClientService 中运行的协程, 结果通过信号发送到创建者所在的线程"""
+
+    # 信号
+    succeeded = Signal(object)  # 协程的返回值
+    failed = Signal(object)  # 协程抛出的异常
+    _finished = Signal(object)  # 协程结束, 由事件循环线程发出
+
+    # 保持引用直到结果发出, 避免信号发出前 NetworkTask 被回收
+    _pending: set["NetworkTask"] = set()
+
+    def __init__(self, future: Future, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self.future = future
+        NetworkTask._pending.add(self)
+        # 以队列方式回到本对象所在的线程, 即使协程在调用者连接信号前就已结束, 结果也不会丢失
+        self._finished.connect(self._emitResult, Qt.ConnectionType.QueuedConnection)
+        future.add_done_callback(self._finished.emit)
+
+    def cancel(self) -> bool:
+        """
+        ## 取消协程
+        """
+        return self.future.cancel()
+
+    def _emitResult(self, future: Future) -> None:
+        """
+        ## 在本对象所在的线程中发送结果信号
+        """
+        NetworkTask._pending.discard(self)
+        if future.cancelled():
+            return
+        if (error := future.exception()) is not None:
+            self.failed.emit(error)
+        else:
+            self.succeeded.emit(future.result())
+
+
+class HttpClientService(metaclass=Singleton):
+    """全局 HTTP 客户端服务"""
+
+    def __init__(self, per_host: int = 6, max_connections: int = 32) -> None:
+        """
+        ## 初始化服务, 后台线程在第一次使用时启动
+
+        ## 参数
+            - per_host: int - 每个主机的最大并发请求数
+            - max_connections: int - 连接池的最大连接数
+        """
+        self.per_host = per_host
+        self.limits = httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_connections // 2, keepalive_expiry=60
+        )
+        self.timeout = httpx.Timeout(30.0, connect=10.0)
+        # HTTP/2 需要可选依赖 h2 (httpx[http2])
+        self.http2 = importlib.util.find_spec("h2") is not None
+
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._client: httpx.AsyncClient | None = None
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """服务的事件循环, 第一次访问时启动后台线程"""
+        with self._lock:
+            if self._loop is None:
+                ready = threading.Event()
+                threading.Thread(target=self._runLoop, args=(ready,), name="NCD-HttpClient", daemon=True).start()
+                ready.wait()
+                atexit.register(self.close)
+        return self._loop
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """共享的客户端, 只能在服务的事件循环中使用"""
+        self._checkLoop()
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=self.http2, limits=self.limits, timeout=self.timeout, follow_redirects=True
+            )
+        return self._client
+
+    def _runLoop(self, ready: threading.Event) -> None:
+        """
+        ## 后台线程主函数
+        """
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        ready.set()
+        self._loop.run_forever()
+
+    def _checkLoop(self) -> None:
+        """
+        ## 确保当前处于服务的事件循环中, 客户端与信号量都绑定在该循环上
+        """
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is None or running is not self._loop:
+            raise RuntimeError("HttpClientService 只能在其自身的事件循环中使用, 请通过 submit 或 run 调度协程")
+
+    def _hostLimit(self, url: QUrl | str | httpx.URL) -> asyncio.Semaphore:
+        """
+        ## 获取主机对应的并发限制
+        """
+        host = QUrl(url).host() if isinstance(url, QUrl) else httpx.URL(str(url)).host
+        if (semaphore := self._host_limits.get(host)) is None:
+            semaphore = self._host_limits[host] = asyncio.Semaphore(self.per_host)
+        return semaphore
+
+    async def request(self, method: str, url: QUrl | str, **kwargs: Any) -> httpx.Response:
+        """
+        ## 发送请求并读取完整的响应
+
+        ## 参数
+            - method: str - 请求方法
+            - url: QUrl | str - 请求地址
+            - kwargs: 传递给 httpx.AsyncClient.request 的其他参数
+        """
+        url = url.toString() if isinstance(url, QUrl) else url
+        async with self._hostLimit(url):
+            return await self.client.request(method, url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: QUrl | str, **kwargs: Any) -> AsyncIterator[httpx.Response]:
+        """
+        ## 发送请求并以流的方式读取响应, 在退出上下文前占用主机的并发名额
+
+        ## 参数
+            - method: str - 请求方法
+            - url: QUrl | str - 请求地址
+            - kwargs: 传递给 httpx.AsyncClient.stream 的其他参数
+        """
+        url = url.toString() if isinstance(url, QUrl) else url
+        async with self._hostLimit(url):
+            async with self.client.stream(method, url, **kwargs) as response:
+                yield response
+
+    def submit(self, coroutine: Coroutine) -> Future:
+        """
+        ## 在服务的事件循环中运行协程, 可以在任意线程中调用
+
+        ## 返回
+            - Future: 可阻塞等待结果的 concurrent.futures.Future
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def run(self, coroutine: Coroutine, parent: QObject | None = None) -> NetworkTask:
+        """
+        ## 在服务的事件循环中运行协程, 结果通过 NetworkTask 的信号发送到调用者所在的线程
+            信号以队列方式传递, 在调用者返回事件循环之后才会发出, 调用 run 后再连接信号不会丢失结果
+
+        ## 参数
+            - coroutine: Coroutine - 要运行的协程
+            - parent: QObject | None - NetworkTask 的父对象
+
+        ## 返回
+            - NetworkTask: 连接其 succeeded / failed 信号以获取结果
+        """
+        return NetworkTask(self.submit(coroutine), parent)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        ## 关闭客户端并停止事件循环
+        """
+        if self._loop is None or not self._loop.is_running():
+            return
+
+        async def shutdown() -> None:
+            if self._client is not None:
+                await self._client.aclose()
+                self._client = None
+
+        try:
+            self.submit(shutdown()).result(timeout)
+        except Exception as e:
+            logger.warning(f"关闭 HTTP 客户端失败: {e}", LogType.NETWORK, LogSource.CORE)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+__all__ = ["HttpClientService", "NetworkTask"]
@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+"""
+## GitHub 镜像测速与选择
+    - MirrorScoreBoard: 持久化每个镜像的延迟、吞吐量与失败率, 旧的观测值随时间衰减
+    - MirrorRacer: 并发地向所有镜像请求文件开头的一小段, 最先完成的镜像胜出
+    - resolveDownloadUrl: 为 `Urls.NAPCATQQ_DOWNLOAD` 等 GitHub 下载地址选择最快的镜像
+"""
+
+# 标准库导入
+import json
+import time
+import asyncio
+from enum import Enum
+from pathlib import Path
+from dataclasses import asdict, dataclass
+
+# 第三方库导入
+import httpx
+from PySide6.QtCore import QUrl
+
+# 项目内模块导入
+from src.core.utils.path import PathFunc
+from src.core.network.Urls import Urls
+from src.core.utils.logger import LogType, LogSource, logger
+from src.core.utils.file_writer import atomic_write
+from src.core.network.http_client import HttpClientService
+
+# 直接访问 GitHub 时使用的镜像名称
+DIRECT = "direct"
+
+# 评估镜像时的参考文件大小, 分数即下载该大小所需的预计秒数
+REFERENCE_SIZE = 1024 * 1024
+
+
+def mirrorUrl(mirror: str, url: QUrl | str) -> str:
+    """
+    ## 生成通过镜像访问 GitHub 地址的 url
+
+    ## 参数
+        - mirror: str - 镜像站地址, DIRECT 表示直接访问
+        - url: QUrl | str - GitHub 地址
+    """
+    url = url.toString() if isinstance(url, QUrl) else url
+    return url if mirror == DIRECT else f"{mirror.rstrip('/')}/{url}"
+
+
+def mirrorSites() -> list[str]:
+    """
+    ## 所有候选镜像, 包括直接访问
+    """
+    return [site.toString() for site in Urls.MIRROR_SITE.value] + [DIRECT]
+
+
+@dataclass(slots=True)
+class MirrorScore:
+    """镜像的历史表现"""
+
+    latency: float = 0.0  # 首字节延迟 (秒)
+    throughput: float = 0.0  # 吞吐量 (字节/秒)
+    failure_rate: float = 0.0  # 失败率, 0 ~ 1
+    updated: float = 0.0  # 最后一次观测的时间戳
+
+    def weight(self, now: float, half_life: float) -> float:
+        """
+        ## 历史观测的剩余权重, 每经过一个半衰期减半
+        """
+        return 0.5 ** ((now - self.updated) / half_life) if self.updated else 0.0
+
+    def cost(self, now: float, half_life: float) -> float:
+        """
+        ## 下载参考大小预计所需的秒数, 失败率越高代价越大, 失败记录会随时间淡化
+        """
+        if self.throughput <= 0:
+            return float("inf")
+        failure_rate = self.failure_rate * self.weight(now, half_life)
+        return (self.latency + REFERENCE_SIZE / self.throughput) * (1 + 4 * failure_rate)
+
+
+@dataclass(slots=True)
+class ProbeResult:
+    """一次测速的结果"""
+
+    mirror: str
+    url: str
+    ok: bool
+    latency: float = 0.0
+    throughput: float = 0.0
+    error: str | None = None
+
+
+class MirrorScoreBoard:
+    """持久化的镜像评分"""
+
+    def __init__(self, path: Path | None = None, alpha: float = 0.3, half_life: float = 24 * 60 * 60) -> None:
+        """
+        ## 初始化评分表
+
+        ## 参数
+            - path: Path | None - 持久化文件路径, 默认为 `PathFunc().mirror_score_path`
+            - alpha: float - 新观测值的权重 (指数移动平均)
+            - half_life: float - 历史观测值权重减半所需的秒数
+        """
+        self.path = path or PathFunc().mirror_score_path
+        self.alpha = alpha
+        self.half_life = half_life
+        self.scores: dict[str, MirrorScore] = {}
+        self.load()
+
+    def load(self) -> None:
+        """
+        ## 从文件加载评分, 文件不存在或损坏时从空表开始
+        """
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self.scores = {mirror: MirrorScore(**score) for mirror, score in data.items()}
+        except (OSError, ValueError, TypeError):
+            self.scores = {}
+
+    def save(self) -> None:
+        """
+        ## 保存评分
+        """
+        data = {mirror: asdict(score) for mirror, score in self.scores.items()}
+        atomic_write(self.path, json.dumps(data, ensure_ascii=False, indent=4))
+
+    def record(self, result: ProbeResult) -> None:
+        """
+        ## 记录一次测速结果, 历史越久远的观测值在平均中的权重越低
+        """
+        now = time.time()
+        score = self.scores.setdefault(result.mirror, MirrorScore())
+        # 历史权重衰减后, 新观测值占据更大的比重
+        keep = (1 - self.alpha) * score.weight(now, self.half_life)
+        score.failure_rate = keep * score.failure_rate + (1 - keep) * (0.0 if result.ok else 1.0)
+        if result.ok:
+            score.latency = keep * score.latency + (1 - keep) * result.latency
+            score.throughput = keep * score.throughput + (1 - keep) * result.throughput
+        score.updated = now
+
+    def rank(self, mirrors: list[str]) -> list[str]:
+        """
+        ## 按预计代价从低到高排列镜像, 没有观测记录的镜像排在最后
+        """
+        now = time.time()
+        return sorted(
+            mirrors,
+            key=lambda mirror: (
+                self.scores[mirror].cost(now, self.half_life) if mirror in self.scores else float("inf")
+            ),
+        )
+
+    def best(self, mirrors: list[str], max_age: float) -> str | None:
+        """
+        ## 获取最近观测过且代价最低的镜像
+
+        ## 参数
+            - mirrors: list[str] - 候选镜像
+            - max_age: float - 观测记录的最长有效秒数
+
+        ## 返回
+            - str | None: 没有足够新的观测记录时返回 None
+        """
+        now = time.time()
+        fresh = [
+            mirror
+            for mirror in mirrors
+            if (score := self.scores.get(mirror)) is not None
+            and now - score.updated <= max_age
+            and score.cost(now, self.half_life) != float("inf")
+        ]
+        return self.rank(fresh)[0] if fresh else None
+
+
+class MirrorRacer:
+    """并发测速所有镜像, 选出最快的一个"""
+
+    def __init__(
+        self, scoreboard: MirrorScoreBoard | None = None, probe_bytes: int = 64 * 1024, timeout: float = 10.0
+    ) -> None:
+        """
+        ## 初始化
+
+        ## 参数
+            - scoreboard: MirrorScoreBoard | None - 镜像评分表
+            - probe_bytes: int - 测速时下载的字节数
+            - timeout: float - 单个镜像的测速超时 (秒)
+        """
+        self.scoreboard = scoreboard or MirrorScoreBoard()
+        self.probe_bytes = probe_bytes
+        self.timeout = timeout
+
+    async def probe(self, session: httpx.AsyncClient | HttpClientService, mirror: str, url: str) -> ProbeResult:
+        """
+        ## 请求文件开头的 probe_bytes 字节, 测量首字节延迟与吞吐量
+        """
+        target = mirrorUrl(mirror, url)
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.timeout):
+                headers = {"Range": f"bytes=0-{self.probe_bytes - 1}"}
+                async with session.stream("GET", target, headers=headers, follow_redirects=True) as response:
+                    response.raise_for_status()
+                    first_byte, received = None, 0
+                    # 不支持 Range 的服务器会返回完整文件, 读够 probe_bytes 后即停止
+                    async for chunk in response.aiter_raw():
+                        first_byte = first_byte or time.perf_counter()
+                        received += len(chunk)
+                        if received >= self.probe_bytes:
+                            break
+        except (httpx.HTTPError, httpx.InvalidURL, TimeoutError) as e:
+            return ProbeResult(mirror, target, False, error=f"{type(e).__name__}: {e}")
+
+        if first_byte is None:
+            return ProbeResult(mirror, target, False, error="empty response")
+        end = time.perf_counter()
+        return ProbeResult(
+            mirror, target, True, latency=first_byte - start, throughput=received / max(end - first_byte, 1e-3)
+        )
+
+    async def race(self, url: QUrl | str, client: httpx.AsyncClient | None = None) -> ProbeResult | None:
+        """
+        ## 同时向所有镜像测速, 最先完成的镜像胜出, 其余请求随即取消并记为比胜出者更慢
+
+        ## 参数
+            - url: QUrl | str - GitHub 地址
+            - client: httpx.AsyncClient | None - 使用的客户端, 为 None 时使用全局的 HttpClientService
+
+        ## 返回
+            - ProbeResult | None: 胜出镜像的测速结果, 全部失败时返回 None
+        """
+        session = client or HttpClientService()
+        url = url.toString() if isinstance(url, QUrl) else url
+        tasks = {asyncio.create_task(self.probe(session, mirror, url)): mirror for mirror in mirrorSites()}
+        pending, winner = set(tasks), None
+        start = time.perf_counter()
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for result in (task.result() for task in done):
+                    self.scoreboard.record(result)
+                    if result.ok and (winner is None or result.latency < winner.latency):
+                        winner = result
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        # 被取消的镜像在胜出者完成时仍未读完 probe_bytes, 按此记录一个比胜出者更慢的观测值, 而不是失败
+        elapsed = time.perf_counter() - start
+        for task in pending:
+            if task.cancelled():
+                mirror = tasks[task]
+                result = ProbeResult(
+                    mirror, mirrorUrl(mirror, url), True, latency=elapsed, throughput=self.probe_bytes / elapsed
+                )
+            else:
+                result = task.result()
+            self.scoreboard.record(result)
+
+        self.scoreboard.save()
+        return winner
+
+
+async def resolveDownloadUrl(
+    url: Urls | QUrl | str,
+    racer: MirrorRacer | None = None,
+    client: httpx.AsyncClient | None = None,
+    max_age: float = 6 * 60 * 60,
+) -> QUrl:
+    """
+    ## 为 GitHub 下载地址选择最快的镜像
+        有足够新的评分时直接使用评分最好的镜像, 否则重新测速
+
+    ## 参数
+        - url: Urls | QUrl | str - GitHub 下载地址, 如 `Urls.NAPCATQQ_DOWNLOAD`
+        - racer: MirrorRacer | None - 测速器
+        - client: httpx.AsyncClient | None - 使用的客户端, 为 None 时使用全局的 HttpClientService (需在其事件循环中运行)
+        - max_age: float - 评分的最长有效秒数
+
+    ## 返回
+        - QUrl: 经过镜像的下载地址, 所有镜像都不可用时返回原地址
+    """
+    url = url.value if isinstance(url, Enum) else url
+    url = url.toString() if isinstance(url, QUrl) else url
+    racer = racer or MirrorRacer()
+
+    if (mirror := racer.scoreboard.best(mirrorSites(), max_age)) is not None:
+        return QUrl(mirrorUrl(mirror, url))
+
+    if (winner := await racer.race(url, client)) is None:
+        logger.warning(f"所有镜像均不可用, 使用原地址: {url}", LogType.NETWORK, LogSource.CORE)
+        return QUrl(url)
+
+    logger.info(f"选择镜像 {winner.mirror} ({winner.latency * 1000:.0f} ms)", LogType.NETWORK, LogSource.CORE)
+    return QUrl(winner.url)
+
+
+__all__ = [
+    "DIRECT",
+    "MirrorScore",
+    "MirrorScoreBoard",
+    "MirrorRacer",
+    "ProbeResult",
+    "mirrorUrl",
+    "mirrorSites",
+    "resolveDownloadUrl",
+]
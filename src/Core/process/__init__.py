@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# 项目内模块导入
+from src.core.process.metrics import Metric, MetricsStore, metricsStore
+from src.core.process.sampler import ResourceSample, ResourceSampler
+from src.core.process.supervisor import InstanceSpec, InstanceState, ProcessInstance, ProcessSupervisor
+from src.core.process.output_pipeline import OutputPipeline
+
+__all__ = [
+    "InstanceSpec",
+    "InstanceState",
+    "Metric",
+    "MetricsStore",
+    "OutputPipeline",
+    "ProcessInstance",
+    "ProcessSupervisor",
+    "ResourceSample",
+    "ResourceSampler",
+    "metricsStore",
+]
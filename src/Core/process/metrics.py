@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+## 实例运行指标
+    按实例保存 CPU、内存与输出吞吐量的时间序列:
+    - 每个指标同时以 1 秒 / 10 秒 / 1 分钟三种精度汇总, 粗精度可以覆盖数小时
+    - 每种精度使用固定容量的环形缓冲区 (`array('d')`), 内存占用不随运行时间增长
+    - 新数据点通过 pointAdded 信号通知, 图表据此只重绘变化的部分
+"""
+
+# 标准库导入
+import time
+from enum import Enum
+from array import array
+
+from PySide6.QtCore import Signal, QObject
+
+# 项目内模块导入
+from src.core.process.sampler import ResourceSample
+from src.core.process.supervisor import ProcessSupervisor
+
+# 汇总精度 (秒) -> 保留的数据点数量: 15 分钟, 2 小时, 24 小时
+RESOLUTIONS = {1: 900, 10: 720, 60: 1440}
+
+
+class Metric(Enum):
+    """指标"""
+
+    CPU = "cpu"  # CPU 占用 (%)
+    MEMORY = "memory"  # 常驻内存 (字节)
+    THROUGHPUT = "throughput"  # 输出行数 (行/秒)
+
+
+class RingBuffer:
+    """固定容量的时间序列, 写满后覆盖最旧的数据点"""
+
+    __slots__ = ("capacity", "times", "values", "_start", "_size")
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.times = array("d", bytes(8 * capacity))
+        self.values = array("d", bytes(8 * capacity))
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp: float, value: float) -> None:
+        """
+        ## 追加数据点
+        """
+        if self._size < self.capacity:
+            index = (self._start + self._size) % self.capacity
+            self._size += 1
+        else:
+            index = self._start
+            self._start = (self._start + 1) % self.capacity
+        self.times[index] = timestamp
+        self.values[index] = value
+
+    def replaceLast(self, value: float) -> None:
+        """
+        ## 修改最新数据点的值
+        """
+        if self._size:
+            self.values[(self._start + self._size - 1) % self.capacity] = value
+
+    def last(self) -> float | None:
+        """
+        ## 最新数据点的值
+        """
+        return self.values[(self._start + self._size - 1) % self.capacity] if self._size else None
+
+    def tail(self, count: int) -> array:
+        """
+        ## 按时间顺序获取最新的 count 个值
+        """
+        count = min(count, self._size)
+        first = (self._start + self._size - count) % self.capacity
+        if first + count <= self.capacity:
+            return self.values[first : first + count]
+        return self.values[first:] + self.values[: first + count - self.capacity]
+
+
+class MetricSeries:
+    """一个指标在各精度下的时间序列"""
+
+    __slots__ = ("rings", "_buckets", "_sums", "_counts")
+
+    def __init__(self) -> None:
+        self.rings = {resolution: RingBuffer(capacity) for resolution, capacity in RESOLUTIONS.items()}
+        self._buckets = dict.fromkeys(RESOLUTIONS, -1)  # 各精度当前汇总区间的序号
+        self._sums = dict.fromkeys(RESOLUTIONS, 0.0)
+        self._counts = dict.fromkeys(RESOLUTIONS, 0)
+
+    def add(self, timestamp: float, value: float) -> dict[int, bool]:
+        """
+        ## 加入一个观测值, 同一汇总区间内的观测值取平均
+
+        ## 返回
+            - dict[int, bool]: 精度 -> 是否新增了数据点 (否则为修改了最新数据点)
+        """
+        appended = {}
+        for resolution, ring in self.rings.items():
+            bucket = int(timestamp // resolution)
+            if bucket == self._buckets[resolution]:
+                self._sums[resolution] += value
+                self._counts[resolution] += 1
+                ring.replaceLast(self._sums[resolution] / self._counts[resolution])
+                appended[resolution] = False
+            else:
+                self._buckets[resolution] = bucket
+                self._sums[resolution], self._counts[resolution] = value, 1
+                ring.append(bucket * resolution, value)
+                appended[resolution] = True
+        return appended
+
+
+class MetricsStore(QObject):
+    """全部实例的运行指标"""
+
+    # 信号
+    pointAdded = Signal(str, str, int, bool)  # 实例名称, 指标, 精度, 是否新增了数据点 (否则为修改了最新数据点)
+    instancesChanged = Signal()  # 实例被添加或移除
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self.series: dict[tuple[str, Metric], MetricSeries] = {}
+        self._instances: dict[str, None] = {}  # 保持添加顺序
+        self._lines: dict[str, int] = {}  # 上次采样后各实例输出的行数
+        self._sampled_at: dict[str, float] = {}  # 各实例上次采样的时间
+
+    @property
+    def instances(self) -> list[str]:
+        """有指标数据的实例"""
+        return list(self._instances)
+
+    def get(self, name: str, metric: Metric) -> MetricSeries | None:
+        """
+        ## 获取实例的指标, 没有数据时返回 None
+        """
+        return self.series.get((name, metric))
+
+    def record(self, name: str, metric: Metric, value: float, timestamp: float | None = None) -> None:
+        """
+        ## 记录一个观测值
+
+        ## 参数
+            - name: str - 实例名称
+            - metric: Metric - 指标
+            - value: float - 观测值
+            - timestamp: float | None - 观测时间 (time.time), 为 None 时使用当前时间
+        """
+        if (series := self.series.get((name, metric))) is None:
+            series = self.series[(name, metric)] = MetricSeries()
+            if name not in self._instances:
+                self._instances[name] = None
+                self.instancesChanged.emit()
+
+        for resolution, appended in series.add(timestamp or time.time(), value).items():
+            self.pointAdded.emit(name, metric.value, resolution, appended)
+
+    def removeInstance(self, name: str) -> None:
+        """
+        ## 丢弃实例的全部指标
+        """
+        for metric in Metric:
+            self.series.pop((name, metric), None)
+        self._lines.pop(name, None)
+        self._sampled_at.pop(name, None)
+        if name in self._instances:
+            del self._instances[name]
+            self.instancesChanged.emit()
+
+    def attach(self, supervisor: ProcessSupervisor) -> None:
+        """
+        ## 记录进程管理器中所有实例的资源占用与输出吞吐量, 实例被移除时丢弃其指标
+        """
+        supervisor.resourcesSampled.connect(self._onResourcesSampled)
+        supervisor.outputReceived.connect(self._onOutputReceived)
+        supervisor.instanceRemoved.connect(self.removeInstance)
+
+    def _onOutputReceived(self, name: str, stream: str, lines: list[str]) -> None:
+        """
+        ## 累计输出行数, 在下次采样时换算为吞吐量
+        """
+        self._lines[name] = self._lines.get(name, 0) + len(lines)
+
+    def _onResourcesSampled(self, samples: dict[str, ResourceSample]) -> None:
+        """
+        ## 记录一轮资源采样
+        """
+        for name, sample in samples.items():
+            self.record(name, Metric.CPU, sample.cpu_percent, sample.timestamp)
+            self.record(name, Metric.MEMORY, sample.rss, sample.timestamp)
+
+            lines = self._lines.pop(name, 0)
+            if (last := self._sampled_at.get(name)) is not None and sample.timestamp > last:
+                self.record(name, Metric.THROUGHPUT, lines / (sample.timestamp - last), sample.timestamp)
+            self._sampled_at[name] = sample.timestamp
+
+
+metricsStore = MetricsStore()
+
+
+__all__ = ["RESOLUTIONS", "Metric", "RingBuffer", "MetricSeries", "MetricsStore", "metricsStore"]
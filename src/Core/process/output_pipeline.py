@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+## 子进程输出管道
+    NapCat 每秒可能输出上千行日志, 逐行读取并逐行发送信号会使 GUI 线程不堪重负:
+    - 后台线程以大块读取管道, 每块只解码并切分一次
+    - 读取到的行先写入日志文件, 再合并为每帧 (约 16 毫秒) 最多一次的 linesReady 信号
+    - GUI 线程来不及处理时, 积压超过上限的最旧的行会被丢弃并计数, 日志文件中仍保留完整输出
+"""
+
+# 标准库导入
+import time
+import threading
+from typing import IO
+
+from PySide6.QtCore import QTimer, Signal, QObject
+
+# 项目内模块导入
+from src.core.utils.logger.log_writer import LogWriter
+
+
+class OutputPipeline(QObject):
+    """子进程输出管道, 需要在 GUI 线程中创建"""
+
+    # 信号
+    linesReady = Signal(list)  # 一批不含换行符的行
+    linesDropped = Signal(int)  # 本次丢弃的行数
+    finished = Signal()  # 管道已关闭且剩余的行已全部发送
+
+    # 内部信号, 通知 GUI 线程有新的行等待发送
+    _wake = Signal()
+
+    def __init__(
+        self,
+        stream: IO[bytes],
+        writer: LogWriter | None = None,
+        interval: int = 16,
+        max_pending: int = 20_000,
+        chunk_size: int = 64 * 1024,
+        name: str = "NCD-OutputPipeline",
+        parent: QObject | None = None,
+    ) -> None:
+        """
+        ## 初始化管道
+
+        ## 参数
+            - stream: IO[bytes] - 子进程的输出流 (二进制模式)
+            - writer: LogWriter | None - 日志文件写入器, 为 None 时不写入文件
+            - interval: int - 两次发送 linesReady 的最短间隔 (毫秒)
+            - max_pending: int - 等待发送的最大行数, 超出时丢弃最旧的行
+            - chunk_size: int - 每次读取的最大字节数
+            - name: str - 读取线程的名称
+            - parent: QObject | None - 父对象
+        """
+        super().__init__(parent)
+        self.stream = stream
+        self.writer = writer
+        self.interval = interval
+        self.max_pending = max_pending
+        self.chunk_size = chunk_size
+        # 没有换行符的超长输出达到该长度时按一行处理
+        self.max_line_length = 1024 * 1024
+
+        self.dropped = 0  # 累计丢弃的行数
+
+        self._lock = threading.Lock()
+        self._pending: list[str] = []
+        self._pending_dropped = 0
+        self._scheduled = False
+        self._closed = False
+        self._finished = False
+        self._last_delivery = 0.0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._deliver)
+        self._wake.connect(self._onWake)
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self) -> None:
+        """
+        ## 开始读取
+        """
+        self._thread.start()
+
+    def _run(self) -> None:
+        """
+        ## 后台线程: 按块读取并切分, 直到管道关闭
+        """
+        # read1 有多少读多少, 不会为凑满 chunk_size 而等待
+        read = getattr(self.stream, "read1", self.stream.read)
+        remainder = b""
+        try:
+            while chunk := read(self.chunk_size):
+                data = remainder + chunk
+                end = data.rfind(b"\n") + 1
+                if not end and len(data) < self.max_line_length:
+                    remainder = data
+                    continue
+                end = end or len(data)
+                remainder = data[end:]
+                self._push(data[:end].decode("utf-8", errors="replace").splitlines())
+        except (OSError, ValueError):
+            # 管道被关闭
+            pass
+        finally:
+            if remainder:
+                self._push(remainder.decode("utf-8", errors="replace").splitlines())
+            with self._lock:
+                self._closed = True
+            self._wake.emit()
+            try:
+                self.stream.close()
+            except OSError:
+                pass
+
+    def _push(self, lines: list[str]) -> None:
+        """
+        ## 后台线程: 写入日志文件并加入等待发送的行, 每次只唤醒 GUI 线程一次
+        """
+        if not lines:
+            return
+        if self.writer is not None:
+            self.writer.writeLines(lines)
+
+        with self._lock:
+            self._pending.extend(lines)
+            if (overflow := len(self._pending) - self.max_pending) > 0:
+                del self._pending[:overflow]
+                self._pending_dropped += overflow
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._wake.emit()
+
+    def _onWake(self) -> None:
+        """
+        ## GUI 线程: 距离上次发送不足一帧时推迟到下一帧
+        """
+        if not self._timer.isActive():
+            elapsed = (time.monotonic() - self._last_delivery) * 1000
+            self._timer.start(max(0, int(self.interval - elapsed)))
+
+    def _deliver(self) -> None:
+        """
+        ## GUI 线程: 取出全部等待发送的行并发送
+        """
+        with self._lock:
+            lines, self._pending = self._pending, []
+            dropped, self._pending_dropped = self._pending_dropped, 0
+            self._scheduled = False
+            closed = self._closed
+        self._last_delivery = time.monotonic()
+
+        if dropped:
+            self.dropped += dropped
+            self.linesDropped.emit(dropped)
+            lines.insert(0, self.tr("[NCD] 输出过快, 已跳过 {0} 行").format(dropped))
+        if lines:
+            self.linesReady.emit(lines)
+        if closed and not self._finished:
+            self._finished = True
+            self.finished.emit()
+
+
+__all__ = ["OutputPipeline"]
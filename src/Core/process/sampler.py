@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+## 进程资源采样
+    在一个后台线程中按固定间隔采样所有受监视进程 (包括其子进程) 的 CPU、内存与句柄数,
+    每轮采样的结果通过一次信号发送
+"""
+
+# 标准库导入
+import sys
+import time
+import threading
+from dataclasses import dataclass
+
+# 第三方库导入
+import psutil
+from PySide6.QtCore import Signal, QObject
+
+
+@dataclass(slots=True)
+class ResourceSample:
+    """一个实例 (进程树) 的资源占用"""
+
+    pid: int
+    cpu_percent: float  # 占用的 CPU 百分比, 多核时可能超过 100
+    rss: int  # 常驻内存 (字节)
+    handles: int  # Windows 上为句柄数, 其他平台为文件描述符数
+    threads: int  # 线程数
+    processes: int  # 进程树中的进程数
+    timestamp: float  # 采样时间 (time.time)
+
+
+class ResourceSampler(QObject):
+    """进程资源采样器"""
+
+    # 信号
+    sampled = Signal(dict)  # 实例名称 -> ResourceSample
+
+    def __init__(self, interval: float = 2.0, parent: QObject | None = None) -> None:
+        """
+        ## 初始化采样器, 后台线程在第一次添加进程时启动
+
+        ## 参数
+            - interval: float - 采样间隔 (秒)
+            - parent: QObject | None - 父对象
+        """
+        super().__init__(parent)
+        self.interval = interval
+
+        self._lock = threading.Lock()
+        self._roots: dict[str, int] = {}  # 实例名称 -> 根进程 pid
+        # 复用 psutil.Process 对象, cpu_percent 需要与上一次调用比较
+        self._processes: dict[int, psutil.Process] = {}
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._thread: threading.Thread | None = None
+
+    def setInterval(self, interval: float) -> None:
+        """
+        ## 修改采样间隔, 立即生效
+        """
+        self.interval = interval
+        self._wakeup.set()
+
+    def watch(self, name: str, pid: int) -> None:
+        """
+        ## 开始采样一个实例
+
+        ## 参数
+            - name: str - 实例名称
+            - pid: int - 实例的根进程 pid
+        """
+        with self._lock:
+            self._roots[name] = pid
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="NCD-ResourceSampler", daemon=True)
+                self._thread.start()
+
+    def unwatch(self, name: str) -> None:
+        """
+        ## 停止采样一个实例
+        """
+        with self._lock:
+            self._roots.pop(name, None)
+
+    def stop(self) -> None:
+        """
+        ## 停止后台线程
+        """
+        self._stopped = True
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        """
+        ## 后台线程主循环
+        """
+        while not self._stopped:
+            started = time.monotonic()
+            with self._lock:
+                roots = dict(self._roots)
+            if roots:
+                self.sampled.emit(self.sample(roots))
+            self._wakeup.wait(max(0.0, self.interval - (time.monotonic() - started)))
+            self._wakeup.clear()
+
+    def sample(self, roots: dict[str, int]) -> dict[str, ResourceSample]:
+        """
+        ## 对所有实例进行一轮采样, 已退出的进程会被忽略
+
+        ## 参数
+            - roots: dict[str, int] - 实例名称 -> 根进程 pid
+
+        ## 返回
+            - dict[str, ResourceSample]: 仍在运行的实例的采样结果
+        """
+        now = time.time()
+        alive: set[int] = set()
+        samples: dict[str, ResourceSample] = {}
+        children, created = self._snapshot()
+        for name, pid in roots.items():
+            tree = self._tree(pid, children, created)
+            if not tree:
+                continue
+            sample = ResourceSample(pid, 0.0, 0, 0, 0, 0, now)
+            for process in tree:
+                try:
+                    # oneshot 让以下读取共用一次系统调用的结果
+                    with process.oneshot():
+                        sample.cpu_percent += process.cpu_percent(None)
+                        sample.rss += process.memory_info().rss
+                        sample.handles += process.num_handles() if sys.platform == "win32" else process.num_fds()
+                        sample.threads += process.num_threads()
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    continue
+                sample.processes += 1
+                alive.add(process.pid)
+            samples[name] = sample
+
+        # 丢弃已退出进程的缓存
+        for pid in self._processes.keys() - alive:
+            del self._processes[pid]
+        return samples
+
+    @staticmethod
+    def _snapshot() -> tuple[dict[int, list[int]], dict[int, float]]:
+        """
+        ## 遍历一次系统进程, 所有实例共用本轮的结果
+
+        ## 返回
+            - dict[int, list[int]]: 父进程 pid -> 子进程 pid
+            - dict[int, float]: pid -> 进程创建时间
+        """
+        children: dict[int, list[int]] = {}
+        created: dict[int, float] = {}
+        for process in psutil.process_iter(["pid", "ppid", "create_time"]):
+            info = process.info
+            if info["ppid"] is not None and info["ppid"] != info["pid"]:
+                children.setdefault(info["ppid"], []).append(info["pid"])
+            created[info["pid"]] = info["create_time"]
+        return children, created
+
+    def _tree(self, pid: int, children: dict[int, list[int]], created: dict[int, float]) -> list[psutil.Process]:
+        """
+        ## 获取进程及其全部子进程, 使用缓存的 psutil.Process 对象
+        """
+        try:
+            tree = [self._process(pid, created)]
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return []
+        pending = list(children.get(pid, ()))
+        while pending:
+            child = pending.pop()
+            try:
+                tree.append(self._process(child, created))
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+            pending.extend(children.get(child, ()))
+        return tree
+
+    def _process(self, pid: int, created: dict[int, float]) -> psutil.Process:
+        """
+        ## 获取缓存的 psutil.Process 对象, 创建时间不同说明 pid 已被复用, 重新创建
+        """
+        process = self._processes.get(pid)
+        if process is None or process.create_time() != created.get(pid):
+            process = self._processes[pid] = psutil.Process(pid)
+        return process
+
+
+__all__ = ["ResourceSample", "ResourceSampler"]
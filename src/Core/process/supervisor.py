@@ -0,0 +1,374 @@
+# -*- coding: utf-8 -*-
+"""
+## 进程管理
+    以子进程的方式启动并管理多个 NapCat 实例 (每个机器人账号一个):
+    - 通过 OutputPipeline 在后台线程中按块读取子进程的 stdout / stderr, 每帧合并发送一次并写入日志文件
+    - 意外退出的实例按指数退避自动重启, 稳定运行一段时间后重置退避
+    - 通过 ResourceSampler 定期采样所有实例的资源占用
+"""
+
+# 标准库导入
+import os
+import sys
+import time
+import threading
+import subprocess
+from enum import Enum
+from typing import IO
+from pathlib import Path
+from dataclasses import field, dataclass
+
+# 第三方库导入
+import psutil
+from PySide6.QtCore import QTimer, Signal, QObject
+
+# 项目内模块导入
+from src.core.utils.path import PathFunc
+from src.core.utils.logger import LogType, LogSource, logger
+from src.core.process.sampler import ResourceSample, ResourceSampler
+from src.core.process.output_pipeline import OutputPipeline
+from src.core.utils.logger.log_writer import LogWriter
+
+
+class InstanceState(Enum):
+    """实例状态"""
+
+    STOPPED = 0  # 未运行
+    RUNNING = 1  # 运行中
+    STOPPING = 2  # 正在停止
+    RESTARTING = 3  # 意外退出, 等待重启
+    FAILED = 4  # 重启次数用尽
+
+
+@dataclass(slots=True)
+class InstanceSpec:
+    """实例的启动参数"""
+
+    name: str  # 实例名称, 通常为机器人账号
+    command: list[str]  # 启动命令
+    cwd: Path = field(default_factory=lambda: PathFunc().napcat_path)  # 工作目录
+    env: dict[str, str] = field(default_factory=dict)  # 追加的环境变量
+    auto_restart: bool = True  # 意外退出后是否自动重启
+    max_restarts: int = 5  # 连续重启的最大次数, 小于 0 时不限制
+
+
+class ProcessInstance:
+    """一个受管理的子进程, 由 ProcessSupervisor 创建"""
+
+    def __init__(self, spec: InstanceSpec) -> None:
+        self.spec = spec
+        self.state = InstanceState.STOPPED
+        self.process: subprocess.Popen | None = None
+        self.started_at = 0.0
+        self.restarts = 0  # 连续重启次数
+        self.exit_code: int | None = None
+        self.pipelines: list[OutputPipeline] = []  # 正在读取的输出管道
+
+    @property
+    def pid(self) -> int | None:
+        return self.process.pid if self.process is not None else None
+
+    @property
+    def running(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+
+class ProcessSupervisor(QObject):
+    """子进程管理器"""
+
+    # 信号
+    stateChanged = Signal(str, InstanceState)  # 实例名称, 新状态
+    outputReceived = Signal(str, str, list)  # 实例名称, 输出流 ("stdout" / "stderr"), 一批不含换行符的行
+    instanceExited = Signal(str, int)  # 实例名称, 退出码
+    instanceRemoved = Signal(str)  # 实例名称
+    resourcesSampled = Signal(dict)  # 实例名称 -> ResourceSample
+
+    # 内部信号, 将后台线程中的进程退出事件转交到 GUI 线程
+    _processExited = Signal(str, object, int)  # 实例名称, 退出的 Popen 对象, 退出码
+
+    def __init__(
+        self,
+        sample_interval: float = 2.0,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        stable_after: float = 60.0,
+        stop_timeout: float = 10.0,
+        log_dir: Path | None = None,
+        parent: QObject | None = None,
+    ) -> None:
+        """
+        ## 初始化管理器
+
+        ## 参数
+            - sample_interval: float - 资源采样间隔 (秒)
+            - backoff: float - 第一次自动重启前的等待秒数, 之后每次翻倍
+            - max_backoff: float - 自动重启前的最长等待秒数
+            - stable_after: float - 实例连续运行多少秒后视为稳定, 重置重启次数
+            - stop_timeout: float - 停止实例时等待其退出的秒数, 超时后强制结束
+            - log_dir: Path | None - 实例输出的日志目录, 默认为 `PathFunc().log_path`
+            - parent: QObject | None - 父对象
+        """
+        super().__init__(parent)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.stable_after = stable_after
+        self.stop_timeout = stop_timeout
+        self.log_dir = log_dir or PathFunc().log_path
+
+        self.instances: dict[str, ProcessInstance] = {}
+        self._restart_timers: dict[str, QTimer] = {}
+        self._writers: dict[str, LogWriter] = {}
+        self._closing_writers: dict[ProcessInstance, LogWriter] = {}  # 已移除, 等待输出读完的实例
+
+        self.sampler = ResourceSampler(sample_interval, self)
+        self.sampler.sampled.connect(self._onSampled)
+        self._processExited.connect(self._onProcessExited)
+
+    def addInstance(self, spec: InstanceSpec) -> ProcessInstance:
+        """
+        ## 添加实例, 不会启动
+
+        ## 参数
+            - spec: InstanceSpec - 启动参数, 名称已存在时替换其启动参数
+        """
+        if (instance := self.instances.get(spec.name)) is not None:
+            instance.spec = spec
+            return instance
+        instance = self.instances[spec.name] = ProcessInstance(spec)
+        return instance
+
+    def removeInstance(self, name: str) -> None:
+        """
+        ## 停止并移除实例
+        """
+        self.stop(name)
+        # 实例移除后其退出事件会被忽略, 在此停止采样
+        self.sampler.unwatch(name)
+        instance = self.instances.pop(name, None)
+        if instance is not None:
+            self.instanceRemoved.emit(name)
+        if (writer := self._writers.pop(name, None)) is None:
+            return
+        if instance is not None and instance.pipelines:
+            # 进程仍在退出, 等输出管道读完最后的输出 (通常是排查崩溃最需要的部分) 后再关闭
+            self._closing_writers[instance] = writer
+        else:
+            writer.close(wait=False)
+
+    def start(self, name: str) -> bool:
+        """
+        ## 启动实例
+
+        ## 返回
+            - bool: 是否启动成功, 已在运行时返回 True
+        """
+        instance = self.instances[name]
+        self._cancelRestart(name)
+        if instance.running:
+            return True
+
+        spec = instance.spec
+        try:
+            instance.process = subprocess.Popen(
+                spec.command,
+                cwd=spec.cwd,
+                env={**os.environ, **spec.env},
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                # 不为子进程弹出控制台窗口
+                creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0,
+            )
+        except OSError as e:
+            logger.error(f"启动实例 {name} 失败: {e}", LogType.NONE_TYPE, LogSource.CORE)
+            self._setState(instance, InstanceState.FAILED)
+            return False
+
+        instance.started_at = time.monotonic()
+        instance.exit_code = None
+        process = instance.process
+        for stream_name, stream in (("stdout", process.stdout), ("stderr", process.stderr)):
+            self._startPipeline(instance, stream_name, stream)
+        threading.Thread(target=self._waitProcess, args=(name, process), name=f"NCD-{name}-wait", daemon=True).start()
+
+        self.sampler.watch(name, process.pid)
+        self._setState(instance, InstanceState.RUNNING)
+        logger.info(f"实例 {name} 已启动, pid: {process.pid}", LogType.NONE_TYPE, LogSource.CORE)
+        return True
+
+    def stop(self, name: str) -> None:
+        """
+        ## 停止实例, 先请求进程树正常退出, 超时后强制结束; 不会阻塞
+        """
+        instance = self.instances[name]
+        self._cancelRestart(name)
+        if not instance.running:
+            self._setState(instance, InstanceState.STOPPED)
+            return
+
+        self._setState(instance, InstanceState.STOPPING)
+        tree = self._processTree(instance.process)
+        for process in tree:
+            try:
+                process.terminate()
+            except psutil.Error:
+                pass
+        QTimer.singleShot(int(self.stop_timeout * 1000), lambda: self._kill(tree))
+
+    def restart(self, name: str) -> None:
+        """
+        ## 重启实例, 等待旧进程退出后再启动
+        """
+        instance = self.instances[name]
+        instance.restarts = 0
+        if not instance.running:
+            self.start(name)
+            return
+        self.stop(name)
+        self._scheduleRestart(name, instance.process, 0)
+
+    def startAll(self) -> None:
+        """
+        ## 启动全部实例
+        """
+        for name in self.instances:
+            self.start(name)
+
+    def stopAll(self) -> None:
+        """
+        ## 停止全部实例
+        """
+        for name in self.instances:
+            self.stop(name)
+
+    def setSampleInterval(self, interval: float) -> None:
+        """
+        ## 修改资源采样间隔
+        """
+        self.sampler.setInterval(interval)
+
+    def _setState(self, instance: ProcessInstance, state: InstanceState) -> None:
+        """
+        ## 更新实例状态并发送信号
+        """
+        if instance.state is not state:
+            instance.state = state
+            self.stateChanged.emit(instance.spec.name, state)
+
+    def _onSampled(self, samples: dict[str, ResourceSample]) -> None:
+        """
+        ## 转发一轮资源采样, 忽略在采样过程中被移除的实例
+        """
+        self.resourcesSampled.emit({name: sample for name, sample in samples.items() if name in self.instances})
+
+    def _startPipeline(self, instance: ProcessInstance, stream_name: str, stream: IO[bytes]) -> None:
+        """
+        ## 开始读取一个输出流, stdout 与 stderr 写入同一个日志文件
+        """
+        name = instance.spec.name
+        if (writer := self._writers.get(name)) is None:
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            writer = self._writers[name] = LogWriter(self.log_dir / f"NapCat.{name}.log")
+
+        pipeline = OutputPipeline(stream, writer, name=f"NCD-{name}-{stream_name}", parent=self)
+        pipeline.linesReady.connect(lambda lines: self.outputReceived.emit(name, stream_name, lines))
+        pipeline.finished.connect(lambda: self._onPipelineFinished(instance, pipeline))
+        instance.pipelines.append(pipeline)
+        pipeline.start()
+
+    def _onPipelineFinished(self, instance: ProcessInstance, pipeline: OutputPipeline) -> None:
+        """
+        ## 输出流关闭且剩余的行已发送, 释放管道; 已移除的实例在全部管道结束后关闭日志文件
+        """
+        instance.pipelines.remove(pipeline)
+        pipeline.deleteLater()
+        if not instance.pipelines and (writer := self._closing_writers.pop(instance, None)) is not None:
+            writer.close(wait=False)
+
+    def _waitProcess(self, name: str, process: subprocess.Popen) -> None:
+        """
+        ## 后台线程: 等待进程退出
+        """
+        self._processExited.emit(name, process, process.wait())
+
+    def _onProcessExited(self, name: str, process: subprocess.Popen, code: int) -> None:
+        """
+        ## 进程退出后决定是否自动重启 (在 GUI 线程中调用)
+        """
+        if (instance := self.instances.get(name)) is None or instance.process is not process:
+            return
+
+        self.sampler.unwatch(name)
+        instance.exit_code = code
+        self.instanceExited.emit(name, code)
+        if instance.state in (InstanceState.STOPPING, InstanceState.STOPPED) or name in self._restart_timers:
+            # 主动停止, 或正在等待 restart 重新启动
+            if name not in self._restart_timers:
+                self._setState(instance, InstanceState.STOPPED)
+            return
+
+        logger.warning(f"实例 {name} 意外退出, 退出码: {code}", LogType.NONE_TYPE, LogSource.CORE)
+        if time.monotonic() - instance.started_at >= self.stable_after:
+            instance.restarts = 0
+        spec = instance.spec
+        if not spec.auto_restart or 0 <= spec.max_restarts <= instance.restarts:
+            self._setState(instance, InstanceState.FAILED)
+            return
+
+        delay = min(self.max_backoff, self.backoff * 2**instance.restarts)
+        instance.restarts += 1
+        self._setState(instance, InstanceState.RESTARTING)
+        logger.info(f"{delay:.0f} 秒后重启实例 {name} (第 {instance.restarts} 次)", LogType.NONE_TYPE, LogSource.CORE)
+        self._scheduleRestart(name, None, delay)
+
+    def _scheduleRestart(self, name: str, waiting: subprocess.Popen | None, delay: float) -> None:
+        """
+        ## 延迟启动实例, 指定了 waiting 时还会等待该进程退出
+        """
+        self._cancelRestart(name)
+
+        def fire() -> None:
+            if waiting is not None and waiting.poll() is None:
+                timer.start(100)
+                return
+            self._restart_timers.pop(name).deleteLater()
+            self.start(name)
+
+        timer = self._restart_timers[name] = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(fire)
+        timer.start(int(delay * 1000))
+
+    def _cancelRestart(self, name: str) -> None:
+        """
+        ## 取消等待中的重启
+        """
+        if (timer := self._restart_timers.pop(name, None)) is not None:
+            timer.stop()
+            timer.deleteLater()
+
+    @staticmethod
+    def _processTree(process: subprocess.Popen) -> list[psutil.Process]:
+        """
+        ## 获取子进程及其全部后代进程, NapCat 启动的 QQ 需要一并结束
+        """
+        try:
+            root = psutil.Process(process.pid)
+            return root.children(recursive=True) + [root]
+        except psutil.Error:
+            return []
+
+    @staticmethod
+    def _kill(tree: list[psutil.Process]) -> None:
+        """
+        ## 强制结束仍未退出的进程
+        """
+        for process in tree:
+            try:
+                if process.is_running():
+                    process.kill()
+            except psutil.Error:
+                pass
+
+
+__all__ = ["InstanceState", "InstanceSpec", "ProcessInstance", "ProcessSupervisor"]
@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
 
+# 标准库导入
+from typing import TYPE_CHECKING
+
 # 第三方库导入
 from qfluentwidgets import PlainTextEdit, SmoothScrollDelegate, setFont
 from qfluentwidgets.components.widgets.menu import TextEditMenu
@@ -8,6 +11,7 @@ from PySide6.QtGui import (
     QPainter,
     QMouseEvent,
     QPaintEvent,
+    QTextCursor,
     QFontDatabase,
     QTextCharFormat,
     QDesktopServices,
@@ -16,6 +20,12 @@ from PySide6.QtGui import (
 from PySide6.QtCore import Qt, QUrl, Slot, QRect, QSize, QRectF, QTimer, QRegularExpression
 from PySide6.QtWidgets import QWidget, QTextBrowser
 
+if TYPE_CHECKING:
+    # 项目内模块导入
+    from src.core.process.supervisor import ProcessSupervisor
+    from src.core.utils.logger.log_tail import LogTailWatcher
+    from src.core.utils.logger.log_index import LogHit
+
 
 class CodeEditor(PlainTextEdit):
     def __init__(self, parent=None):
@@ -114,6 +124,217 @@ class CodeEditor(PlainTextEdit):
             self.update_line_number_area_width(0)
 
 
+class LogViewer(CodeEditor):
+    """
+    ## 日志查看器
+        - 新日志增量追加到文档末尾, 不会替换整个文档
+        - 文档超过最大行数时自动裁剪最旧的行
+        - 仅对可见区域内的行进行语法高亮
+        - 滚动条位于底部时自动跟随最新日志
+        - 可以跟随日志文件, 也可以直接跟随 NapCat 实例的输出
+    """
+
+    def __init__(self, parent=None, max_block_count: int = 100_000) -> None:
+        super().__init__(parent)
+        self.highlighter: VisibleBlockHighlighter | None = None
+        self.tail_watcher: "LogTailWatcher | None" = None
+        self.supervisor: "ProcessSupervisor | None" = None
+        self.instance_name: str | None = None
+        self.follow = True  # 是否跟随最新日志
+
+        # 日志不需要撤销栈, 也不需要自动换行带来的重新排版
+        self.setUndoRedoEnabled(False)
+        self.setLineWrapMode(PlainTextEdit.LineWrapMode.NoWrap)
+        self.setMaximumBlockCount(max_block_count)
+
+        # 合并同一事件循环内的多次可见区域变化
+        self._highlight_timer = QTimer(self)
+        self._highlight_timer.setSingleShot(True)
+        self._highlight_timer.setInterval(0)
+        self._highlight_timer.timeout.connect(self._highlightVisibleBlocks)
+        # 上次高亮时的 (首个可见行, 视口高度, 总行数), 用于判断可见区域是否变化
+        self._visible_key: tuple[int, int, int] | None = None
+
+        self.updateRequest.connect(self._onUpdateRequest)
+        self.verticalScrollBar().valueChanged.connect(self._onScrollValueChanged)
+
+    def setHighlighter(self, highlighter: "VisibleBlockHighlighter") -> None:
+        """
+        ## 设置高亮器, 高亮器只处理可见区域内的行
+        """
+        self.highlighter = highlighter
+        highlighter.setDocument(self.document())
+        self._highlight_timer.start()
+
+    def setMaxBlockCount(self, count: int) -> None:
+        """
+        ## 设置最多保留的行数, 0 表示不限制
+        """
+        self.setMaximumBlockCount(count)
+
+    def appendLines(self, lines: list[str]) -> None:
+        """
+        ## 将多行日志一次性追加到文档末尾
+
+        ## 参数
+            - lines: list[str] - 不含换行符的日志行
+        """
+        if not lines:
+            return
+
+        if self.highlighter is not None:
+            # 追加时先记录可见区域, 新行若不可见则推迟高亮
+            self.highlighter.setVisibleRange(*self._visibleBlockRange())
+
+        scroll_bar = self.verticalScrollBar()
+        position = scroll_bar.value()
+
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        cursor.insertText(("\n" if not self.document().isEmpty() else "") + "\n".join(lines))
+        cursor.endEditBlock()
+
+        # 跟随最新日志, 否则保持用户当前的阅读位置
+        scroll_bar.setValue(scroll_bar.maximum() if self.follow else position)
+
+    def followFile(self, watcher: "LogTailWatcher") -> None:
+        """
+        ## 跟随日志文件, 只读取最后 maximumBlockCount 行以及之后追加的行
+
+        ## 参数
+            - watcher: LogTailWatcher - 日志文件监视器
+        """
+        self.unfollowFile()
+        self.clearLines()
+        self.tail_watcher = watcher
+        watcher.fileReset.connect(self.clearLines)
+        watcher.linesAppended.connect(self._onTailLinesAppended)
+        watcher.start()
+
+    def unfollowFile(self) -> None:
+        """
+        ## 停止跟随日志文件
+        """
+        if self.tail_watcher is None:
+            return
+        self.tail_watcher.fileReset.disconnect(self.clearLines)
+        self.tail_watcher.linesAppended.disconnect(self._onTailLinesAppended)
+        self.tail_watcher.stop()
+        self.tail_watcher = None
+
+    def followProcess(self, supervisor: "ProcessSupervisor", name: str) -> None:
+        """
+        ## 跟随 NapCat 实例的输出, 每帧最多追加一次
+
+        ## 参数
+            - supervisor: ProcessSupervisor - 进程管理器
+            - name: str - 实例名称
+        """
+        self.unfollowProcess()
+        self.supervisor, self.instance_name = supervisor, name
+        supervisor.outputReceived.connect(self._onProcessOutput)
+
+    def unfollowProcess(self) -> None:
+        """
+        ## 停止跟随实例的输出
+        """
+        if self.supervisor is None:
+            return
+        self.supervisor.outputReceived.disconnect(self._onProcessOutput)
+        self.supervisor = self.instance_name = None
+
+    def _onProcessOutput(self, name: str, stream: str, lines: list[str]) -> None:
+        """
+        ## 只追加所跟随实例的输出
+        """
+        if name == self.instance_name:
+            self.appendLines(lines)
+
+    def showSearchResults(self, hits: list["LogHit"]) -> None:
+        """
+        ## 显示日志检索结果, 会停止跟随日志文件与实例输出, 避免新日志混入检索结果
+
+        ## 参数
+            - hits: list[LogHit] - `LogIndex.search` 的结果 (从新到旧)
+        """
+        self.unfollowFile()
+        self.unfollowProcess()
+        self.clearLines()
+        self.appendLines([hit.text for hit in reversed(hits)])
+        self.follow = False
+        self.verticalScrollBar().setValue(0)
+
+    def _onTailLinesAppended(self, start: int, count: int) -> None:
+        """
+        ## 从日志文件读取新增的行, 超出最大行数的部分不会被读取
+        """
+        if limit := self.maximumBlockCount():
+            start, count = max(start, start + count - limit), min(count, limit)
+        self.appendLines(self.tail_watcher.tail.getLines(start, start + count))
+
+    def clearLines(self) -> None:
+        """
+        ## 清空所有日志
+        """
+        self.document().clear()
+        self.follow = True
+        self._visible_key = None
+
+    def setPlainText(self, text):
+        # 整体替换文本时, 同样只高亮可见区域
+        if self.highlighter is not None:
+            self.highlighter.setVisibleRange(0, -1)
+        self._visible_key = None
+        super().setPlainText(text)
+
+    def _onScrollValueChanged(self, value: int) -> None:
+        """
+        ## 用户滚动到底部时恢复跟随, 离开底部时停止跟随
+        """
+        self.follow = value >= self.verticalScrollBar().maximum()
+        self._highlight_timer.start()
+
+    def _onUpdateRequest(self, rect: QRect, dy: int) -> None:
+        """
+        ## 只在可见行的范围可能变化时安排高亮, 光标闪烁等普通重绘不会触发
+        """
+        key = (self.firstVisibleBlock().blockNumber(), self.viewport().height(), self.blockCount())
+        if key != self._visible_key:
+            self._visible_key = key
+            self._highlight_timer.start()
+
+    def _visibleBlockRange(self) -> tuple[int, int]:
+        """
+        ## 获取可见区域内首行和末行的行号
+        """
+        block = self.firstVisibleBlock()
+        first = last = block.blockNumber()
+        top = self.blockBoundingGeometry(block).translated(self.contentOffset()).top()
+        height = self.viewport().height()
+        while block.isValid() and top <= height:
+            last = block.blockNumber()
+            top += self.blockBoundingRect(block).height()
+            block = block.next()
+        return first, last
+
+    def _highlightVisibleBlocks(self) -> None:
+        """
+        ## 高亮可见区域内尚未高亮的行
+        """
+        if self.highlighter is None:
+            return
+
+        first, last = self._visibleBlockRange()
+        self.highlighter.setVisibleRange(first, last)
+
+        block = self.document().findBlockByNumber(first)
+        while block.isValid() and block.blockNumber() <= last:
+            if block.userState() != VisibleBlockHighlighter.HIGHLIGHTED:
+                self.highlighter.rehighlightBlock(block)
+            block = block.next()
+
+
 class UpdateLogEdit(QTextBrowser):
     """
     ## 更新日志页面使用的透明文本框
@@ -152,31 +373,49 @@ class LineNumberArea(QWidget):
         self.code_editor.lineNumberAreaPaintEvent(event)
 
 
-class LogHighlighter(QSyntaxHighlighter):
-    def __init__(self, parent=None) -> None:
-        super().__init__(parent)
+class VisibleBlockHighlighter(QSyntaxHighlighter):
+    """
+    ## 只高亮可见行的高亮器基类
+        - 按 pattern 匹配行首的时间戳 (第 1 组) 与日志级别 (第 2 组), 子类只需配置 pattern 与各级别的颜色
+        - 未设置可见区域时与普通高亮器一致, 高亮所有行
+        - 可见区域外的行标记为待高亮, 由 LogViewer 在其滚动到可见区域时补充高亮
+    """
 
-        # 初始化不同日志级别的文本格式
-        self.formats = {
-            "DEBUG": QTextCharFormat(),
-            "INFO": QTextCharFormat(),
-            "WARN": QTextCharFormat(),
-            "ERROR": QTextCharFormat(),
-        }
+    PENDING = -1  # 待高亮
+    HIGHLIGHTED = 1  # 已高亮
 
-        # 设置每个日志级别的前景色
-        self.formats["DEBUG"].setForeground(QColor(Qt.GlobalColor.darkRed))
-        self.formats["INFO"].setForeground(QColor(Qt.GlobalColor.green))
-        self.formats["WARN"].setForeground(QColor(Qt.GlobalColor.darkYellow))
-        self.formats["ERROR"].setForeground(QColor(Qt.GlobalColor.red))
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._visible_range: tuple[int, int] | None = None
 
-        # 定义日志级别的顺序
-        self.log_levels = ["DEBUG", "INFO", "WARN", "ERROR"]
+        # 由子类配置: 匹配时间戳与日志级别的正则表达式, 各日志级别的格式, 时间戳的颜色
+        self.pattern: QRegularExpression | None = None
+        self.formats: dict[str, QTextCharFormat] = {}
+        self.log_levels: list[str] = []
+        self.timestamp_color = QColor(Qt.GlobalColor.lightGray)
 
-        # 正则表达式模式，用于匹配像 [DEBUG]、[INFO] 等日志级别标签
-        self.pattern = QRegularExpression(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) \[(DEBUG|INFO|WARN|ERROR)\]")
+    def setVisibleRange(self, first: int, last: int) -> None:
+        """
+        ## 设置可见区域的首行和末行行号, 末行小于首行时不高亮任何行
+        """
+        self._visible_range = (first, last)
 
     def highlightBlock(self, text) -> None:
+        if self._visible_range is not None:
+            first, last = self._visible_range
+            if not first <= self.currentBlock().blockNumber() <= last:
+                self.setCurrentBlockState(self.PENDING)
+                return
+        self.setCurrentBlockState(self.HIGHLIGHTED)
+        self.highlightLine(text)
+
+    def highlightLine(self, text: str) -> None:
+        """
+        ## 高亮单行文本的时间戳与日志级别
+        """
+        if self.pattern is None:
+            return
+
         # 创建一个格式化对象，用于应用整行的前景色
         test_format = QTextCharFormat()
 
@@ -196,7 +435,7 @@ class LogHighlighter(QSyntaxHighlighter):
         loglevel_length = match.capturedLength(2)
 
         # 应用时间戳的格式
-        test_format.setForeground(QColor(Qt.GlobalColor.lightGray))
+        test_format.setForeground(self.timestamp_color)
         self.setFormat(timestamp_start, timestamp_length, test_format)
 
         # 检查捕获的日志级别是否在预定义列表中
@@ -207,7 +446,35 @@ class LogHighlighter(QSyntaxHighlighter):
             self.setFormat(loglevel_start, loglevel_length, test_format)
 
 
-class NCDLogHighlighter(QSyntaxHighlighter):
+class LogHighlighter(VisibleBlockHighlighter):
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+
+        # 初始化不同日志级别的文本格式
+        self.formats = {
+            "DEBUG": QTextCharFormat(),
+            "INFO": QTextCharFormat(),
+            "WARN": QTextCharFormat(),
+            "ERROR": QTextCharFormat(),
+        }
+
+        # 设置每个日志级别的前景色
+        self.formats["DEBUG"].setForeground(QColor(Qt.GlobalColor.darkRed))
+        self.formats["INFO"].setForeground(QColor(Qt.GlobalColor.green))
+        self.formats["WARN"].setForeground(QColor(Qt.GlobalColor.darkYellow))
+        self.formats["ERROR"].setForeground(QColor(Qt.GlobalColor.red))
+
+        # 定义日志级别的顺序
+        self.log_levels = ["DEBUG", "INFO", "WARN", "ERROR"]
+
+        # 正则表达式模式，用于匹配像 [DEBUG]、[INFO] 等日志级别标签
+        self.pattern = QRegularExpression(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) \[(DEBUG|INFO|WARN|ERROR)\]")
+
+        # 时间戳的颜色
+        self.timestamp_color = QColor(Qt.GlobalColor.lightGray)
+
+
+class NCDLogHighlighter(VisibleBlockHighlighter):
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
 
@@ -235,35 +502,8 @@ class NCDLogHighlighter(QSyntaxHighlighter):
             r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3}) \| (SUCCESS|DEBUG|INFO|WARN|ERROR) \|"
         )
 
-    def highlightBlock(self, text) -> None:
-        # 创建一个格式化对象，用于应用整行的前景色
-        test_format = QTextCharFormat()
-
-        # 检查当前文本块是否匹配日志级别的模式
-        match = self.pattern.match(text)
-
-        # 如果没有匹配到，直接返回
-        if not match or not match.hasMatch():
-            return
-
-        # 获取时间戳的起始位置和长度
-        timestamp_start = match.capturedStart(1)
-        timestamp_length = match.capturedLength(1)
-
-        # 获取日志级别的起始位置和长度
-        loglevel_start = match.capturedStart(2)
-        loglevel_length = match.capturedLength(2)
-
-        # 应用时间戳的格式
-        test_format.setForeground(QColor(Qt.GlobalColor.darkGreen))
-        self.setFormat(timestamp_start, timestamp_length, test_format)
-
-        # 检查捕获的日志级别是否在预定义列表中
-        log_level = match.captured(2)
-        if log_level in self.log_levels:
-            # 设置对应日志级别的格式
-            test_format.setForeground(self.formats[log_level].foreground().color())
-            self.setFormat(loglevel_start, loglevel_length, test_format)
+        # 时间戳的颜色
+        self.timestamp_color = QColor(Qt.GlobalColor.darkGreen)
 
 
-__all__ = ["CodeEditor", "UpdateLogEdit", "LogHighlighter", "NCDLogHighlighter"]
+__all__ = ["CodeEditor", "LogViewer", "UpdateLogEdit", "VisibleBlockHighlighter", "LogHighlighter", "NCDLogHighlighter"]
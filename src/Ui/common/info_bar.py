@@ -6,15 +6,224 @@
 ### 消息条位置
     - 右下角: `info_bar`, `success_bar`
     - 右上角: `warning_bar`, `error_bar`
+
+### 通知调度
+    所有消息条都经由 `notificationDispatcher()` 获取的调度器创建:
+    - 可以在任意线程中调用, 消息条总是在 GUI 线程中创建
+    - 短时间内相同 (标题, 内容) 的消息合并为一条, 并在标题上显示重复次数
+    - 限制每秒创建的消息条数量, 突发的大量消息汇总为一条
 """
 
+# 标准库导入
+import time
+import threading
+from dataclasses import dataclass
+
 # 第三方库导入
-from qfluentwidgets import InfoBar
-from PySide6.QtCore import Qt
+from qfluentwidgets import InfoBar, InfoBarIcon, InfoBarManager
+from PySide6.QtCore import Qt, QTimer, Signal, QObject, QCoreApplication
 
 # 项目内模块导入
 from src.ui.common.managers import NCDInfoBarPosition
 
+# 调度器创建的消息条的位置
+_POSITION = NCDInfoBarPosition.BOTTOM_RIGHT
+# 消息条的严重程度, 汇总消息条使用其中最严重的图标
+_SEVERITY = [InfoBarIcon.SUCCESS, InfoBarIcon.INFORMATION, InfoBarIcon.WARNING, InfoBarIcon.ERROR]
+
+
+@dataclass(slots=True)
+class _Notification:
+    """等待显示或正在显示的消息"""
+
+    icon: InfoBarIcon
+    title: str
+    content: str
+    duration: int
+    count: int = 1  # 重复次数
+
+    @property
+    def key(self) -> tuple:
+        return self.icon, self.title, self.content
+
+    @property
+    def displayTitle(self) -> str:
+        return f"{self.title} (×{self.count})" if self.count > 1 else self.title
+
+
+class NotificationDispatcher(QObject):
+    """
+    ## 消息条调度器
+        消息先在 GUI 线程中收集 `window` 毫秒, 相同的消息只计数, 然后按令牌桶限制创建消息条:
+        每秒最多补充 `rate` 个令牌, 最多积累 `burst` 个; 令牌不足以显示全部消息时, 其余消息汇总为一条
+    """
+
+    # 信号, 用于将其他线程中的消息转交到 GUI 线程
+    _posted = Signal(object)
+
+    def __init__(self, window: int = 100, rate: float = 2.0, burst: int = 4, parent: QObject | None = None) -> None:
+        """
+        ## 初始化调度器
+
+        ## 参数
+            - window: int - 收集消息的时间窗口 (毫秒)
+            - rate: float - 每秒补充的消息条数量
+            - burst: int - 一次最多创建的消息条数量
+            - parent: QObject | None - 父对象
+        """
+        super().__init__(parent)
+        self.window = window
+        self.rate = rate
+        self.burst = burst
+
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+        self._pending: dict[tuple, _Notification] = {}
+        self._shown: dict[tuple, tuple[InfoBar, _Notification]] = {}
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._flush)
+        # 即使在 GUI 线程中调用也排队处理, 调用者不会直接创建控件
+        self._posted.connect(self._enqueue, Qt.ConnectionType.QueuedConnection)
+
+    def post(self, icon: InfoBarIcon, content: str, title: str, duration: int) -> None:
+        """
+        ## 提交一条消息, 可以在任意线程中调用
+
+        ## 参数
+            - icon: InfoBarIcon - 消息条图标
+            - content: str - 消息条内容
+            - title: str - 消息条标题
+            - duration: int - 消息条显示时间, 小于 0 时不会自动关闭
+        """
+        self._posted.emit(_Notification(icon, title, content, duration))
+
+    def _enqueue(self, notification: _Notification) -> None:
+        """
+        ## 在 GUI 线程中收集消息, 与正在显示或等待中的消息重复时只增加计数
+        """
+        key = notification.key
+        if (shown := self._shown.get(key)) is not None:
+            info_bar, shown_notification = shown
+            shown_notification.count += 1
+            info_bar.title = shown_notification.displayTitle
+            info_bar._adjustText()
+            # 标题变长后消息条可能换行变高, 管理器需要更新缓存的高度
+            InfoBarManager.make(_POSITION).updateInfoBar(info_bar)
+            return
+
+        if (pending := self._pending.get(key)) is not None:
+            pending.count += 1
+            return
+
+        self._pending[key] = notification
+        if not self._timer.isActive():
+            self._timer.start(self.window)
+
+    def _flush(self) -> None:
+        """
+        ## 按剩余的令牌创建消息条, 没有令牌时等待补充
+        """
+        now = time.monotonic()
+        self._tokens = min(float(self.burst), self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+        if not self._pending:
+            return
+        if self._tokens < 1:
+            self._timer.start(int((1 - self._tokens) / self.rate * 1000) + 1)
+            return
+
+        notifications = list(self._pending.values())
+        self._pending.clear()
+        available = int(self._tokens)
+        if len(notifications) <= available:
+            self._tokens -= len(notifications)
+            for notification in notifications:
+                self._show(notification)
+            return
+
+        self._tokens -= available
+        for notification in notifications[: available - 1]:
+            self._show(notification)
+        self._showSummary(notifications[available - 1 :])
+
+    def _show(self, notification: _Notification) -> None:
+        """
+        ## 创建消息条, 显示期间记录下来以便合并之后的重复消息
+        """
+        info_bar = self._create(
+            notification.icon, notification.displayTitle, notification.content, notification.duration
+        )
+        key = notification.key
+        self._shown[key] = (info_bar, notification)
+        info_bar.closedSignal.connect(lambda: self._forget(key, info_bar))
+        # 消息条可能未发出 closedSignal 就被销毁 (如父组件被销毁)
+        info_bar.destroyed.connect(lambda: self._forget(key, info_bar))
+
+    def _forget(self, key: tuple, info_bar: InfoBar) -> None:
+        """
+        ## 消息条关闭后, 之后相同的消息重新显示
+        """
+        if (shown := self._shown.get(key)) is not None and shown[0] is info_bar:
+            del self._shown[key]
+
+    def _showSummary(self, notifications: list[_Notification]) -> None:
+        """
+        ## 将多条消息汇总为一个消息条
+        """
+        icon = max((notification.icon for notification in notifications), key=_SEVERITY.index)
+        durations = [notification.duration for notification in notifications]
+        lines = [f"{notification.displayTitle}: {notification.content}" for notification in notifications[:3]]
+        if len(notifications) > 3:
+            lines.append(self.tr("以及其他 {0} 条通知").format(len(notifications) - 3))
+
+        self._create(
+            icon,
+            self.tr("收到 {0} 条通知").format(sum(notification.count for notification in notifications)),
+            "\n".join(lines),
+            -1 if min(durations) < 0 else max(durations),
+        )
+
+    @staticmethod
+    def _create(icon: InfoBarIcon, title: str, content: str, duration: int) -> InfoBar:
+        """
+        ## 在主窗体中创建消息条
+        """
+        # 项目内模块导入
+        from src.ui.main_window.window import MainWindow
+
+        return InfoBar.new(
+            icon=icon,
+            title=title,
+            content=content,
+            orient=Qt.Orientation.Vertical,
+            duration=duration,
+            position=_POSITION,
+            parent=MainWindow(),
+        )
+
+
+_dispatcher: NotificationDispatcher | None = None
+_dispatcher_lock = threading.Lock()
+
+
+def notificationDispatcher() -> NotificationDispatcher:
+    """
+    ## 获取消息条调度器, 第一次调用时创建, 可以在任意线程中调用
+
+    ## 返回
+        - NotificationDispatcher: 属于 GUI 线程的调度器
+    """
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = NotificationDispatcher()
+            # 在其他线程中第一次调用时, 调度器及其计时器仍需要在 GUI 线程中工作
+            if (app := QCoreApplication.instance()) is not None:
+                _dispatcher.moveToThread(app.thread())
+        return _dispatcher
+
 
 def info_bar(content: str, title: str = "Tips✨", duration: int = 5_000) -> None:
     """
@@ -25,17 +234,7 @@ def info_bar(content: str, title: str = "Tips✨", duration: int = 5_000) -> Non
         - content: 消息条内容
         - duration: 消息条显示时间, 默认 5 秒
     """
-    # 项目内模块导入
-    from src.ui.main_window.window import MainWindow
-
-    InfoBar.info(
-        title=title,
-        content=content,
-        orient=Qt.Orientation.Vertical,
-        duration=duration,
-        position=NCDInfoBarPosition.BOTTOM_RIGHT,
-        parent=MainWindow(),
-    )
+    notificationDispatcher().post(InfoBarIcon.INFORMATION, content, title, duration)
 
 
 def success_bar(content: str, title: str = "Success✅", duration: int = 3_000) -> None:
@@ -47,17 +246,7 @@ def success_bar(content: str, title: str = "Success✅", duration: int = 3_000)
         - content: 消息条内容
         - duration: 消息条显示时间, 默认 3 秒
     """
-    # 项目内模块导入
-    from src.ui.main_window.window import MainWindow
-
-    InfoBar.success(
-        title=title,
-        content=content,
-        orient=Qt.Orientation.Vertical,
-        duration=duration,
-        position=NCDInfoBarPosition.BOTTOM_RIGHT,
-        parent=MainWindow(),
-    )
+    notificationDispatcher().post(InfoBarIcon.SUCCESS, content, title, duration)
 
 
 def warning_bar(content: str, title: str = "Warning⚠️", duration: int = 5_000) -> None:
@@ -69,17 +258,7 @@ def warning_bar(content: str, title: str = "Warning⚠️", duration: int = 5_00
         - content: 消息条内容
         - duration: 消息条显示时间, 默认 5 秒
     """
-    # 项目内模块导入
-    from src.ui.main_window.window import MainWindow
-
-    InfoBar.warning(
-        title=title,
-        content=content,
-        orient=Qt.Orientation.Vertical,
-        duration=duration,
-        position=NCDInfoBarPosition.BOTTOM_RIGHT,
-        parent=MainWindow(),
-    )
+    notificationDispatcher().post(InfoBarIcon.WARNING, content, title, duration)
 
 
 def error_bar(content: str, title: str = "Failed❌", duration: int = -1) -> None:
@@ -91,17 +270,14 @@ def error_bar(content: str, title: str = "Failed❌", duration: int = -1) -> Non
         - content: 消息条内容
         - duration: 消息条显示时间, 默认 ∞ 秒
     """
-    # 项目内模块导入
-    from src.ui.main_window.window import MainWindow
-
-    InfoBar.error(
-        title=title,
-        content=content,
-        orient=Qt.Orientation.Vertical,
-        duration=duration,
-        position=NCDInfoBarPosition.BOTTOM_RIGHT,
-        parent=MainWindow(),
-    )
+    notificationDispatcher().post(InfoBarIcon.ERROR, content, title, duration)
 
 
-__all__ = ["info_bar", "success_bar", "warning_bar", "error_bar"]
+__all__ = [
+    "NotificationDispatcher",
+    "notificationDispatcher",
+    "info_bar",
+    "success_bar",
+    "warning_bar",
+    "error_bar",
+]
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+## 延迟创建的页面
+    导航项只登记页面的工厂函数, 页面在第一次显示时才会被创建, 也可以在空闲时预先创建
+"""
+
+# 标准库导入
+from typing import Callable
+
+from PySide6.QtGui import QShowEvent
+from PySide6.QtCore import Signal
+from PySide6.QtWidgets import QWidget, QVBoxLayout
+
+
+class LazyInterface(QWidget):
+    """页面占位组件, 第一次显示时通过工厂函数创建真正的页面"""
+
+    # 页面创建完成信号
+    interfaceCreated = Signal(QWidget)
+
+    def __init__(self, object_name: str, factory: Callable[[], QWidget], parent=None) -> None:
+        """
+        ## 构造函数
+
+        ## 参数
+            - object_name: 页面的 objectName, 导航项以此作为路由键
+            - factory: 创建页面的工厂函数
+        """
+        super().__init__(parent)
+        self.setObjectName(object_name)
+        self.factory = factory
+        self.interface: QWidget | None = None
+
+        self.vBoxLayout = QVBoxLayout(self)
+        self.vBoxLayout.setContentsMargins(0, 0, 0, 0)
+        self.vBoxLayout.setSpacing(0)
+
+    def isCreated(self) -> bool:
+        """页面是否已经创建"""
+        return self.interface is not None
+
+    def ensureInterface(self) -> QWidget:
+        """
+        ## 获取页面, 尚未创建时立即创建
+        """
+        if self.interface is None:
+            self.interface = self.factory()
+            self.vBoxLayout.addWidget(self.interface)
+            self.interfaceCreated.emit(self.interface)
+        return self.interface
+
+    def showEvent(self, event: QShowEvent) -> None:
+        self.ensureInterface()
+        super().showEvent(event)
+
+
+__all__ = ["LazyInterface"]
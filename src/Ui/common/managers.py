@@ -4,6 +4,7 @@
 
 ## InfoBarManager 消息条位置管理器
     - InfoBarPosition 位置枚举
+    - StackedInfoBarManager 消息条堆叠布局引擎, 以下管理器的基类
     - TopLeftInfoBarManager 左上方位置
     - TopInfoBarManager 顶部位置
     - TopRightInfoBarManager 右上方位置
@@ -12,11 +13,14 @@
     - ButtonRightInfoBarManager 右下方位置
 """
 # 标准库导入
+import weakref
 from enum import Enum
+from collections import deque
+from dataclasses import field, dataclass
 
 # 第三方库导入
 from qfluentwidgets import InfoBar, InfoBarManager
-from PySide6.QtCore import QSize, QPoint
+from PySide6.QtCore import QSize, QEvent, QPoint, QObject
 
 
 class NCDInfoBarPosition(Enum):
@@ -31,13 +35,174 @@ class NCDInfoBarPosition(Enum):
     NONE = 6
 
 
-@InfoBarManager.register(NCDInfoBarPosition.TOP_LEFT)
-class TopLeftInfoBarManager(InfoBarManager):
-    """消息条左上方位置"""
+@dataclass(slots=True)
+class _InfoBarStack:
+    """同一父组件中消息条的布局缓存"""
+
+    index: dict[InfoBar, int] = field(default_factory=dict)  # 消息条 -> 在堆叠中的序号
+    heights: list[int] = field(default_factory=list)  # 各消息条加入时的高度
+    offsets: list[int] = field(default_factory=list)  # 各消息条相对于第一个消息条的累计偏移
+    keys: dict[tuple, InfoBar] = field(default_factory=dict)  # (图标, 标题, 内容) -> 显示中或排队中的消息条
+    # 消息条 -> 加入时的判重依据, 消息条的标题之后可能被修改, 移除时以此为准
+    bar_keys: dict[InfoBar, tuple] = field(default_factory=dict)
+    queue: deque[InfoBar] = field(default_factory=deque)  # 超出显示上限而排队的消息条
+
+
+class StackedInfoBarManager(InfoBarManager):
+    """
+    ## 消息条堆叠布局引擎
+        - 缓存每个父组件中消息条的累计偏移, 插入和移除时增量更新, 计算位置为 O(1)
+        - 与正在显示或排队的消息条重复的消息条不再显示
+        - 同时显示的消息条数量有上限, 其余的排队等待, 排队期间超过显示时间的消息条会被直接丢弃
+
+    子类只需要重写 `_anchor` 返回第一个消息条的位置, 并通过 `direction` 指定堆叠方向
+    """
+
+    # 堆叠方向, 1 为向下, -1 为向上
+    direction = 1
+    # 同时显示的消息条数量上限
+    max_visible = 5
+
+    def __init__(self) -> None:
+        super().__init__()
+        # InfoBarManager 为单例, 每次获取管理器都会调用构造函数
+        if not hasattr(self, "stacks"):
+            self.stacks: weakref.WeakKeyDictionary[QObject, _InfoBarStack] = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _key(info_bar: InfoBar) -> tuple:
+        """
+        ## 判断消息条是否重复的依据
+        """
+        return info_bar.icon, info_bar.title, info_bar.content
+
+    def add(self, info_bar: InfoBar) -> None:
+        """
+        ## 添加消息条, 重复的消息条会被关闭, 超出显示上限的消息条会排队
+        """
+        if not (parent := info_bar.parent()):
+            return
+        stack = self.stacks.setdefault(parent, _InfoBarStack())
+        if info_bar in stack.index:
+            return
+
+        key = self._key(info_bar)
+        if stack.keys.setdefault(key, info_bar) is not info_bar:
+            info_bar.hide()
+            info_bar.close()
+            return
+        stack.bar_keys[info_bar] = key
+
+        if len(stack.index) >= self.max_visible:
+            info_bar.hide()
+            stack.queue.append(info_bar)
+            info_bar.closedSignal.connect(lambda: self._dropQueued(parent, info_bar))
+            return
+
+        # 先登记偏移, 父类创建滑入动画时会调用 _pos
+        position = len(stack.index)
+        stack.offsets.append(stack.offsets[-1] + stack.heights[-1] + self.spacing if position else 0)
+        stack.heights.append(info_bar.height())
+        stack.index[info_bar] = position
+        super().add(info_bar)
+
+    def remove(self, info_bar: InfoBar) -> None:
+        """
+        ## 移除消息条, 只更新其后消息条的偏移, 然后显示排队中的消息条
+        """
+        parent = info_bar.parent()
+        if (stack := self.stacks.get(parent)) is None or (position := stack.index.pop(info_bar, None)) is None:
+            return
+
+        self._forgetKey(stack, info_bar)
+        delta = stack.heights.pop(position) + self.spacing
+        stack.offsets.pop(position)
+        for bar in self.infoBars[parent][position + 1 :]:
+            stack.index[bar] -= 1
+        for later in range(position, len(stack.offsets)):
+            stack.offsets[later] -= delta
+
+        super().remove(info_bar)
+        self._showQueued(parent, stack)
+
+    def _dropQueued(self, parent: QObject, info_bar: InfoBar) -> None:
+        """
+        ## 排队中的消息条被关闭 (如显示时间已到) 时移出队列
+        """
+        if (stack := self.stacks.get(parent)) is None or info_bar not in stack.queue:
+            return
+        stack.queue.remove(info_bar)
+        self._forgetKey(stack, info_bar)
+
+    @staticmethod
+    def _forgetKey(stack: _InfoBarStack, info_bar: InfoBar) -> None:
+        """
+        ## 移除消息条加入时登记的判重依据
+        """
+        key = stack.bar_keys.pop(info_bar, None)
+        if key is not None and stack.keys.get(key) is info_bar:
+            del stack.keys[key]
+
+    def _showQueued(self, parent: QObject, stack: _InfoBarStack) -> None:
+        """
+        ## 显示排队中的消息条直到达到显示上限
+        """
+        while stack.queue and len(stack.index) < self.max_visible:
+            info_bar = stack.queue.popleft()
+            # 显示时间从创建时开始计算, 重新显示时不再启动新的计时
+            info_bar.duration = -1
+            self._forgetKey(stack, info_bar)
+            info_bar.show()
+
+    def updateInfoBar(self, info_bar: InfoBar) -> None:
+        """
+        ## 消息条的内容被修改后更新其缓存的高度, 并移动受影响的消息条
+
+        ## 参数
+            - info_bar: 消息条实例, 需要已调整为新的大小
+        """
+        parent = info_bar.parent()
+        if (stack := self.stacks.get(parent)) is None or (position := stack.index.get(info_bar)) is None:
+            return
+        delta = info_bar.height() - stack.heights[position]
+        stack.heights[position] += delta
+        for later in range(position + 1, len(stack.offsets)):
+            stack.offsets[later] += delta
+
+        # 消息条自身的位置与其大小有关, 其后的消息条只在高度变化时需要移动
+        info_bar.move(self._pos(info_bar))
+        if delta:
+            for bar in self.infoBars[parent][position + 1 :]:
+                bar.move(self._pos(bar))
+
+    def _relayout(self, parent: QObject) -> None:
+        """
+        ## 父组件大小变化后消息条的高度可能改变, 重新计算全部偏移
+        """
+        if (stack := self.stacks.get(parent)) is None:
+            return
+        offset = 0
+        for position, bar in enumerate(self.infoBars.get(parent, ())):
+            stack.heights[position] = bar.height()
+            stack.offsets[position] = offset
+            offset += bar.height() + self.spacing
+
+    def _anchor(self, info_bar: InfoBar, parent_size: QSize) -> QPoint:
+        """
+        ## 第一个消息条的位置, 默认为父组件的左上角, 各位置的管理器会重写
+
+        ## 参数
+            - info_bar: 消息条实例
+            - parent_size: 消息条父类大小
+
+        ## 返回
+            - QPoint: 位置信息
+        """
+        return QPoint(self.margin, self.margin)
 
     def _pos(self, info_bar: InfoBar, parent_size: QSize = None) -> QPoint:
         """
-        ## 调整消息条位置
+        ## 调整消息条位置, 在第一个消息条的位置上加上缓存的累计偏移
 
         ## 参数
             - info_bar: 消息条实例
@@ -46,20 +211,35 @@ class TopLeftInfoBarManager(InfoBarManager):
         ## 返回
             - QPoint: 位置信息
         """
-        # 获取父类以及父类大小
         parent = info_bar.parent()
+        anchor = self._anchor(info_bar, parent_size or parent.size())
+        stack = self.stacks.get(parent)
+        if stack is None or (position := stack.index.get(info_bar)) is None:
+            return anchor
+        return QPoint(anchor.x(), anchor.y() + self.direction * stack.offsets[position])
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        if obj in self.infoBars and event.type() in [QEvent.Type.Resize, QEvent.Type.WindowStateChange]:
+            self._relayout(obj)
+        return super().eventFilter(obj, event)
 
-        # 计算 InfoBar 的 x 以及 y 的位置
-        x = self.margin + 64
-        y = self.margin + 42
 
-        # 对于每个先前的信息栏，加上它们的高度和间距累加到 y
-        # 这样可以确保每个信息栏都位于前一个信息栏的正下方，并保持一致的间隔
-        for bar in self.infoBars[parent][0 : self.infoBars[parent].index(info_bar)]:
-            y += bar.height() + self.spacing
+@InfoBarManager.register(NCDInfoBarPosition.TOP_LEFT)
+class TopLeftInfoBarManager(StackedInfoBarManager):
+    """消息条左上方位置"""
 
-        # 返回位置信息
-        return QPoint(x, y)
+    def _anchor(self, info_bar: InfoBar, parent_size: QSize) -> QPoint:
+        """
+        ## 第一个消息条的位置
+
+        ## 参数
+            - info_bar: 消息条实例
+            - parent_size: 消息条父类大小
+
+        ## 返回
+            - QPoint: 位置信息
+        """
+        return QPoint(self.margin + 64, self.margin + 42)
 
     def _slideStartPos(self, info_bar: InfoBar) -> QPoint:
         """
@@ -75,12 +255,12 @@ class TopLeftInfoBarManager(InfoBarManager):
 
 
 @InfoBarManager.register(NCDInfoBarPosition.TOP)
-class TopInfoBarManager(InfoBarManager):
+class TopInfoBarManager(StackedInfoBarManager):
     """消息条顶部位置"""
 
-    def _pos(self, info_bar: InfoBar, parent_size: QSize = None) -> QPoint:
+    def _anchor(self, info_bar: InfoBar, parent_size: QSize) -> QPoint:
         """
-        ## 调整消息条位置
+        ## 第一个消息条的位置
 
         ## 参数
             - info_bar: 消息条实例
@@ -89,20 +269,7 @@ class TopInfoBarManager(InfoBarManager):
         ## 返回
             - QPoint: 位置信息
         """
-        # 获取父类以及父类大小
-        parent = info_bar.parent()
-
-        # 计算 InfoBar 的 x 以及 y 的位置
-        x = (info_bar.parent().width() - info_bar.width() + 40) // 2
-        y = self.margin + 42
-
-        # 对于每个先前的信息栏，加上它们的高度和间距累加到 y
-        # 这样可以确保每个信息栏都位于前一个信息栏的正下方，并保持一致的间隔
-        for bar in self.infoBars[parent][0 : self.infoBars[parent].index(info_bar)]:
-            y += bar.height() + self.spacing
-
-        # 返回位置信息
-        return QPoint(x, y)
+        return QPoint((parent_size.width() - info_bar.width() + 40) // 2, self.margin + 42)
 
     def _slideStartPos(self, info_bar: InfoBar) -> QPoint:
         pos = self._pos(info_bar)
@@ -110,12 +277,12 @@ class TopInfoBarManager(InfoBarManager):
 
 
 @InfoBarManager.register(NCDInfoBarPosition.TOP_RIGHT)
-class TopRightInfoBarManager(InfoBarManager):
+class TopRightInfoBarManager(StackedInfoBarManager):
     """消息条右上方位置"""
 
-    def _pos(self, info_bar: InfoBar, parent_size: QSize = None) -> QPoint:
+    def _anchor(self, info_bar: InfoBar, parent_size: QSize) -> QPoint:
         """
-        ## 调整消息条位置
+        ## 第一个消息条的位置
 
         ## 参数
             - info_bar: 消息条实例
@@ -124,21 +291,7 @@ class TopRightInfoBarManager(InfoBarManager):
         ## 返回
             - QPoint: 位置信息
         """
-        # 获取父类以及父类大小
-        parent = info_bar.parent()
-        parent_size = parent_size or parent.size()
-
-        # 计算 InfoBar 的 x 以及 y 的位置
-        x = parent_size.width() - info_bar.width() - self.margin
-        y = self.margin + 42
-
-        # 对于每个先前的信息栏，加上它们的高度和间距累加到 y。
-        # 这样可以确保每个信息栏都位于前一个信息栏的正下方，并保持一致的间隔
-        for bar in self.infoBars[parent][0 : self.infoBars[parent].index(info_bar)]:
-            y += bar.height() + self.spacing
-
-        # 返回位置信息
-        return QPoint(x, y)
+        return QPoint(parent_size.width() - info_bar.width() - self.margin, self.margin + 42)
 
     def _slideStartPos(self, info_bar: InfoBar) -> QPoint:
         """
@@ -154,12 +307,15 @@ class TopRightInfoBarManager(InfoBarManager):
 
 
 @InfoBarManager.register(NCDInfoBarPosition.BOTTOM_LEFT)
-class ButtonLeftInfoBarManager(InfoBarManager):
+class ButtonLeftInfoBarManager(StackedInfoBarManager):
     """消息条左下方位置"""
 
-    def _pos(self, info_bar: InfoBar, parent_size: QSize = None) -> QPoint:
+    # 向上堆叠
+    direction = -1
+
+    def _anchor(self, info_bar: InfoBar, parent_size: QSize) -> QPoint:
         """
-        ## 调整消息条位置
+        ## 第一个消息条的位置
 
         ## 参数
             - info_bar: 消息条实例
@@ -168,21 +324,7 @@ class ButtonLeftInfoBarManager(InfoBarManager):
         ## 返回
             - QPoint: 位置信息
         """
-        # 获取父类以及父类大小
-        parent = info_bar.parent()
-        parent_size = parent_size or parent.size()
-
-        # 计算 InfoBar 的 x 以及 y 的位置
-        x = self.margin + 64
-        y = parent_size.height() - info_bar.height() - self.margin
-
-        # 对于每个先前的信息栏，加上它们的高度和间距累加到 y
-        # 这样可以确保每个信息栏都位于前一个信息栏的正下方，并保持一致的间隔
-        for bar in self.infoBars[parent][0 : self.infoBars[parent].index(info_bar)]:
-            y -= bar.height() + self.spacing
-
-        # 返回位置信息
-        return QPoint(x, y)
+        return QPoint(self.margin + 64, parent_size.height() - info_bar.height() - self.margin)
 
     def _slideStartPos(self, info_bar: InfoBar) -> QPoint:
         """
@@ -198,12 +340,15 @@ class ButtonLeftInfoBarManager(InfoBarManager):
 
 
 @InfoBarManager.register(NCDInfoBarPosition.BOTTOM)
-class ButtonInfoBarManager(InfoBarManager):
+class ButtonInfoBarManager(StackedInfoBarManager):
     """消息条下方位置"""
 
-    def _pos(self, info_bar: InfoBar, parent_size: QSize = None) -> QPoint:
+    # 向上堆叠
+    direction = -1
+
+    def _anchor(self, info_bar: InfoBar, parent_size: QSize) -> QPoint:
         """
-        ## 调整消息条位置
+        ## 第一个消息条的位置
 
         ## 参数
             - info_bar: 消息条实例
@@ -212,21 +357,9 @@ class ButtonInfoBarManager(InfoBarManager):
         ## 返回
             - QPoint: 位置信息
         """
-        # 获取父类以及父类大小
-        parent = info_bar.parent()
-        parent_size = parent_size or parent.size()
-
-        # 计算 InfoBar 的 x 以及 y 的位置
-        x = (parent_size.width() - info_bar.width() + 40) // 2
-        y = parent_size.height() - info_bar.height() - self.margin
-
-        # 对于每个先前的信息栏，加上它们的高度和间距累加到 y
-        # 这样可以确保每个信息栏都位于前一个信息栏的正下方，并保持一致的间隔
-        for bar in self.infoBars[parent][0 : self.infoBars[parent].index(info_bar)]:
-            y -= bar.height() + self.spacing
-
-        # 返回位置信息
-        return QPoint(x, y)
+        return QPoint(
+            (parent_size.width() - info_bar.width() + 40) // 2, parent_size.height() - info_bar.height() - self.margin
+        )
 
     def _slideStartPos(self, info_bar: InfoBar) -> QPoint:
         """
@@ -243,12 +376,15 @@ class ButtonInfoBarManager(InfoBarManager):
 
 
 @InfoBarManager.register(NCDInfoBarPosition.BOTTOM_RIGHT)
-class ButtonRightInfoBarManager(InfoBarManager):
+class ButtonRightInfoBarManager(StackedInfoBarManager):
     """消息条右下方位置"""
 
-    def _pos(self, info_bar: InfoBar, parent_size: QSize = None) -> QPoint:
+    # 向上堆叠
+    direction = -1
+
+    def _anchor(self, info_bar: InfoBar, parent_size: QSize) -> QPoint:
         """
-        ## 调整消息条位置
+        ## 第一个消息条的位置
 
         ## 参数
             - info_bar: 消息条实例
@@ -257,21 +393,9 @@ class ButtonRightInfoBarManager(InfoBarManager):
         ## 返回
             - QPoint: 位置信息
         """
-        # 获取父类以及父类大小
-        parent = info_bar.parent()
-        parent_size = parent_size or parent.size()
-
-        # 计算 InfoBar 的 x 以及 y 的位置
-        x = parent_size.width() - info_bar.width() - self.margin
-        y = parent_size.height() - info_bar.height() - self.margin
-
-        # 对于每个先前的信息栏，加上它们的高度和间距累加到 y
-        # 这样可以确保每个信息栏都位于前一个信息栏的正下方，并保持一致的间隔
-        for bar in self.infoBars[parent][0 : self.infoBars[parent].index(info_bar)]:
-            y -= bar.height() + self.spacing
-
-        # 返回位置信息
-        return QPoint(x, y)
+        return QPoint(
+            parent_size.width() - info_bar.width() - self.margin, parent_size.height() - info_bar.height() - self.margin
+        )
 
     def _slideStartPos(self, info_bar: InfoBar) -> QPoint:
         """
@@ -288,6 +412,7 @@ class ButtonRightInfoBarManager(InfoBarManager):
 
 __all__ = [
     "NCDInfoBarPosition",
+    "StackedInfoBarManager",
     "TopLeftInfoBarManager",
     "TopInfoBarManager",
     "TopRightInfoBarManager",
@@ -1,6 +1,12 @@
 # -*- coding: utf-8 -*-
 
-from PySide6.QtWidgets import QWidget
+# 第三方库导入
+from qfluentwidgets import ComboBox, BodyLabel
+from PySide6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout
+
+# 项目内模块导入
+from src.core.process.metrics import Metric, metricsStore
+from src.ui.home_page.metric_chart import MetricChart
 
 
 class HomePage(QWidget):
@@ -10,8 +16,88 @@ class HomePage(QWidget):
         """构造函数"""
         super().__init__(parent)
 
+        # 创建控件
+        self.instanceLabel = BodyLabel(self.tr("实例"), self)
+        self.instanceComboBox = ComboBox(self)
+        self.resolutionLabel = BodyLabel(self.tr("精度"), self)
+        self.resolutionComboBox = ComboBox(self)
+        self.cpuChart = MetricChart(
+            self.tr("CPU"), Metric.CPU, lambda value: f"{value:.1f}%", metricsStore, minimum_scale=100, parent=self
+        )
+        self.memoryChart = MetricChart(
+            self.tr("内存"),
+            Metric.MEMORY,
+            lambda value: f"{value / 1024 ** 2:.0f} MB",
+            metricsStore,
+            minimum_scale=256 * 1024**2,
+            unit=1024**2,
+            parent=self,
+        )
+        self.throughputChart = MetricChart(
+            self.tr("消息吞吐量"),
+            Metric.THROUGHPUT,
+            lambda value: self.tr("{0:.1f} 行/秒").format(value),
+            metricsStore,
+            minimum_scale=10,
+            parent=self,
+        )
+        self.charts = [self.cpuChart, self.memoryChart, self.throughputChart]
+
+        # 设置控件
+        for resolution, text in ((1, self.tr("1 秒")), (10, self.tr("10 秒")), (60, self.tr("1 分钟"))):
+            self.resolutionComboBox.addItem(text, userData=resolution)
+        self.instanceComboBox.setMinimumWidth(200)
+        self.instanceComboBox.setPlaceholderText(self.tr("暂无运行中的实例"))
+
+        # 设置布局
+        self.toolBarLayout = QHBoxLayout()
+        self.toolBarLayout.addWidget(self.instanceLabel)
+        self.toolBarLayout.addWidget(self.instanceComboBox)
+        self.toolBarLayout.addSpacing(16)
+        self.toolBarLayout.addWidget(self.resolutionLabel)
+        self.toolBarLayout.addWidget(self.resolutionComboBox)
+        self.toolBarLayout.addStretch(1)
+
+        self.vBoxLayout = QVBoxLayout(self)
+        self.vBoxLayout.setContentsMargins(24, 24, 24, 24)
+        self.vBoxLayout.setSpacing(12)
+        self.vBoxLayout.addLayout(self.toolBarLayout)
+        for chart in self.charts:
+            self.vBoxLayout.addWidget(chart, 1)
+
         # 设置属性
         self.setObjectName("HomePage")
 
+        # 连接信号
+        self.instanceComboBox.currentTextChanged.connect(self._onInstanceChanged)
+        self.resolutionComboBox.currentIndexChanged.connect(self._onResolutionChanged)
+        metricsStore.instancesChanged.connect(self._updateInstances)
+        self._updateInstances()
+
+    def _updateInstances(self) -> None:
+        """
+        ## 实例增减后更新下拉框, 尽量保持当前选择
+        """
+        current = self.instanceComboBox.currentText()
+        instances = metricsStore.instances
+        self.instanceComboBox.blockSignals(True)
+        self.instanceComboBox.clear()
+        self.instanceComboBox.addItems(instances)
+        self.instanceComboBox.blockSignals(False)
+
+        if current in instances:
+            self.instanceComboBox.setCurrentText(current)
+        elif instances:
+            self.instanceComboBox.setCurrentIndex(0)
+        self._onInstanceChanged(self.instanceComboBox.currentText())
+
+    def _onInstanceChanged(self, name: str) -> None:
+        for chart in self.charts:
+            chart.setInstance(name or None)
+
+    def _onResolutionChanged(self, index: int) -> None:
+        for chart in self.charts:
+            chart.setResolution(self.resolutionComboBox.itemData(index))
+
 
 __all__ = ["HomePage"]
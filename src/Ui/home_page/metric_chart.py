@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+## 指标折线图
+    每个数据点占固定宽度, 新增数据点时用 `QWidget.scroll` 平移已绘制的像素,
+    只重绘新露出的一列与标题栏, 而不是整个图表
+"""
+
+# 标准库导入
+from typing import Callable
+
+# 第三方库导入
+from qfluentwidgets import qconfig, themeColor, isDarkTheme
+from PySide6.QtGui import QPen, QColor, QPainter, QPolygonF, QPaintEvent
+from PySide6.QtCore import Qt, QRect, QPointF
+from PySide6.QtWidgets import QWidget
+
+# 项目内模块导入
+from src.core.process.metrics import Metric, RingBuffer, MetricsStore
+
+
+class MetricChart(QWidget):
+    """单个实例单个指标的折线图"""
+
+    # 每个数据点占用的像素宽度
+    step = 2
+    # 标题栏高度
+    header_height = 28
+    margin = 8
+
+    def __init__(
+        self,
+        title: str,
+        metric: Metric,
+        formatter: Callable[[float], str],
+        store: MetricsStore,
+        minimum_scale: float = 1.0,
+        unit: float = 1.0,
+        parent: QWidget | None = None,
+    ) -> None:
+        """
+        ## 初始化图表
+
+        ## 参数
+            - title: str - 图表标题
+            - metric: Metric - 显示的指标
+            - formatter: Callable[[float], str] - 数值的显示格式
+            - store: MetricsStore - 指标数据来源
+            - minimum_scale: float - 纵轴的最小上限
+            - unit: float - 显示单位, 纵轴上限取该单位的整数倍, 如内存为 1 MB
+            - parent: QWidget | None - 父组件
+        """
+        super().__init__(parent)
+        self.title = title
+        self.metric_kind = metric
+        self.formatter = formatter
+        self.store = store
+        self.minimum_scale = minimum_scale
+        self.unit = unit
+
+        self.instance: str | None = None
+        self.resolution = 1
+        self.scale = minimum_scale
+
+        # 每次绘制都会填充背景, scroll 可以直接平移已绘制的像素
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self.setMinimumHeight(140)
+
+        store.pointAdded.connect(self._onPointAdded)
+        qconfig.themeChanged.connect(self.update)
+
+    def setInstance(self, name: str | None) -> None:
+        """
+        ## 切换显示的实例
+        """
+        self.instance = name
+        self._refresh()
+
+    def setResolution(self, resolution: int) -> None:
+        """
+        ## 切换显示的精度 (秒)
+        """
+        self.resolution = resolution
+        self._refresh()
+
+    def _ring(self) -> RingBuffer | None:
+        """
+        ## 当前显示的时间序列, 没有数据时返回 None
+        """
+        if self.instance is None or (series := self.store.get(self.instance, self.metric_kind)) is None:
+            return None
+        return series.rings[self.resolution]
+
+    def _headerRect(self) -> QRect:
+        return QRect(0, 0, self.width(), self.header_height)
+
+    def _plotRect(self) -> QRect:
+        return self.rect().adjusted(self.margin, self.header_height, -self.margin, -self.margin)
+
+    def _visibleCount(self) -> int:
+        """
+        ## 绘图区域可以容纳的数据点数量
+        """
+        return self._plotRect().width() // self.step + 1
+
+    @staticmethod
+    def _niceScale(value: float) -> float:
+        """
+        ## 不小于 value 的 1 / 2 / 5 × 10^n
+        """
+        magnitude = 1.0
+        while magnitude * 10 <= value:
+            magnitude *= 10
+        while magnitude > value * 10:
+            magnitude /= 10
+        return next(factor * magnitude for factor in (1, 2, 5, 10) if factor * magnitude >= value)
+
+    def _refresh(self) -> None:
+        """
+        ## 按可见的数据重新计算纵轴上限并重绘整个图表
+        """
+        ring = self._ring()
+        peak = max(ring.tail(self._visibleCount()), default=0.0) if ring is not None else 0.0
+        # 留出余量, 避免折线贴着顶部
+        self.scale = self._niceScale(max(peak * 1.2, self.minimum_scale) / self.unit) * self.unit
+        self.update()
+
+    def _onPointAdded(self, name: str, metric: str, resolution: int, appended: bool) -> None:
+        """
+        ## 新增数据点时平移图像并只重绘最右侧, 超出纵轴上限时重绘整个图表
+        """
+        if name != self.instance or metric != self.metric_kind.value or resolution != self.resolution:
+            return
+        if (ring := self._ring()) is None or (value := ring.last()) is None:
+            return
+        if value > self.scale:
+            self._refresh()
+            return
+
+        plot = self._plotRect()
+        if appended:
+            self.scroll(-self.step, 0, plot)
+        # 最新的线段可能已被修改, 留出抗锯齿的余量
+        self.update(QRect(plot.right() - 2 * self.step - 2, plot.top(), 2 * self.step + 3, plot.height() + 1))
+        # 数值显示在标题栏右半部分
+        header = self._headerRect()
+        self.update(header.adjusted(header.width() // 2, 0, 0, 0))
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self._refresh()
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        dark = isDarkTheme()
+        ring = self._ring()
+        text_color = QColor(255, 255, 255) if dark else QColor(0, 0, 0)
+
+        # 标题栏与绘图区域右侧的更新会合并为一个区域, 分别绘制其中的每个矩形, 避免重绘两者之间的部分
+        plot = self._plotRect()
+        for dirty in event.region():
+            painter.fillRect(dirty, QColor(39, 39, 39) if dark else QColor(249, 249, 249))
+            if (area := dirty & plot).isValid():
+                self._paintPlot(painter, area, plot, ring, dark, text_color)
+
+        header = self._headerRect()
+        if event.region().intersects(header):
+            painter.setClipRect(header)
+            painter.setPen(text_color)
+            text_rect = header.adjusted(self.margin, 0, -self.margin, 0)
+            painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, self.title)
+            if ring is not None and (value := ring.last()) is not None:
+                painter.drawText(
+                    text_rect,
+                    Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                    f"{self.formatter(value)} / {self.formatter(self.scale)}",
+                )
+
+    def _paintPlot(
+        self, painter: QPainter, area: QRect, plot: QRect, ring: RingBuffer | None, dark: bool, text_color: QColor
+    ) -> None:
+        """
+        ## 绘制绘图区域中 area 内的部分
+        """
+        painter.setClipRect(area)
+
+        # 网格线
+        painter.setPen(QPen(QColor(255, 255, 255, 21) if dark else QColor(0, 0, 0, 15), 1))
+        for quarter in range(5):
+            y = plot.top() + plot.height() * quarter / 4
+            painter.drawLine(QPointF(area.left(), y), QPointF(area.right() + 1, y))
+
+        if ring is None or not len(ring):
+            if area == plot:
+                painter.setPen(text_color)
+                painter.drawText(plot, Qt.AlignmentFlag.AlignCenter, self.tr("暂无数据"))
+            return
+
+        # 只取与 area 相交的数据点 (前后各多取一个以连接线段)
+        values = ring.tail(self._visibleCount())
+        last = len(values) - 1
+        first_index = max(0, last - (plot.right() - area.left()) // self.step - 1)
+        last_index = min(last, last - (plot.right() - area.right()) // self.step + 1)
+        height = plot.height()
+        polygon = QPolygonF(
+            [
+                QPointF(plot.right() - (last - index) * self.step, plot.bottom() - values[index] / self.scale * height)
+                for index in range(first_index, last_index + 1)
+            ]
+        )
+        painter.setPen(QPen(themeColor(), 1.5))
+        painter.drawPolyline(polygon)
+
+
+__all__ = ["MetricChart"]
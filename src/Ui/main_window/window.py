@@ -1,19 +1,25 @@
 # -*- coding: utf-8 -*-
+# 标准库导入
+from typing import Callable
+
 # 第三方库导入
 from qfluentwidgets import FluentIcon as FIcon
 from qfluentwidgets import SplashScreen, MSFluentWindow
 from qfluentwidgets.window.fluent_window import NavigationItemPosition
-from PySide6.QtCore import QSize
-from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QSize, QTimer
+from PySide6.QtWidgets import QWidget, QApplication
 
 # 项目内模块导入
 from src.ui.icon import NCDIcon
+from src.core.config import cfg
 from src.ui.resource import resource
-from src.ui.home_page import HomePage
 from src.core.utils.path import PathFunc
-from src.ui.settings_page import SettingsPage
+from src.core.utils.logger import logger
+from src.core.utils.startup import startupProfiler
 from src.core.utils.singleton import singleton
+from src.ui.common.lazy_interface import LazyInterface
 from src.ui.main_window.title_bar import NCDTitleBar
+from src.core.config.config_watcher import ConfigFileWatcher
 
 if False:
     # 使用无法到达的if, 引用 resource 模块保证不会被 autoflake 删除
@@ -29,13 +35,25 @@ class MainWindow(MSFluentWindow):
         """构造函数"""
         super().__init__()
         # 执行路径验证
-        PathFunc().path_validator()
+        with startupProfiler.phase("validate paths"):
+            PathFunc().path_validator()
         # 调用方法
-        self.setWindow()
-        self.setItem()
+        with startupProfiler.phase("show splash screen"):
+            self.setWindow()
+        with startupProfiler.phase("register pages"):
+            self.setItem()
         self._connectSignalToSlot()
-        # 组件加载完成结束 SplashScreen
+        # 只创建第一个可见的页面, 完成后即结束 SplashScreen
+        with startupProfiler.phase("create first page"):
+            self.stackedWidget.currentWidget().ensureInterface()
         self.splashScreen.finish()
+        # 其余页面在空闲时逐个预先创建
+        QTimer.singleShot(0, self._prewarmInterfaces)
+        # 窗体显示后再在后台清理日志目录, 不占用启动时间
+        QTimer.singleShot(0, logger.sweepLogFiles)
+        # 监视配置文件在外部的修改
+        self.configWatcher = ConfigFileWatcher(cfg, self)
+        self.configWatcher.start()
 
     def setWindow(self) -> None:
         """设置窗体"""
@@ -66,20 +84,71 @@ class MainWindow(MSFluentWindow):
     def setItem(self) -> None:
         """设置侧边栏"""
 
-        self.addSubInterface(
-            interface=HomePage(),
+        self.addLazySubInterface(
+            object_name="HomePage",
+            factory=self._createHomePage,
             icon=FIcon.HOME,
             text=self.tr("主页"),
             position=NavigationItemPosition.TOP,
         )
 
-        self.addSubInterface(
-            interface=SettingsPage(),
+        self.addLazySubInterface(
+            object_name="SettingsPage",
+            factory=self._createSettingsPage,
             icon=FIcon.SETTING,
             text=self.tr("设置"),
             position=NavigationItemPosition.BOTTOM,
         )
 
+    def addLazySubInterface(
+        self,
+        object_name: str,
+        factory: Callable[[], QWidget],
+        icon: FIcon,
+        text: str,
+        position: NavigationItemPosition = NavigationItemPosition.TOP,
+    ) -> LazyInterface:
+        """
+        ## 添加延迟创建的页面, 页面在第一次显示或空闲预创建时才会被构造
+
+        ## 参数
+            - object_name: 页面的 objectName
+            - factory: 创建页面的工厂函数
+            - icon: 导航项图标
+            - text: 导航项文本
+            - position: 导航项位置
+        """
+        interface = LazyInterface(object_name, factory, self)
+        self.addSubInterface(interface=interface, icon=icon, text=text, position=position)
+        return interface
+
+    def _prewarmInterfaces(self) -> None:
+        """
+        ## 每次空闲时创建一个尚未创建的页面, 避免长时间阻塞事件循环
+        """
+        for index in range(self.stackedWidget.count()):
+            interface = self.stackedWidget.widget(index)
+            if isinstance(interface, LazyInterface) and not interface.isCreated():
+                interface.ensureInterface()
+                QTimer.singleShot(0, self._prewarmInterfaces)
+                return
+
+    @staticmethod
+    def _createHomePage() -> QWidget:
+        """创建主页"""
+        # 项目内模块导入
+        from src.ui.home_page import HomePage
+
+        return HomePage()
+
+    @staticmethod
+    def _createSettingsPage() -> QWidget:
+        """创建设置页面"""
+        # 项目内模块导入
+        from src.ui.settings_page import SettingsPage
+
+        return SettingsPage()
+
     def _connectSignalToSlot(self): ...
 
 
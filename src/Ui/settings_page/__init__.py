@@ -20,6 +20,7 @@ from src.core.config import cfg
 from src.core.utils.file import JsonFunc
 from src.ui.common.info_bar import info_bar, error_bar, success_bar
 from src.ui.common.file_dialog import getFilePath, saveFilePath
+from src.ui.common.lazy_interface import LazyInterface
 from src.ui.settings_page.general import General
 from src.ui.settings_page.separator import Separator
 from src.ui.settings_page.personalized import Personalized
@@ -59,8 +60,9 @@ class SettingsPage(QWidget):
         self.setObjectName("SettingsPage")
         setFont(self.titleLabel, 32, QFont.Weight.DemiBold)
 
-        self.view.addWidget(Personalized(self.view))
-        self.view.addWidget(General(self.view))
+        # 子页面在第一次切换到时才创建
+        self.view.addWidget(LazyInterface("settings_pivot_personalized", Personalized, self.view))
+        self.view.addWidget(LazyInterface("settings_pivot_general", General, self.view))
         self.view.setCurrentIndex(0)
 
         # 设置提示
@@ -149,13 +151,16 @@ class SettingsPage(QWidget):
             info_bar(self.tr("未选择路径, 操作取消!"))
             return
 
+        # 导入的配置直接写入文件, 放弃尚未写入的旧配置以免覆盖
+        cfg.discardPendingSave()
         if JsonFunc().dict2json(JsonFunc().json2dict(file_path), cfg.file):
             success_bar(self.tr("导入成功! 重启程序生效"))
         else:
             error_bar(self.tr("导入失败!"))
 
     def _onClearConfig(self):
-        cfg.file.unlink()
+        cfg.discardPendingSave()
+        cfg.file.unlink(missing_ok=True)
         success_bar(self.tr("清除成功! 重启程序生效"))
 
 
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+## 测试公共夹具
+    测试在 `QT_QPA_PLATFORM=offscreen` 下运行, 需要事件循环的测试通过 `wait` 夹具驱动 Qt 事件
+
+    运行: pdm run test (或 python -m pytest tests)
+"""
+
+# 标准库导入
+import os
+import sys
+import time
+from typing import Callable
+from pathlib import Path
+
+# 第三方库导入
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).absolute().parents[1]))
+
+from PySide6.QtCore import QCoreApplication
+from PySide6.QtWidgets import QApplication
+
+
+@pytest.fixture(scope="session")
+def qapp() -> QCoreApplication:
+    """
+    ## 整个测试会话共用的 QApplication
+    """
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def wait(qapp: QCoreApplication) -> Callable[[Callable[[], bool], float], bool]:
+    """
+    ## 处理 Qt 事件直到条件成立或超时
+
+    ## 返回
+        - Callable: wait(predicate, timeout=10.0) -> 条件是否在超时前成立
+    """
+
+    def waitUntil(predicate: Callable[[], bool], timeout: float = 10.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            if time.monotonic() > deadline:
+                return False
+            qapp.processEvents()
+            time.sleep(0.01)
+        return True
+
+    return waitUntil
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""
+## HttpClientService 的测试
+    协程在调用者连接信号之前就已结束时, 结果仍然要送达
+"""
+
+# 项目内模块导入
+from src.core.network.http_client import NetworkTask, HttpClientService
+
+
+async def answer() -> int:
+    return 42
+
+
+async def fail() -> int:
+    raise ValueError("boom")
+
+
+def test_result_delivered_after_connect(qapp, wait) -> None:
+    task = HttpClientService().run(answer())
+    # 协程已结束, 但调用者还没有连接信号
+    task.future.result(5)
+
+    results = []
+    task.succeeded.connect(results.append)
+    assert wait(lambda: results == [42])
+    assert task not in NetworkTask._pending
+
+
+def test_failure_delivered_after_connect(qapp, wait) -> None:
+    task = HttpClientService().run(fail())
+    task.future.exception(5)
+
+    errors = []
+    task.failed.connect(errors.append)
+    assert wait(lambda: len(errors) == 1)
+    assert isinstance(errors[0], ValueError)
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+## 运行指标的测试
+    环形缓冲区的覆盖与读取、各精度的汇总, 以及实例移除后指标被丢弃
+"""
+
+# 标准库导入
+import sys
+from pathlib import Path
+
+# 项目内模块导入
+from src.core.process import InstanceSpec, ResourceSample, ProcessSupervisor
+from src.core.process.metrics import Metric, RingBuffer, MetricSeries, MetricsStore
+
+
+def test_ring_buffer_wraps_around() -> None:
+    ring = RingBuffer(4)
+    assert ring.last() is None and list(ring.tail(3)) == []
+
+    for index in range(6):
+        ring.append(index, float(index))
+
+    # 写满后覆盖最旧的数据点, tail 按时间顺序返回并跨越缓冲区末尾
+    assert len(ring) == 4
+    assert list(ring.tail(10)) == [2.0, 3.0, 4.0, 5.0]
+    assert list(ring.tail(3)) == [3.0, 4.0, 5.0]
+    assert ring.last() == 5.0
+
+    ring.replaceLast(9.0)
+    assert list(ring.tail(2)) == [4.0, 9.0]
+
+
+def test_series_averages_within_bucket() -> None:
+    series = MetricSeries()
+
+    assert series.add(100.0, 10.0) == {1: True, 10: True, 60: True}
+    # 同一秒内的观测值取平均, 只修改最新数据点
+    assert series.add(100.5, 20.0) == {1: False, 10: False, 60: False}
+    assert series.rings[1].last() == 15.0
+
+    # 进入下一秒: 1 秒精度新增数据点, 10 秒与 1 分钟精度继续平均
+    assert series.add(101.0, 30.0) == {1: True, 10: False, 60: False}
+    assert list(series.rings[1].tail(2)) == [15.0, 30.0]
+    assert series.rings[10].last() == 20.0
+    assert len(series.rings[60]) == 1 and series.rings[60].times[0] == 60.0
+
+
+def test_store_drops_removed_instance(qapp, tmp_path: Path) -> None:
+    supervisor = ProcessSupervisor(log_dir=tmp_path)
+    store = MetricsStore()
+    store.attach(supervisor)
+    changes = []
+    store.instancesChanged.connect(lambda: changes.append(store.instances))
+
+    supervisor.addInstance(InstanceSpec("bot", [sys.executable, "-c", "pass"], cwd=tmp_path))
+    supervisor.resourcesSampled.emit({"bot": ResourceSample(1, 5.0, 1024, 2, 1, 1, 100.0)})
+    assert store.instances == ["bot"] and store.get("bot", Metric.MEMORY) is not None
+
+    # 移除实例后图表不再显示它
+    supervisor.removeInstance("bot")
+    assert store.instances == [] and store.get("bot", Metric.MEMORY) is None
+    assert changes == [["bot"], []]
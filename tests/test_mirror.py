@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+## 镜像测速的测试
+    用 http.server 在本机模拟多个镜像: 路径的第一段决定镜像的行为 (快 / 慢 / 出错 / 不支持 Range)
+"""
+
+# 标准库导入
+import time
+import asyncio
+import threading
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# 第三方库导入
+import httpx
+import pytest
+
+# 项目内模块导入
+from src.core.network import mirror as mirror_module
+from src.core.network.mirror import MirrorRacer, MirrorScoreBoard, mirrorUrl, resolveDownloadUrl
+
+GITHUB_URL = "https://github.com/NapNeko/NapCatQQ/releases/latest/download/NapCat.Shell.zip"
+DATA = bytes(range(256)) * 1024  # 256 KiB
+
+# 各镜像返回响应前等待的秒数
+DELAYS = {"fast": 0.0, "slow": 1.0, "norange": 0.0}
+
+
+class _MirrorHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        kind = self.path.strip("/").split("/", 1)[0]
+        if kind == "dead":
+            self.send_response(502)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        time.sleep(DELAYS.get(kind, 0.0))
+        body = DATA
+        if (ranges := self.headers.get("Range")) and kind != "norange":
+            start, end = (int(value) for value in ranges.removeprefix("bytes=").split("-"))
+            body = DATA[start : end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(DATA)}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _MirrorHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def mirrors(server: str, monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    sites = [f"{server}/{kind}" for kind in ("slow", "dead", "fast")]
+    monkeypatch.setattr(mirror_module, "mirrorSites", lambda: sites)
+    return sites
+
+
+async def race(racer: MirrorRacer):
+    async with httpx.AsyncClient() as client:
+        return await racer.race(GITHUB_URL, client)
+
+
+def test_fastest_mirror_wins(mirrors: list[str], tmp_path: Path) -> None:
+    slow, dead, fast = mirrors
+    board = MirrorScoreBoard(tmp_path / "scores.json")
+    winner = asyncio.run(race(MirrorRacer(board, probe_bytes=16 * 1024)))
+
+    assert winner is not None and winner.mirror == fast
+    assert winner.url == mirrorUrl(fast, GITHUB_URL)
+    assert board.scores[dead].failure_rate == 1.0
+
+    # 被取消的慢镜像不算失败, 但代价高于胜出者
+    now = time.time()
+    assert board.scores[slow].failure_rate == 0.0
+    assert board.scores[slow].cost(now, board.half_life) > board.scores[fast].cost(now, board.half_life)
+    assert board.rank(mirrors) == [fast, slow, dead]
+
+    # 评分被持久化
+    assert MirrorScoreBoard(tmp_path / "scores.json").rank(mirrors) == [fast, slow, dead]
+
+
+def test_probe_stops_without_range_support(server: str, tmp_path: Path) -> None:
+    racer = MirrorRacer(MirrorScoreBoard(tmp_path / "scores.json"), probe_bytes=16 * 1024)
+
+    async def probe():
+        async with httpx.AsyncClient() as client:
+            return await racer.probe(client, f"{server}/norange", GITHUB_URL)
+
+    result = asyncio.run(probe())
+    assert result.ok and result.throughput > 0
+
+
+def test_resolve_uses_fresh_scores(mirrors: list[str], tmp_path: Path) -> None:
+    slow, dead, fast = mirrors
+    racer = MirrorRacer(MirrorScoreBoard(tmp_path / "scores.json"), probe_bytes=16 * 1024)
+
+    async def resolve():
+        async with httpx.AsyncClient() as client:
+            first = await resolveDownloadUrl(GITHUB_URL, racer, client)
+            # 评分足够新时不再测速
+            started = time.perf_counter()
+            second = await resolveDownloadUrl(GITHUB_URL, racer, client)
+            return first, second, time.perf_counter() - started
+
+    first, second, elapsed = asyncio.run(resolve())
+    assert first.toString() == second.toString() == mirrorUrl(fast, GITHUB_URL)
+    assert elapsed < 0.5
+
+
+def test_all_mirrors_down_returns_original(server: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(mirror_module, "mirrorSites", lambda: [f"{server}/dead"])
+    racer = MirrorRacer(MirrorScoreBoard(tmp_path / "scores.json"))
+
+    async def resolve():
+        async with httpx.AsyncClient() as client:
+            return await resolveDownloadUrl(GITHUB_URL, racer, client)
+
+    assert asyncio.run(resolve()).toString() == GITHUB_URL
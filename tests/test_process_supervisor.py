@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+## ProcessSupervisor 与 ResourceSampler 的测试
+    以 `python -c` 启动的子进程代替 NapCat, 检查自动重启、停止进程树与资源采样
+"""
+
+# 标准库导入
+import sys
+import textwrap
+from pathlib import Path
+
+# 第三方库导入
+import psutil
+import pytest
+
+# 项目内模块导入
+from src.core.process import InstanceSpec, InstanceState, ResourceSampler, ProcessSupervisor
+
+# 输出两行后以退出码 3 退出
+CRASHING = textwrap.dedent("""
+    import sys
+    print("started", flush=True)
+    print("oops", file=sys.stderr, flush=True)
+    sys.exit(3)
+    """)
+
+# 启动一个子进程后一直运行, 模拟 NapCat 启动 QQ
+WITH_CHILD = textwrap.dedent("""
+    import sys, time, subprocess
+    subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    print("ready", flush=True)
+    time.sleep(60)
+    """)
+
+# 收到 SIGTERM 后输出最后一行再退出
+GRACEFUL = textwrap.dedent("""
+    import sys, time, signal
+    def shutdown(*args):
+        print("shutting down", flush=True)
+        sys.exit(0)
+    signal.signal(signal.SIGTERM, shutdown)
+    print("ready", flush=True)
+    time.sleep(60)
+    """)
+
+
+@pytest.fixture
+def supervisor(qapp, tmp_path: Path):
+    supervisor = ProcessSupervisor(sample_interval=0.2, backoff=0.05, stable_after=60, stop_timeout=2, log_dir=tmp_path)
+    yield supervisor
+    for name in list(supervisor.instances):
+        supervisor.removeInstance(name)
+    supervisor.sampler.stop()
+
+
+def spec(name: str, code: str, cwd: Path, **kwargs) -> InstanceSpec:
+    return InstanceSpec(name, [sys.executable, "-c", code], cwd=cwd, **kwargs)
+
+
+def test_crash_restarts_until_limit(supervisor: ProcessSupervisor, tmp_path: Path, wait) -> None:
+    states, exits, output = [], [], []
+    supervisor.stateChanged.connect(lambda name, state: states.append(state))
+    supervisor.instanceExited.connect(lambda name, code: exits.append(code))
+    supervisor.outputReceived.connect(lambda name, stream, lines: output.append((stream, lines)))
+
+    supervisor.addInstance(spec("crash", CRASHING, tmp_path, max_restarts=2))
+    assert supervisor.start("crash")
+    assert wait(lambda: supervisor.instances["crash"].state is InstanceState.FAILED)
+
+    # 首次启动 + 两次重启
+    assert exits == [3, 3, 3]
+    assert states.count(InstanceState.RESTARTING) == 2
+    assert supervisor.instances["crash"].restarts == 2
+    assert wait(lambda: ("stdout", ["started"]) in output and ("stderr", ["oops"]) in output)
+    assert not supervisor._restart_timers
+
+
+def test_stop_terminates_process_tree(supervisor: ProcessSupervisor, tmp_path: Path, wait) -> None:
+    samples = []
+    supervisor.resourcesSampled.connect(samples.append)
+    supervisor.addInstance(spec("tree", WITH_CHILD, tmp_path))
+    supervisor.start("tree")
+
+    # 采样覆盖子进程
+    assert wait(lambda: any(sample.get("tree") and sample["tree"].processes == 2 for sample in samples))
+    sample = next(sample["tree"] for sample in reversed(samples) if "tree" in sample)
+    assert sample.pid == supervisor.instances["tree"].pid
+    assert sample.rss > 0 and sample.threads >= 2
+
+    tree = psutil.Process(supervisor.instances["tree"].pid).children(recursive=True)
+    supervisor.stop("tree")
+    assert wait(lambda: supervisor.instances["tree"].state is InstanceState.STOPPED)
+    assert wait(lambda: not any(process.is_running() and process.status() != "zombie" for process in tree))
+
+    # 主动停止不会触发自动重启
+    assert not supervisor._restart_timers
+
+
+def test_restart_replaces_process(supervisor: ProcessSupervisor, tmp_path: Path, wait) -> None:
+    supervisor.addInstance(spec("restart", WITH_CHILD, tmp_path))
+    supervisor.start("restart")
+    old_pid = supervisor.instances["restart"].pid
+
+    supervisor.restart("restart")
+    assert wait(
+        lambda: supervisor.instances["restart"].pid != old_pid
+        and supervisor.instances["restart"].state is InstanceState.RUNNING
+    )
+    assert not psutil.pid_exists(old_pid) or psutil.Process(old_pid).status() == "zombie"
+    assert wait(lambda: not supervisor._restart_timers)
+
+
+def test_remove_instance_stops_sampling(supervisor: ProcessSupervisor, tmp_path: Path, wait) -> None:
+    samples = []
+    supervisor.resourcesSampled.connect(samples.append)
+    supervisor.addInstance(spec("removed", WITH_CHILD, tmp_path))
+    supervisor.start("removed")
+    assert wait(lambda: any("removed" in sample for sample in samples))
+
+    supervisor.removeInstance("removed")
+    # 退出的进程的 pid 可能被其他进程复用, 不能继续留在采样列表中
+    assert "removed" not in supervisor.sampler._roots
+    samples.clear()
+    supervisor.addInstance(spec("other", WITH_CHILD, tmp_path))
+    supervisor.start("other")
+    assert wait(lambda: len(samples) >= 2)
+    assert not any("removed" in sample for sample in samples)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="需要 SIGTERM 处理函数")
+def test_remove_instance_keeps_last_output(supervisor: ProcessSupervisor, tmp_path: Path, wait) -> None:
+    output = []
+    supervisor.outputReceived.connect(lambda name, stream, lines: output.extend(lines))
+    supervisor.addInstance(spec("graceful", GRACEFUL, tmp_path))
+    supervisor.start("graceful")
+    assert wait(lambda: "ready" in output)
+
+    # 退出前的最后输出仍然写入日志文件, 之后日志文件被关闭
+    supervisor.removeInstance("graceful")
+    log_file = tmp_path / "NapCat.graceful.log"
+    assert wait(lambda: not supervisor._closing_writers)
+    assert wait(lambda: "shutting down" in log_file.read_text(encoding="utf-8").splitlines())
+
+
+def test_sampler_drops_reused_pid(qapp) -> None:
+    sampler = ResourceSampler()
+    process = psutil.Process()
+    sampler._processes[process.pid] = process
+
+    # 创建时间不同视为 pid 被复用, 缓存的对象会被替换
+    created = {process.pid: process.create_time() + 1}
+    assert sampler._process(process.pid, created) is not process
+    created = {process.pid: process.create_time()}
+    assert sampler._process(process.pid, created) is sampler._processes[process.pid]